@@ -0,0 +1,63 @@
+"""
+Benchmark of relational queries (parents, children, siblings, ancestors, descendants)
+over synthetic reply trees.
+
+The legacy implementation scanned every post of the conversation to find the children of a post,
+making a walk over the whole thread quadratic; it is reproduced here for comparison
+(and skipped for large trees, where it does not finish in reasonable time).
+"""
+import random
+import time
+from argparse import ArgumentParser
+
+from pyconversations.convo import Conversation
+from pyconversations.message import RedditPost
+
+
+def synthetic_tree(n, seed=0):
+    rng = random.Random(seed)
+    convo = Conversation(convo_id=f'synthetic-{n}')
+    for ix in range(n):
+        # random recursive tree: each reply picks any earlier post as its parent
+        reply_to = {rng.randrange(ix)} if ix else None
+        convo.add_post(RedditPost(uid=ix, text='', reply_to=reply_to))
+    return convo
+
+
+def legacy_children(convo, uid):
+    return {pid for pid, post in convo.posts.items() if uid in post.reply_to}
+
+
+def walk(convo):
+    for uid in convo.posts:
+        convo.get_parents(uid)
+        convo.get_children(uid)
+        convo.get_siblings(uid)
+        convo.get_ancestors(uid)
+
+
+def timed(fn):
+    start = time.perf_counter()
+    fn()
+    return time.perf_counter() - start
+
+
+if __name__ == '__main__':
+    parser = ArgumentParser('Relational query benchmark.')
+    parser.add_argument('--sizes', dest='sizes', type=int, nargs='+', default=[1_000, 10_000, 100_000])
+    parser.add_argument('--legacy-max', dest='legacy_max', type=int, default=10_000,
+                        help='Largest tree to run the legacy children scan on')
+    args = parser.parse_args()
+
+    for n in args.sizes:
+        convo = synthetic_tree(n)
+
+        walk_t = timed(lambda: walk(convo))
+        desc_t = timed(lambda: convo.get_descendants(0))
+        line = f'{n:>8,} posts | walk (parents/children/siblings/ancestors): {walk_t:8.3f}s | descendants(root): {desc_t:.4f}s'
+
+        if n <= args.legacy_max:
+            legacy_t = timed(lambda: [legacy_children(convo, uid) for uid in convo.posts])
+            line += f' | legacy children scan: {legacy_t:8.3f}s'
+
+        print(line)
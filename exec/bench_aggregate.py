@@ -0,0 +1,116 @@
+"""
+Benchmark of the aggregate statistics of the posts and users of each conversation of a synthetic corpus
+(`agg_post_stats` and `agg_user_stats`, as computed by `ConvoFeatures.floats`):
+by per-feature lists and numpy calls, recomputing the features of the posts of each user
+(the previous behaviour), and by grouped reductions over the shared post feature matrix of each conversation.
+"""
+import random
+import time
+import warnings
+from argparse import ArgumentParser
+from datetime import datetime
+from datetime import timedelta
+
+import numpy as np
+
+from pyconversations.convo import Conversation
+from pyconversations.feature_extraction.cache import cache_clear
+from pyconversations.feature_extraction.post import prefetch_mixing_features
+from pyconversations.feature_extraction.post_in_conv import PostInConvoFeatures as PICF
+from pyconversations.feature_extraction.post_in_conv import agg_post_stats
+from pyconversations.feature_extraction.user_in_conv import UserInConvoFeatures
+from pyconversations.feature_extraction.user_in_conv import agg_user_stats
+from pyconversations.feature_extraction.user_in_conv import avg_user_token_entropy
+from pyconversations.feature_extraction.user_in_conv import mixing_features
+from pyconversations.message import Tweet
+
+
+def synthetic_corpus(n, users, seed=0):
+    rng = random.Random(seed)
+    words = [f'w{ix}' for ix in range(500)]
+    convos = []
+    uid = 0
+    for cx in range(n):
+        convo = Conversation(convo_id=f'c{cx}')
+        start = datetime(2020, 1, 1) + timedelta(hours=cx)
+        for ix in range(rng.randint(5, 60)):
+            convo.add_post(Tweet(uid=uid, text=' '.join(rng.choices(words, k=rng.randint(1, 20))),
+                                 author=f'user{rng.randrange(users)}', reply_to={uid - rng.randint(1, ix)} if ix else None,
+                                 created_at=start + timedelta(minutes=ix)))
+            uid += 1
+        convos.append(convo)
+
+    return convos
+
+
+def listed_stats(rows, prefix, single_std=None):
+    agg = {}
+    for row in rows:
+        for k, v in row.items():
+            agg.setdefault(k, []).append(v)
+
+    out = {}
+    for k, vs in agg.items():
+        out[f'{prefix}_min_{k}'] = float(np.nanmin(vs))
+        out[f'{prefix}_max_{k}'] = float(np.nanmax(vs))
+        out[f'{prefix}_mean_{k}'] = float(np.nanmean(vs))
+        out[f'{prefix}_median_{k}'] = float(np.median(vs))
+        out[f'{prefix}_std_{k}'] = float(np.nanstd(vs) if single_std is None or len(vs) > 1 else single_std)
+
+    return out
+
+
+def listed_post_stats(convo, filter_by=None):
+    rows = [{**PICF.floats(p, convo), **PICF.ints(p, convo)}
+            for p in convo.posts.values() if filter_by is None or filter_by(p)]
+    return listed_stats(rows, 'post')
+
+
+def listed(convos):
+    out = []
+    for convo in convos:
+        users = []
+        for user in convo.authors:
+            floats = dict(mixing_features(user, convo))
+            floats['avg_user_token_entropy'] = avg_user_token_entropy(user, convo)
+            floats.update(listed_post_stats(convo, filter_by=lambda p: p.author == user))
+            users.append({**floats, **UserInConvoFeatures.ints(user, convo)})
+        out.append({**listed_post_stats(convo), **listed_stats(users, 'user', single_std=1)})
+
+    return out
+
+
+def grouped(convos):
+    return [{**agg_post_stats(convo), **agg_user_stats(convo)} for convo in convos]
+
+
+def timed(fn):
+    start = time.perf_counter()
+    out = fn()
+    return time.perf_counter() - start, out
+
+
+if __name__ == '__main__':
+    parser = ArgumentParser('Aggregate statistics benchmark.')
+    parser.add_argument('--n', dest='n', type=int, default=100, help='Number of conversations')
+    parser.add_argument('--users', dest='users', type=int, default=20, help='Number of users')
+    args = parser.parse_args()
+
+    warnings.simplefilter('ignore', RuntimeWarning)
+
+    convos = synthetic_corpus(args.n, args.users)
+    print(f'{args.n:,} conversations, {sum(len(c.posts) for c in convos):,} posts')
+
+    # (the post features themselves are cached in both cases: the aggregation dominates)
+    cache_clear()
+    prefetch_mixing_features(post for convo in convos for post in convo.posts.values())
+    before_t, expected = timed(lambda: listed(convos))
+    print(f'per-feature lists: {before_t:7.2f}s')
+
+    cache_clear()
+    prefetch_mixing_features(post for convo in convos for post in convo.posts.values())
+    after_t, out = timed(lambda: grouped(convos))
+    for x, y in zip(out, expected):
+        assert list(x) == list(y)
+        np.testing.assert_allclose(list(x.values()), list(y.values()), rtol=1e-9)
+    print(f'grouped matrices:  {after_t:7.2f}s ({before_t / after_t:5.2f}x)')
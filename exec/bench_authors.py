@@ -0,0 +1,86 @@
+"""
+Benchmark of the per-author lookups of user features within a large synthetic conversation:
+the posts, post count and source authorship of every author, by scans of the conversation (the previous behaviour)
+and from its author index; as well as `authors` queries interleaved with post removals.
+"""
+import random
+import time
+from argparse import ArgumentParser
+from collections import Counter
+
+from pyconversations.convo import Conversation
+from pyconversations.feature_extraction.cache import cache_clear
+from pyconversations.feature_extraction.user_in_conv import get_user_posts
+from pyconversations.feature_extraction.user_in_conv import is_source_author
+from pyconversations.feature_extraction.user_in_conv import iter_over_users
+from pyconversations.feature_extraction.user_in_conv import messages_by_user
+from pyconversations.message import Tweet
+
+
+def synthetic_convo(n, users, seed=0):
+    rng = random.Random(seed)
+    convo = Conversation(convo_id='bench')
+    for ix in range(n):
+        convo.add_post(Tweet(uid=ix, text='some words', author=f'user{rng.randrange(users)}',
+                             reply_to={rng.randrange(ix)} if ix else None))
+
+    return convo
+
+
+def scanned(convo):
+    out = []
+    counts = Counter([p.author for p in convo.posts.values()])  # (cached by conversation)
+    for user in {p.author for p in convo.posts.values()}:
+        posts = {pid: p for pid, p in convo.posts.items() if p.author == user}
+        count = counts[user]
+        source = user in {convo.posts[pid].author for pid in convo.get_sources()}
+        out.append((user, set(posts), count, source))
+
+    return sorted(out)
+
+
+def indexed(convo):
+    out = []
+    for user in iter_over_users(convo):
+        out.append((user, set(get_user_posts(user, convo).posts), messages_by_user(user, convo),
+                    is_source_author(user, convo)))
+
+    return sorted(out)
+
+
+def timed(fn):
+    start = time.perf_counter()
+    out = fn()
+    return time.perf_counter() - start, out
+
+
+if __name__ == '__main__':
+    parser = ArgumentParser('Author index benchmark.')
+    parser.add_argument('--n', dest='n', type=int, default=5_000, help='Number of posts')
+    parser.add_argument('--users', dest='users', type=int, default=1_000, help='Number of users')
+    args = parser.parse_args()
+
+    convo = synthetic_convo(args.n, args.users)
+    print(f'{args.n:,} posts, {len(convo.authors):,} authors')
+
+    before_t, expected = timed(lambda: scanned(convo))
+    print(f'per-author lookups, scans:   {before_t:7.2f}s')
+
+    cache_clear()
+    after_t, out = timed(lambda: indexed(convo))
+    assert out == expected
+    print(f'per-author lookups, indexed: {after_t:7.2f}s ({before_t / after_t:5.2f}x)')
+
+    # removing posts used to drop the author set, rebuilt by the next query
+    def removals(rebuild):
+        shrinking = synthetic_convo(args.n, args.users)
+        for uid in range(0, args.n, 2):
+            shrinking.remove_post(uid)
+            if rebuild:
+                len({p.author for p in shrinking.posts.values()})
+            else:
+                len(shrinking.authors)
+
+    before_t, _ = timed(lambda: removals(rebuild=True))
+    after_t, _ = timed(lambda: removals(rebuild=False))
+    print(f'removals and authors, rebuilt: {before_t:7.2f}s, indexed: {after_t:7.2f}s')
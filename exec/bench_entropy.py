@@ -0,0 +1,55 @@
+"""
+Benchmark of `avg_token_entropy_all_splits` over every post of a synthetic thread:
+the previous implementation (a Conversation per split and per union of splits)
+against the engine working on per-post count vectors.
+"""
+import random
+import time
+from argparse import ArgumentParser
+
+import pytest
+
+from pyconversations.convo import Conversation
+from pyconversations.feature_extraction.cache import cache_clear
+from pyconversations.feature_extraction.post_in_conv import _avg_token_entropy_all_splits
+from pyconversations.feature_extraction.post_in_conv import avg_token_entropy_all_splits
+from pyconversations.message import RedditPost
+
+
+def synthetic_thread(n, vocab, seed=0):
+    rng = random.Random(seed)
+    words = [f'w{ix}' for ix in range(vocab)]
+    convo = Conversation()
+    for ix in range(n):
+        convo.add_post(RedditPost(
+            uid=ix,
+            text=' '.join(rng.choices(words, k=rng.randint(5, 40))),
+            reply_to={rng.randrange(ix)} if ix else None,
+        ))
+    return convo
+
+
+def timed(fn):
+    start = time.perf_counter()
+    out = fn()
+    return time.perf_counter() - start, out
+
+
+if __name__ == '__main__':
+    parser = ArgumentParser('Split entropy benchmark.')
+    parser.add_argument('--n', dest='n', type=int, default=1_000, help='Number of posts')
+    parser.add_argument('--vocab', dest='vocab', type=int, default=2_000, help='Number of distinct words')
+    args = parser.parse_args()
+
+    convo = synthetic_thread(args.n, args.vocab)
+    for post in convo.posts.values():
+        post.type_counts  # tokenized once, outside of the timings
+
+    cache_clear()
+    before_t, expected = timed(lambda: [_avg_token_entropy_all_splits(p, convo) for p in convo.posts.values()])
+    print(f'conversation splits: {before_t:7.2f}s')
+
+    cache_clear()
+    after_t, out = timed(lambda: [avg_token_entropy_all_splits(p, convo) for p in convo.posts.values()])
+    assert all(o == pytest.approx(e) for o, e in zip(out, expected))
+    print(f'engine:              {after_t:7.2f}s ({before_t / after_t:5.2f}x)')
@@ -0,0 +1,64 @@
+"""
+Benchmark of the shared feature cache:
+times `ConversationVectorizer.fit_transform` over synthetic conversations for several cache budgets
+and reports the cache statistics, and whether the conversations are released once dropped.
+"""
+import gc
+import random
+import time
+from argparse import ArgumentParser
+
+from pyconversations.convo import Conversation
+from pyconversations.feature_extraction import ConversationVectorizer
+from pyconversations.feature_extraction.cache import FEATURE_CACHE
+from pyconversations.message import RedditPost
+
+WORDS = ['the', 'a', 'post', 'reply', 'thread', 'comment', 'is', 'not', 'really', 'what', 'I', 'think',
+         'about', 'this', 'news', 'story', 'lol', 'ok', 'sure', 'why', 'because']
+
+
+def synthetic_convos(n, max_posts, seed=0):
+    rng = random.Random(seed)
+    convos = []
+    for cx in range(n):
+        convo = Conversation(convo_id=f'c{cx}')
+        for ix in range(rng.randint(1, max_posts)):
+            convo.add_post(RedditPost(
+                uid=f'{cx}_{ix}',
+                text=' '.join(rng.choices(WORDS, k=rng.randint(3, 40))),
+                author=f'user_{rng.randrange(50)}',
+                created_at=1_500_000_000.0 + ix * 60,
+                reply_to={f'{cx}_{rng.randrange(ix)}'} if ix else None,
+            ))
+        convos.append(convo)
+    return convos
+
+
+if __name__ == '__main__':
+    parser = ArgumentParser('Feature cache benchmark.')
+    parser.add_argument('--n', dest='n', type=int, default=300, help='Number of conversations')
+    parser.add_argument('--posts', dest='posts', type=int, default=15, help='Maximum posts per conversation')
+    parser.add_argument('--sizes', dest='sizes', type=int, nargs='+', default=[0, 256, 2 ** 16],
+                        help='Cache budgets (number of values) to compare')
+    args = parser.parse_args()
+
+    expected = None
+    for size in args.sizes:
+        FEATURE_CACHE.cache_clear()
+        convos = synthetic_convos(args.n, args.posts)
+
+        start = time.perf_counter()
+        out = ConversationVectorizer(cache_size=size).fit_transform(convos)
+        elapsed = time.perf_counter() - start
+
+        if expected is None:
+            expected = out
+        assert (out == expected).all(), 'cached features differ'
+
+        info = FEATURE_CACHE.cache_info()
+        lookups = info['hits'] + info['misses']
+        del convos, out
+        gc.collect()
+
+        print(f'budget {size:>7,} | {elapsed:7.2f}s | hit rate: {info["hits"] / max(lookups, 1):6.1%} | '
+              f'evictions: {info["evictions"]:>8,} | values held after release: {FEATURE_CACHE.cache_info()["currsize"]}')
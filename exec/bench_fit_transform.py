@@ -0,0 +1,73 @@
+"""
+Benchmark of `fit_transform` for post and conversation vectorizers over a synthetic corpus:
+as a fit followed by a transform, each computing the features (the previous behaviour),
+and as a single computation of the features, fit then normalized in place.
+Both are measured with the shared feature cache (which spares part of the second computation) and without it.
+"""
+import random
+import time
+import warnings
+from argparse import ArgumentParser
+from datetime import datetime
+from datetime import timedelta
+
+import numpy as np
+
+from pyconversations.convo import Conversation
+from pyconversations.feature_extraction import ConversationVectorizer
+from pyconversations.feature_extraction import PostVectorizer
+from pyconversations.feature_extraction.cache import FEATURE_CACHE
+from pyconversations.feature_extraction.cache import cache_clear
+from pyconversations.message import Tweet
+
+
+def synthetic_corpus(n, users, seed=0):
+    rng = random.Random(seed)
+    words = [f'w{ix}' for ix in range(500)]
+    convos = []
+    uid = 0
+    for cx in range(n):
+        convo = Conversation(convo_id=f'c{cx}')
+        start = datetime(2020, 1, 1) + timedelta(hours=cx)
+        for ix in range(rng.randint(2, 30)):
+            convo.add_post(Tweet(uid=uid, text=' '.join(rng.choices(words, k=rng.randint(1, 20))),
+                                 author=f'user{rng.randrange(users)}', reply_to={uid - rng.randint(1, ix)} if ix else None,
+                                 created_at=start + timedelta(minutes=ix)))
+            uid += 1
+        convos.append(convo)
+
+    return convos
+
+
+def timed(fn):
+    start = time.perf_counter()
+    out = fn()
+    return time.perf_counter() - start, out
+
+
+if __name__ == '__main__':
+    parser = ArgumentParser('Vectorizer fit_transform benchmark.')
+    parser.add_argument('--n', dest='n', type=int, default=100, help='Number of conversations')
+    parser.add_argument('--users', dest='users', type=int, default=50, help='Number of users')
+    args = parser.parse_args()
+
+    warnings.simplefilter('ignore', RuntimeWarning)
+
+    convos = synthetic_corpus(args.n, args.users)
+    print(f'{args.n:,} conversations, {sum(len(c.posts) for c in convos):,} posts')
+
+    size = FEATURE_CACHE.cache_info()['maxsize']
+    for cache_size in [size, 0]:
+        FEATURE_CACHE.resize(cache_size)
+        print(f'feature cache {"enabled" if cache_size else "disabled"}:')
+        for cls in [PostVectorizer, ConversationVectorizer]:
+            cache_clear()
+            before_t, expected = timed(lambda: cls(normalization='standard').fit(convos).transform(convos))
+
+            cache_clear()
+            after_t, out = timed(lambda: cls(normalization='standard').fit_transform(convos))
+            np.testing.assert_allclose(out, expected, rtol=1e-9)
+            print(f'  {cls.__name__:<22} fit, transform: {before_t:7.2f}s, '
+                  f'fit_transform: {after_t:7.2f}s ({before_t / after_t:5.2f}x)')
+
+    FEATURE_CACHE.resize(size)
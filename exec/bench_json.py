@@ -0,0 +1,101 @@
+"""
+Round-trip benchmark of the JSON codec over a synthetic corpus of universal-format conversations
+(one JSON-encoded conversation per line, as written by `preprocess.py` and read by `ConvoReader`).
+
+For each available backend, this times
+decoding every line, encoding every decoded line,
+and the full round trip through `Conversation.from_json` and `Conversation.to_json(serialize=True)`.
+"""
+import os
+import random
+import tempfile
+import time
+from argparse import ArgumentParser
+
+from pyconversations import codec
+from pyconversations.convo import Conversation
+
+WORDS = ['the', 'a', 'post', 'reply', 'thread', 'comment', 'is', 'not', 'really', 'what', 'I', 'think',
+         'about', 'this', 'news', 'story', 'lol', 'ok', 'sure', 'why', 'because', '🙂', 'café', '"quoted"']
+
+
+def synthetic_line(rng, convo_ix, max_posts=50):
+    n = rng.randint(1, max_posts)
+    posts = []
+    for ix in range(n):
+        posts.append({
+            'uid':        f't3_{convo_ix}_{ix}' if ix else f't3_{convo_ix}',
+            'text':       ' '.join(rng.choices(WORDS, k=rng.randint(3, 60))),
+            'author':     f'user_{rng.randrange(10_000)}',
+            'created_at': 1_500_000_000.0 + rng.random() * 1e8,
+            'reply_to':   [posts[rng.randrange(ix)]['uid']] if ix else [],
+            'platform':   'Reddit',
+            'tags':       ['subreddit=news'] if not ix else [],
+            'lang':       'en'
+        })
+    return codec.dumps(posts)
+
+
+def write_corpus(path, mb, seed=0):
+    rng = random.Random(seed)
+    target = mb * 2 ** 20
+    size = 0
+    convo_ix = 0
+    with open(path, 'w', encoding='utf-8') as fp:
+        while size < target:
+            line = synthetic_line(rng, convo_ix) + '\n'
+            fp.write(line)
+            size += len(line.encode('utf-8'))
+            convo_ix += 1
+    return convo_ix
+
+
+def codec_pass(path):
+    # lines are streamed (as the readers do) rather than held,
+    # so that the cyclic garbage collector does not dominate the timings
+    dec_t = enc_t = 0.0
+    with open(path, encoding='utf-8') as fp:
+        for line in fp:
+            start = time.perf_counter()
+            raw = codec.loads(line)
+            mid = time.perf_counter()
+            codec.dumps(raw)
+            dec_t += mid - start
+            enc_t += time.perf_counter() - mid
+    return dec_t, enc_t
+
+
+def roundtrip(path, out_path):
+    with open(path, encoding='utf-8') as fp, open(out_path, 'w', encoding='utf-8') as out:
+        for line in fp:
+            out.write(Conversation.from_json(line).to_json(serialize=True))
+            out.write('\n')
+
+
+def timed(fn):
+    start = time.perf_counter()
+    fn()
+    return time.perf_counter() - start
+
+
+if __name__ == '__main__':
+    parser = ArgumentParser('JSON codec round-trip benchmark.')
+    parser.add_argument('--mb', dest='mb', type=int, default=300, help='Size of the synthetic corpus in MB')
+    parser.add_argument('--backends', dest='backends', nargs='+', default=codec.available_backends())
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        corpus = os.path.join(tmp, 'corpus.json')
+        n = write_corpus(corpus, args.mb)
+        mb = os.path.getsize(corpus) / 2 ** 20
+        print(f'{n:,} conversations, {mb:.1f} MB')
+
+        for backend in args.backends:
+            codec.set_backend(backend)
+
+            dec_t, enc_t = codec_pass(corpus)
+            rt_t = timed(lambda: roundtrip(corpus, os.path.join(tmp, 'out.json')))
+
+            print(f'{backend:>8} | decode: {dec_t:7.2f}s ({mb / dec_t:6.1f} MB/s) | '
+                  f'encode: {enc_t:7.2f}s ({mb / enc_t:6.1f} MB/s) | '
+                  f'Conversation round trip: {rt_t:7.2f}s ({mb / rt_t:5.1f} MB/s)')
@@ -0,0 +1,76 @@
+"""
+Benchmark of language detection while building messages (as the readers do with `ld=True`):
+per-message langid classification (the previous behaviour),
+the cached detector, and deferred (batched) detection through the cache.
+
+The synthetic texts include a share of duplicates (e.g., "[deleted]", "[removed]", retweeted texts).
+"""
+import random
+import time
+from argparse import ArgumentParser
+
+from pyconversations.ld import CachedLangDetect
+from pyconversations.ld import LangidLangDetect
+from pyconversations.message import RedditPost
+from pyconversations.message import base
+from pyconversations.message.base import defer_language_detection
+
+WORDS = {
+    'en': 'the quick brown fox jumps over the lazy dog while we talk about news and this thread'.split(),
+    'de': 'der schnelle braune Fuchs springt über den faulen Hund während wir über Nachrichten reden'.split(),
+    'fr': 'le renard brun rapide saute par-dessus le chien paresseux pendant que nous parlons'.split(),
+    'es': 'el rápido zorro marrón salta sobre el perro perezoso mientras hablamos de noticias'.split(),
+}
+
+
+def synthetic_texts(n, dup_rate, seed=0):
+    rng = random.Random(seed)
+    texts = []
+    for _ in range(n):
+        if texts and rng.random() < dup_rate:
+            texts.append(rng.choice(['[deleted]', '[removed]', rng.choice(texts)]))
+        else:
+            words = WORDS[rng.choice(list(WORDS))]
+            texts.append(' '.join(rng.choices(words, k=rng.randint(3, 60))))
+    return texts
+
+
+def build(texts):
+    return [RedditPost(uid=ix, text=text, lang_detect=True) for ix, text in enumerate(texts)]
+
+
+def timed(fn):
+    start = time.perf_counter()
+    out = fn()
+    return time.perf_counter() - start, out
+
+
+if __name__ == '__main__':
+    parser = ArgumentParser('Language detection benchmark.')
+    parser.add_argument('--n', dest='n', type=int, default=20_000, help='Number of messages')
+    parser.add_argument('--dup', dest='dup', type=float, default=0.2, help='Share of duplicated texts')
+    args = parser.parse_args()
+
+    texts = synthetic_texts(args.n, args.dup)
+    print(f'{args.n:,} messages, {len(set(texts)):,} distinct texts')
+
+    model = LangidLangDetect()  # loaded once, outside of the timings
+
+    base.DETECTOR = model
+    plain_t, expected = timed(lambda: [p.lang for p in build(texts)])
+    print(f'per-message langid: {plain_t:7.2f}s')
+
+    base.DETECTOR = CachedLangDetect(model)
+    cached_t, out = timed(lambda: [p.lang for p in build(texts)])
+    assert out == expected
+    print(f'cached:             {cached_t:7.2f}s ({plain_t / cached_t:5.2f}x)')
+
+    def deferred():
+        with defer_language_detection():
+            posts = build(texts)
+        return [p.lang for p in posts]
+
+    base.DETECTOR = CachedLangDetect(model)
+    deferred_t, out = timed(deferred)
+    assert out == expected
+    print(f'deferred + cached:  {deferred_t:7.2f}s ({plain_t / deferred_t:5.2f}x)')
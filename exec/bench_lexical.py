@@ -0,0 +1,96 @@
+"""
+Throughput benchmark of the lexical statistics behind `PostFeatures.ints` and `PostFeatures.strs`:
+the previous separate passes (one regex per statistic, and `demoji` for emojis)
+against the fused scanner, per text and in batch (where repeated texts are scanned once).
+
+The synthetic texts mix words with punctuation, hashtags, mentions, URLs and emojis,
+and include a share of duplicates (e.g., "[deleted]", "[removed]", retweeted texts).
+"""
+import random
+import re
+import time
+from argparse import ArgumentParser
+
+import demoji
+
+from pyconversations.feature_extraction.lexical import emoji_pattern
+from pyconversations.feature_extraction.lexical import scan_text
+from pyconversations.feature_extraction.lexical import scan_texts
+from pyconversations.feature_extraction.regex import HASHTAG_REGEX
+from pyconversations.feature_extraction.regex import URL_REGEX
+from pyconversations.message import Tweet
+
+WORDS = 'the quick brown fox jumps over the lazy dog while We talk about News and this thread'.split()
+EXTRAS = ['#Breaking', '@someone', 'https://t.co/AbC123?x=1', 'wow!', 'why?', "it's", '"quote"', 'ok.', '😂', '🇺🇸',
+          '👍🏽', '❤️']
+
+
+def synthetic_texts(n, dup_rate, emoji_rate, seed=0):
+    rng = random.Random(seed)
+    texts = []
+    for _ in range(n):
+        if texts and rng.random() < dup_rate:
+            texts.append(rng.choice(['[deleted]', '[removed]', rng.choice(texts)]))
+        else:
+            extras = EXTRAS if rng.random() < emoji_rate else EXTRAS[:-4]
+            texts.append(' '.join(rng.choice(WORDS) if rng.random() < 0.85 else rng.choice(extras)
+                                  for _ in range(rng.randint(3, 50))))
+    return texts
+
+
+def separate_passes(text, mention_regex):
+    def get_all(pattern):
+        return [x.group() for x in re.finditer(pattern, text)]
+
+    emojis = demoji.findall_list(text, desc=False)
+    hashtags = get_all(HASHTAG_REGEX)
+    mentions = get_all(mention_regex)
+    urls = get_all(URL_REGEX)
+    return {
+        'char_count':      len(text),
+        '?_count':         len(get_all(r'[?]')),
+        '!_count':         len(get_all(r'[!]')),
+        'punct_count':     len(get_all(r'[,.?!;\'"]')),
+        'uppercase_count': len(get_all(r'[A-Z]')),
+        'emoji_count':     len(emojis),
+        'hashtag_count':   len(hashtags),
+        'mention_count':   len(mentions),
+        'url_count':       len(urls),
+        'emojis':          emojis,
+        'hashtags':        hashtags,
+        'mentions':        mentions,
+        'urls':            urls,
+    }
+
+
+def timed(fn):
+    start = time.perf_counter()
+    out = fn()
+    return time.perf_counter() - start, out
+
+
+if __name__ == '__main__':
+    parser = ArgumentParser('Lexical statistics benchmark.')
+    parser.add_argument('--n', dest='n', type=int, default=20_000, help='Number of texts')
+    parser.add_argument('--dup', dest='dup', type=float, default=0.2, help='Share of duplicated texts')
+    parser.add_argument('--emoji', dest='emoji', type=float, default=0.3, help='Share of texts that may hold emojis')
+    args = parser.parse_args()
+
+    texts = synthetic_texts(args.n, args.dup, args.emoji)
+    mb = sum(map(len, texts)) / 1e6
+    regex = Tweet.MENTION_REGEX
+    emoji_pattern()  # compiled once, outside of the timings
+
+    def report(name, t):
+        print(f'{name:<16} {t:7.2f}s  {args.n / t:10,.0f} texts/s  {mb / t:6.2f} M chars/s')
+
+    before_t, expected = timed(lambda: [separate_passes(text, regex) for text in texts])
+    report('separate passes', before_t)
+
+    fused_t, out = timed(lambda: [scan_text(text, regex) for text in texts])
+    assert out == expected
+    report('fused', fused_t)
+
+    batch_t, out = timed(lambda: scan_texts(texts, regex))
+    assert out == expected
+    report('fused batch', batch_t)
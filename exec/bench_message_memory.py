@@ -0,0 +1,71 @@
+"""
+Memory benchmark of in-memory messages: reports the bytes allocated per post
+(excluding the text, author and UID strings, which are shared with the raw data)
+for a synthetic mix of source posts (no replies, no tags) and replies.
+
+The previous representation (an ordinary `__dict__` object holding a datetime and two sets)
+is reproduced here for comparison.
+"""
+import random
+import tracemalloc
+from argparse import ArgumentParser
+from datetime import datetime
+
+from pyconversations.message import RedditPost
+
+
+class DictMessage:
+
+    """
+    The attribute layout of messages before they were slotted.
+    """
+
+    def __init__(self, uid, text='', author=None, created_at=None, reply_to=None, platform=None, lang=None, tags=None,
+                 lang_detect=False, tokenizer=None):
+        self._uid = uid
+        self._text = text
+        self._author = author
+        self._created_at = created_at
+        self._reply_to = set() if not reply_to else set(reply_to)
+        self._tags = set() if not tags else set(tags)
+        self._platform = platform
+        self._lang = lang
+        self._lang_detect = lang_detect
+        self._tok = tokenizer
+        self._tokens = None
+        self._type_counts = None
+
+
+def synthetic_rows(n, seed=0):
+    rng = random.Random(seed)
+    rows = []
+    for ix in range(n):
+        rows.append({
+            'uid':        f't1_{ix}',
+            'text':       f'text of post {ix}',
+            'author':     f'user_{rng.randrange(n // 10 + 1)}',
+            'created_at': 1_500_000_000.0 + ix,
+            'reply_to':   {f't1_{rng.randrange(ix)}'} if ix and rng.random() < 0.9 else None,
+            'tags':       {'board=test'} if rng.random() < 0.1 else None,
+            'platform':   'Reddit',
+        })
+    return rows
+
+
+if __name__ == '__main__':
+    parser = ArgumentParser('Message memory benchmark.')
+    parser.add_argument('--n', dest='n', type=int, default=200_000, help='Number of posts')
+    args = parser.parse_args()
+
+    rows = synthetic_rows(args.n)
+
+    for name, cls in [('dict-based (before)', DictMessage), ('slotted (after)', RedditPost)]:
+        tracemalloc.start()
+        before = tracemalloc.get_traced_memory()[0]
+        # built as the parsers do, from a freshly parsed datetime
+        posts = [cls(**{**row, 'created_at': datetime.fromtimestamp(row['created_at'])}) for row in rows]
+        after = tracemalloc.get_traced_memory()[0]
+        tracemalloc.stop()
+
+        print(f'{name:>20} | {args.n:,} posts: {(after - before) / args.n:6.1f} bytes per post')
+        del posts
@@ -0,0 +1,74 @@
+"""
+Benchmark of the harmonic mixing law over the posts of a synthetic corpus:
+one scipy fit per post (the previous behaviour), per-post calls through the profile cache,
+and a single batched call (as `PostVectorizer` now does before extracting features).
+
+Most synthetic posts are short, so that their frequency profiles repeat, as in real corpora.
+"""
+import random
+import time
+import warnings
+from argparse import ArgumentParser
+from collections import Counter
+
+from scipy.optimize import minimize
+
+from pyconversations.feature_extraction.harmonic import K1_BOUNDS
+from pyconversations.feature_extraction.harmonic import MIXING_CACHE
+from pyconversations.feature_extraction.harmonic import NLL_simple
+from pyconversations.feature_extraction.harmonic import _mixing_params
+from pyconversations.feature_extraction.harmonic import frequency_profile
+from pyconversations.feature_extraction.harmonic import mixing
+from pyconversations.feature_extraction.harmonic import mixing_batch
+from pyconversations.feature_extraction.harmonic import profile_arrays
+from pyconversations.feature_extraction.harmonic import rebound
+
+
+def synthetic_frequencies(n, vocab, seed=0):
+    rng = random.Random(seed)
+    words = [f'w{ix}' for ix in range(vocab)]
+    weights = [1 / (ix + 1) for ix in range(vocab)]
+    return [Counter(rng.choices(words, weights=weights, k=int(rng.paretovariate(1.5) * 5))) for _ in range(n)]
+
+
+def scipy_mixing(frequency):
+    fs, srs = profile_arrays(frequency_profile(frequency))
+    res = minimize(NLL_simple, x0=len(fs) / sum(fs), method='Nelder-Mead', tol=1e-1,
+                   options={'maxiter': 999}, args=(fs, srs, [K1_BOUNDS]))
+    return _mixing_params(fs, srs, rebound(res.x, [K1_BOUNDS])[0])
+
+
+def same_fits(out, expected):
+    # (the Nelder-Mead steps are those of scipy: fits agree within the tolerance of their stopping rule)
+    return all(abs(a['k1'] - b['k1']) <= 1e-1 for a, b in zip(out, expected))
+
+
+def timed(fn):
+    start = time.perf_counter()
+    out = fn()
+    return time.perf_counter() - start, out
+
+
+if __name__ == '__main__':
+    parser = ArgumentParser('Mixing law benchmark.')
+    parser.add_argument('--n', dest='n', type=int, default=20_000, help='Number of posts')
+    parser.add_argument('--vocab', dest='vocab', type=int, default=5_000, help='Number of distinct words')
+    args = parser.parse_args()
+
+    warnings.simplefilter('ignore', RuntimeWarning)
+
+    frequencies = synthetic_frequencies(args.n, args.vocab)
+    print(f'{args.n:,} posts, {len(set(map(frequency_profile, frequencies))):,} distinct profiles')
+
+    before_t, expected = timed(lambda: [scipy_mixing(f) for f in frequencies])
+    print(f'per-post scipy fits: {before_t:7.2f}s')
+
+    MIXING_CACHE.cache_clear()
+    cached_t, out = timed(lambda: [mixing(f) for f in frequencies])
+    assert same_fits(out, expected)
+    print(f'cached:              {cached_t:7.2f}s ({before_t / cached_t:5.2f}x)')
+
+    MIXING_CACHE.cache_clear()
+    batch_t, out = timed(lambda: mixing_batch(frequencies))
+    assert same_fits(out, expected)
+    print(f'batched + cached:    {batch_t:7.2f}s ({before_t / batch_t:5.2f}x)')
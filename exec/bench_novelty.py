@@ -0,0 +1,69 @@
+"""
+Benchmark of `harmonic.novelty` over synthetic frequency distributions of various sizes:
+the previous implementation (boolean masks over all ranks, for each distinct frequency)
+against the run-length encoded pass, called per distribution and in a single batch.
+"""
+import random
+import time
+from argparse import ArgumentParser
+from collections import Counter
+
+import numpy as np
+
+from pyconversations.feature_extraction.harmonic import novelty
+from pyconversations.feature_extraction.harmonic import novelty_batch
+
+
+def masked_novelty(frequency):
+    ws, fs = map(np.array, zip(*frequency.most_common()))
+    rs = np.arange(1, len(ws) + 1)
+
+    nums = Counter(fs)
+    fsum = fs.cumsum()
+    mn = (fsum / fs)
+
+    srs = {s: (min(rs[fs == s]), max(rs[fs == s])) for s in nums}
+    As1 = np.ones(len(fs))
+    As2 = np.ones(len(fs))
+    for f in sorted(nums, reverse=True)[1:]:
+        f_high = fs[srs[f][0] - 2]
+        f_low = fs[srs[f][1] - 1]
+        mn_high = np.max(mn[fs == f_high])
+        mn_low = np.max(mn[fs == f_low])
+        As1[fs == f] = 1 + np.mean(np.log10(f_high / f_low) / np.log10([mn_high / mn_low]))
+        As2[fs == f] = nums[f] / np.array([mn_low - mn_high])
+    return 2 / (1 / As1 + 1 / As2)
+
+
+def synthetic_frequencies(n, max_types, seed=0):
+    rng = random.Random(seed)
+    return [
+        Counter({ix: max(1, int(rng.paretovariate(1.1))) for ix in range(rng.randint(1, max_types))})
+        for _ in range(n)
+    ]
+
+
+def timed(fn):
+    start = time.perf_counter()
+    out = fn()
+    return time.perf_counter() - start, out
+
+
+if __name__ == '__main__':
+    parser = ArgumentParser('Novelty benchmark.')
+    parser.add_argument('--n', dest='n', type=int, default=2_000, help='Number of distributions')
+    parser.add_argument('--types', dest='types', type=int, default=2_000, help='Maximum number of types')
+    args = parser.parse_args()
+
+    frequencies = synthetic_frequencies(args.n, args.types)
+
+    before_t, expected = timed(lambda: [masked_novelty(f) for f in frequencies])
+    print(f'masks:       {before_t:7.2f}s')
+
+    single_t, out = timed(lambda: [novelty(f) for f in frequencies])
+    assert all(np.array_equal(o, e) for o, e in zip(out, expected))
+    print(f'run-length:  {single_t:7.2f}s ({before_t / single_t:6.2f}x)')
+
+    batch_t, out = timed(lambda: novelty_batch(frequencies))
+    assert all(np.array_equal(o, e) for o, e in zip(out, expected))
+    print(f'batched:     {batch_t:7.2f}s ({before_t / batch_t:6.2f}x)')
@@ -0,0 +1,91 @@
+"""
+Scaling benchmark of the vectorizers over worker processes, on a synthetic corpus of many small threads
+and a few large ones: the time of `fit_transform` for each number of workers,
+and the balance of the chunks of conversations the workers take on,
+as assigned by size (see `parallel.balanced_chunks`) and by consecutive slices of the corpus.
+"""
+import os
+import random
+import time
+import warnings
+from argparse import ArgumentParser
+from datetime import datetime
+from datetime import timedelta
+
+import numpy as np
+
+from pyconversations.convo import Conversation
+from pyconversations.feature_extraction import ConversationVectorizer
+from pyconversations.feature_extraction import PostVectorizer
+from pyconversations.feature_extraction import UserVectorizer
+from pyconversations.feature_extraction.cache import cache_clear
+from pyconversations.message import Tweet
+from pyconversations.parallel import balanced_chunks
+
+
+def synthetic_corpus(n, large, large_size, users, seed=0):
+    rng = random.Random(seed)
+    words = [f'w{ix}' for ix in range(500)]
+    sizes = [rng.randint(2, 20) for _ in range(n)] + [large_size] * large
+    rng.shuffle(sizes)
+
+    convos = []
+    uid = 0
+    for cx, size in enumerate(sizes):
+        convo = Conversation(convo_id=f'c{cx}')
+        start = datetime(2020, 1, 1) + timedelta(hours=cx)
+        for ix in range(size):
+            convo.add_post(Tweet(uid=uid, text=' '.join(rng.choices(words, k=rng.randint(1, 20))),
+                                 author=f'user{rng.randrange(users)}', reply_to={uid - rng.randint(1, ix)} if ix else None,
+                                 created_at=start + timedelta(minutes=ix)))
+            uid += 1
+        convos.append(convo)
+
+    return convos
+
+
+def imbalance(sizes, chunks):
+    # the size of the largest chunk, relative to an even split
+    return max(sum(sizes[ix] for ix in chunk) for chunk in chunks) / (sum(sizes) / len(chunks))
+
+
+def timed(fn):
+    start = time.perf_counter()
+    out = fn()
+    return time.perf_counter() - start, out
+
+
+if __name__ == '__main__':
+    parser = ArgumentParser('Parallel vectorizer benchmark.')
+    parser.add_argument('--n', dest='n', type=int, default=300, help='Number of small conversations')
+    parser.add_argument('--large', dest='large', type=int, default=3, help='Number of large conversations')
+    parser.add_argument('--large-size', dest='large_size', type=int, default=400, help='Posts per large conversation')
+    parser.add_argument('--users', dest='users', type=int, default=100, help='Number of users')
+    parser.add_argument('--workers', dest='workers', type=int, nargs='+', default=[1, 2, 4],
+                        help='Numbers of worker processes')
+    args = parser.parse_args()
+
+    warnings.simplefilter('ignore', RuntimeWarning)
+
+    convos = synthetic_corpus(args.n, args.large, args.large_size, args.users)
+    sizes = [len(convo.posts) for convo in convos]
+    print(f'{len(convos):,} conversations, {sum(sizes):,} posts, {os.cpu_count()} CPUs')
+
+    for n_workers in args.workers:
+        if n_workers > 1:
+            n_chunks = 4 * n_workers
+            bounds = [len(sizes) * cx // n_chunks for cx in range(n_chunks + 1)]
+            sliced = [list(range(lo, hi)) for lo, hi in zip(bounds, bounds[1:])]
+            print(f'{n_workers} workers: largest chunk / even split, by size: '
+                  f'{imbalance(sizes, balanced_chunks(sizes, n_chunks)):5.2f}, by slice: {imbalance(sizes, sliced):5.2f}')
+
+    for cls in [PostVectorizer, ConversationVectorizer, UserVectorizer]:
+        expected = None
+        serial_t = None
+        for n_workers in args.workers:
+            cache_clear()
+            t, out = timed(lambda: cls(normalization='standard', n_workers=n_workers).fit_transform(convos))
+            if expected is None:
+                expected, serial_t = out, t
+            np.testing.assert_allclose(out, expected, rtol=1e-9)
+            print(f'{cls.__name__:<22} {n_workers} workers: {t:7.2f}s ({serial_t / t:5.2f}x)')
@@ -0,0 +1,72 @@
+"""
+Scaling benchmark of parallel ingestion (`n_workers`) for the Reddit reader,
+over a synthetic directory of monthly files of raw comments and submissions.
+
+Each run is checked against the serial (1 worker) output.
+Language detection, which dominates parsing, is on by default (as it is for the readers);
+without it, shipping the parsed posts back to the main process costs about as much as parsing them.
+"""
+import json
+import os
+import random
+import tempfile
+import time
+from argparse import ArgumentParser
+
+from pyconversations.reader import RedditReader
+
+WORDS = ['the', 'a', 'post', 'reply', 'thread', 'comment', 'is', 'not', 'really', 'what', 'I', 'think',
+         'about', 'this', 'news', 'story', 'lol', 'ok', 'sure', 'why', 'because']
+
+
+def write_month(path, month, n_posts, seed=0):
+    rng = random.Random(seed + month)
+    with open(path, 'w') as fp:
+        uids = []
+        for ix in range(n_posts):
+            uid = f'{month}_{ix}'
+            post = {
+                'id':          uid,
+                'author':      f'user_{rng.randrange(5_000)}',
+                'created_utc': 1_500_000_000 + month * 2_600_000 + ix,
+                'subreddit':   'bench',
+            }
+            if ix % 50 == 0:
+                post['title'] = ' '.join(rng.choices(WORDS, k=10))
+                post['selftext'] = ' '.join(rng.choices(WORDS, k=rng.randint(0, 200)))
+            else:
+                post['parent_id'] = 't1_' + uids[rng.randrange(max(0, ix - 200), ix)]
+                post['body'] = ' '.join(rng.choices(WORDS, k=rng.randint(3, 80)))
+            uids.append(uid)
+            fp.write(json.dumps(post) + '\n')
+
+
+def run(path_pattern, n_workers, chunksize, ld):
+    start = time.perf_counter()
+    out = [[convo.to_json() for convo in segs] for segs in
+           RedditReader.iter_read(path_pattern, ld=ld, n_workers=n_workers, chunksize=chunksize)]
+    return time.perf_counter() - start, out
+
+
+if __name__ == '__main__':
+    parser = ArgumentParser('Parallel reader scaling benchmark.')
+    parser.add_argument('--files', dest='files', type=int, default=16, help='Number of monthly files')
+    parser.add_argument('--posts', dest='posts', type=int, default=2_000, help='Posts per file')
+    parser.add_argument('--workers', dest='workers', type=int, nargs='+', default=[1, 2, 4, 8])
+    parser.add_argument('--chunksize', dest='chunksize', type=int, default=1)
+    parser.add_argument('--no-ld', dest='ld', action='store_false', help='Disable language detection')
+    args = parser.parse_args()
+
+    print(f'{os.cpu_count()} CPUs available')
+    with tempfile.TemporaryDirectory() as tmp:
+        for month in range(args.files):
+            write_month(os.path.join(tmp, f'{2000 + month // 12}-{month % 12 + 1:02d}_bench.json'), month, args.posts)
+
+        baseline, expected = None, None
+        for n_workers in args.workers:
+            elapsed, out = run(tmp + '/', n_workers, args.chunksize, args.ld)
+            if expected is None:
+                baseline, expected = elapsed, out
+            assert out == expected, 'parallel output differs from the serial output'
+
+            print(f'{n_workers:>2} workers | {elapsed:7.2f}s | speedup: {baseline / elapsed:5.2f}x')
@@ -0,0 +1,64 @@
+"""
+Throughput benchmark (tokens/sec) for the Partitioner tokenizer.
+
+Compares the original, uncompiled implementation
+against the compiled engine (single call and batched `tokenize_many`).
+"""
+import random
+import re
+import time
+from argparse import ArgumentParser
+
+from pyconversations.tokenizers import PartitionTokenizer
+from pyconversations.tokenizers.partitioner import default_charset
+
+
+def legacy_tokenize(s, charset, space=True):
+    tokens = []
+    for token in re.split("([0-9" + charset + "'-]+)", s):
+        if not space:
+            token = re.sub("[ ]+", "", token)
+
+        if not token:
+            continue
+
+        if re.search("[0-9" + charset + "'-]", token):
+            tokens.append(token)
+        else:
+            tokens.extend(token)
+
+    return tokens
+
+
+def synthetic_texts(n, seed=0):
+    rng = random.Random(seed)
+    words = ['the', 'news', "isn't", 'real', '2021', 'check-in', 'USER', 'https://t.co/x', '#tag', '!!', '😏', 'ещё']
+    return [' '.join(rng.choice(words) for _ in range(rng.randint(3, 40))) for _ in range(n)]
+
+
+def timed(fn):
+    start = time.perf_counter()
+    out = fn()
+    return time.perf_counter() - start, out
+
+
+if __name__ == '__main__':
+    parser = ArgumentParser('Partitioner tokenizer throughput.')
+    parser.add_argument('--texts', dest='texts', type=int, default=200_000, help='Number of synthetic texts')
+    args = parser.parse_args()
+
+    texts = synthetic_texts(args.texts)
+    charset = default_charset()
+    tok = PartitionTokenizer()
+
+    before, legacy = timed(lambda: [legacy_tokenize(t, charset) for t in texts])
+    single, compiled = timed(lambda: [tok.tokenize(t) for t in texts])
+    batch, batched = timed(lambda: tok.tokenize_many(texts))
+
+    assert legacy == compiled == batched
+
+    n_tokens = sum(map(len, compiled))
+    print(f'Texts: {len(texts):,}, tokens: {n_tokens:,}')
+    print(f'Legacy:        {n_tokens / before:,.0f} tokens/sec')
+    print(f'Compiled:      {n_tokens / single:,.0f} tokens/sec')
+    print(f'tokenize_many: {n_tokens / batch:,.0f} tokens/sec')
@@ -0,0 +1,76 @@
+"""
+Peak memory (RSS) benchmark for streaming reads of universal-format conversation files.
+
+Writes JSON-line files of increasing size and reads each of them back with `ConvoReader.iter_read`
+in a fresh process, reporting the peak resident set size.
+The legacy `readlines()` behaviour is reproduced for comparison:
+its peak memory grows with the file, while streaming reads stay flat.
+"""
+import json
+import multiprocessing as mp
+import os
+import resource
+import tempfile
+from argparse import ArgumentParser
+
+from pyconversations.convo import Conversation
+from pyconversations.message import RedditPost
+from pyconversations.reader import ConvoReader
+from pyconversations.reader.base import open_file
+
+
+def write_corpus(path, n_convos, posts_per_convo=20):
+    with open(path, 'w') as fp:
+        for cx in range(n_convos):
+            convo = Conversation()
+            for px in range(posts_per_convo):
+                uid = cx * posts_per_convo + px
+                convo.add_post(RedditPost(uid=uid, text=f'comment {uid} ' * 10, author=f'user{uid % 97}',
+                                          reply_to={uid - 1} if px else None))
+            fp.write(json.dumps(convo.to_json()) + '\n')
+
+
+def streaming_read(path_pattern):
+    for _ in ConvoReader.iter_read(path_pattern):
+        pass
+
+
+def legacy_read(path_pattern):
+    for f in sorted(os.listdir(path_pattern)):
+        with open_file(path_pattern + f) as fp:
+            for line in fp.readlines():
+                Conversation.from_json(json.loads(line))
+
+
+def measure(fn, path_pattern, queue):
+    fn(path_pattern)
+    queue.put(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss)
+
+
+def peak_rss_mb(fn, path_pattern):
+    ctx = mp.get_context('spawn')
+    queue = ctx.Queue()
+    proc = ctx.Process(target=measure, args=(fn, path_pattern, queue))
+    proc.start()
+    peak = queue.get()
+    proc.join()
+    return peak / 1024  # ru_maxrss is reported in KB on Linux
+
+
+if __name__ == '__main__':
+    parser = ArgumentParser('Peak RSS of streaming reads as input files grow.')
+    parser.add_argument('--convos', dest='convos', type=int, nargs='+', default=[2_500, 5_000, 10_000, 20_000],
+                        help='Conversations per file')
+    args = parser.parse_args()
+
+    for n in args.convos:
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'corpus.json')
+            write_corpus(path, n)
+            size = os.path.getsize(path) / 1e6
+
+            streaming = peak_rss_mb(streaming_read, tmp + '/')
+            legacy = peak_rss_mb(legacy_read, tmp + '/')
+
+        print(f'{n:>7,} conversations ({size:7.1f} MB) | streaming peak RSS: {streaming:7.1f} MB | '
+              f'readlines peak RSS: {legacy:7.1f} MB')
@@ -0,0 +1,64 @@
+"""
+Benchmark of the redaction of a synthetic conversation with many participants:
+one `re.sub` per term of the redaction map on each post (the previous behaviour),
+and a single pass of the compiled `Redactor` (as `Conversation.redact` now does).
+"""
+import random
+import re
+import time
+from argparse import ArgumentParser
+
+from pyconversations.convo import Conversation
+from pyconversations.message import Tweet
+
+
+def synthetic_convo(n, seed=0):
+    rng = random.Random(seed)
+    # of equal lengths: none is a prefix of another, which the sequential substitutions would mangle
+    names = [f'user_{ix:08d}' for ix in range(n)]
+    convo = Conversation()
+    for ix, name in enumerate(names):
+        mentions = ' '.join('@' + m for m in rng.sample(names, 2))
+        convo.add_post(Tweet(uid=ix, text=f'{mentions} some words about the topic of the day', author=name))
+
+    return convo
+
+
+def sequential_redact(convo):
+    rd = {}
+    for uid in convo.posts:
+        for user in convo.posts[uid].get_mentions():
+            if user not in rd:
+                rd[user] = f'USER{len(rd)}'
+
+    for post in convo.posts.values():
+        if post.text:
+            for term, replacement in rd.items():
+                if term in post.text:
+                    post.text = re.sub(term, replacement, post.text)
+
+        if post.author in rd:
+            post.author = rd[post.author]
+
+
+def timed(fn):
+    start = time.perf_counter()
+    out = fn()
+    return time.perf_counter() - start, out
+
+
+if __name__ == '__main__':
+    parser = ArgumentParser('Redaction benchmark.')
+    parser.add_argument('--n', dest='n', type=int, default=5_000, help='Number of posts (and participants)')
+    args = parser.parse_args()
+
+    before = synthetic_convo(args.n)
+    before_t, _ = timed(lambda: sequential_redact(before))
+    print(f'{args.n:,} posts')
+    print(f'sequential re.sub: {before_t:7.2f}s')
+
+    after = synthetic_convo(args.n)
+    after_t, _ = timed(after.redact)
+    print(f'single pass:       {after_t:7.2f}s ({before_t / after_t:5.2f}x)')
+
+    assert [p.to_json() for p in after.posts.values()] == [p.to_json() for p in before.posts.values()]
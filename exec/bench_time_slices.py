@@ -0,0 +1,70 @@
+"""
+Benchmark of time-sliced queries over a synthetic conversation:
+the posts created before and after each post, by linear scans (the previous behaviour of `filter`)
+and through the conversation's bisected time index; as well as repeated `time_order` calls.
+"""
+import random
+import time
+from argparse import ArgumentParser
+from datetime import datetime
+from datetime import timedelta
+
+from pyconversations.convo import Conversation
+from pyconversations.message import Tweet
+
+
+def synthetic_convo(n, seed=0):
+    rng = random.Random(seed)
+    start = datetime(2020, 1, 1)
+    convo = Conversation(convo_id='bench')
+    for ix in range(n):
+        convo.add_post(Tweet(uid=ix, text='some words', author=f'user{rng.randint(0, n // 10)}',
+                             created_at=start + timedelta(seconds=rng.randint(0, 10 * n))))
+
+    return convo
+
+
+def scanned_slices(convo):
+    out = []
+    for post in convo.posts.values():
+        pivot = post.created_at
+        out.append((
+            {uid for uid, p in convo.posts.items() if p.created_at is not None and p.created_at < pivot},
+            {uid for uid, p in convo.posts.items() if p.created_at is not None and p.created_at > pivot},
+        ))
+
+    return out
+
+
+def indexed_slices(convo):
+    return [(set(convo.get_before(uid).posts), set(convo.get_after(uid).posts)) for uid in convo.posts]
+
+
+def timed(fn):
+    start = time.perf_counter()
+    out = fn()
+    return time.perf_counter() - start, out
+
+
+if __name__ == '__main__':
+    parser = ArgumentParser('Time slicing benchmark.')
+    parser.add_argument('--n', dest='n', type=int, default=2_000, help='Number of posts')
+    args = parser.parse_args()
+
+    convo = synthetic_convo(args.n)
+    print(f'{args.n:,} posts')
+
+    before_t, expected = timed(lambda: scanned_slices(convo))
+    print(f'before/after, scans:   {before_t:7.2f}s')
+
+    after_t, out = timed(lambda: indexed_slices(convo))
+    assert out == expected
+    print(f'before/after, indexed: {after_t:7.2f}s ({before_t / after_t:5.2f}x)')
+
+    posts = convo.posts
+    before_t, expected = timed(lambda: [sorted(posts, key=lambda k: posts[k].created_at) for _ in range(100)])
+    print(f'100 x time_order, sorting: {before_t:7.2f}s')
+
+    after_t, out = timed(lambda: [convo.time_order() for _ in range(100)])
+    assert out == expected
+    print(f'100 x time_order, indexed: {after_t:7.2f}s ({before_t / after_t:5.2f}x)')
@@ -0,0 +1,52 @@
+"""
+Benchmark of the per-message cost of tokenizer construction.
+
+Builds a synthetic corpus of Reddit posts twice:
+once with the legacy behaviour (every message constructs its own set of tokenizers
+and re-reads the partitioner character set from disk)
+and once with the shared, process-wide tokenizer registry.
+"""
+import pkgutil
+import time
+from argparse import ArgumentParser
+
+from pyconversations.message import RedditPost
+from pyconversations.message import base
+from pyconversations.tokenizers import DefaultTokenizer
+from pyconversations.tokenizers import NLTKTokenizer
+from pyconversations.tokenizers import PartitionTokenizer
+
+
+def legacy_get_tokenizer(key):
+    charset = pkgutil.get_data('pyconversations.tokenizers', 'chars.txt').decode('utf-8').strip().replace(" ", "")
+    return {
+        'default':     DefaultTokenizer(),
+        'NLTK':        NLTKTokenizer(),
+        'partitioner': PartitionTokenizer(charset=charset),
+    }[key]
+
+
+def build_corpus(n):
+    start = time.perf_counter()
+    for ix in range(n):
+        RedditPost(uid=ix, text=f'synthetic comment number {ix}', author=f'user{ix % 1000}', reply_to={ix - 1})
+    return time.perf_counter() - start
+
+
+if __name__ == '__main__':
+    parser = ArgumentParser('Tokenizer construction cost per message.')
+    parser.add_argument('--posts', dest='posts', type=int, default=1_000_000, help='Number of synthetic posts')
+    args = parser.parse_args()
+
+    registry_get_tokenizer = base.get_tokenizer
+
+    base.get_tokenizer = legacy_get_tokenizer
+    before = build_corpus(args.posts)
+
+    base.get_tokenizer = registry_get_tokenizer
+    after = build_corpus(args.posts)
+
+    print(f'Posts: {args.posts:,}')
+    print(f'Before (per-message tokenizers): {before:.2f}s ({1e6 * before / args.posts:.2f} us/post)')
+    print(f'After (shared registry):         {after:.2f}s ({1e6 * after / args.posts:.2f} us/post)')
+    print(f'Speedup: {before / after:.2f}x')
@@ -0,0 +1,134 @@
+"""
+Benchmark of the structural features of a thread
+(per-post depth, width and in-degree, and the degree and depth distributions):
+the previous per-post recursion over `reply_to` (reproduced here, with its `lru_cache`s)
+against the single pass of `TreeMetrics`.
+Also checks a single deep reply chain, on which the recursion hits Python's recursion limit.
+"""
+import random
+import time
+from argparse import ArgumentParser
+from collections import Counter
+from functools import lru_cache
+
+from pyconversations.convo import Conversation
+from pyconversations.feature_extraction.cache import FEATURE_CACHE
+from pyconversations.feature_extraction.conv import degree_in_size_distribution
+from pyconversations.feature_extraction.conv import degree_size_distribution
+from pyconversations.feature_extraction.post_in_conv import depth_dist
+from pyconversations.feature_extraction.post_in_conv import tree_features
+from pyconversations.message import ChanPost
+
+
+def chan_thread(n, seed=0):
+    # replies quote the OP or (one or a few) recent posts
+    rng = random.Random(seed)
+    convo = Conversation()
+    for ix in range(n):
+        if not ix:
+            reply_to = None
+        elif rng.random() < 0.3:
+            reply_to = {0}
+        else:
+            reply_to = {rng.randrange(max(0, ix - 50), ix) for _ in range(rng.choice([1, 1, 1, 2, 3]))}
+        convo.add_post(ChanPost(uid=ix, reply_to=reply_to))
+    return convo
+
+
+# the previous implementation
+@lru_cache(maxsize=256)
+def old_in_degrees_by_uid(conv):
+    cnt = Counter()
+    for p in conv.posts.values():
+        if p.uid not in cnt:
+            cnt[p.uid] = 0
+
+        for r in p.reply_to:
+            if r in conv.posts:
+                cnt[r] += 1
+    return cnt
+
+
+@lru_cache(maxsize=256)
+def old_post_depth(post, conv):
+    parent_depths = [
+        old_post_depth(post=conv.posts[rid], conv=conv)
+        for rid in post.reply_to if rid in conv.posts
+    ]
+
+    if not parent_depths:
+        return 0
+    else:
+        return 1 + max(parent_depths)
+
+
+@lru_cache(maxsize=256)
+def old_depth_dist(conv):
+    return Counter([old_post_depth(p, conv) for p in conv.posts.values()])
+
+
+@lru_cache(maxsize=256)
+def old_post_width(post, conv):
+    return old_depth_dist(conv)[old_post_depth(post, conv)]
+
+
+@lru_cache(maxsize=256)
+def old_degree_size_distribution(convo):
+    return Counter([old_in_degrees_by_uid(convo)[p.uid] + len(p.reply_to) for p in convo.posts.values()])
+
+
+@lru_cache(maxsize=256)
+def old_degree_in_size_distribution(convo):
+    return Counter([old_in_degrees_by_uid(convo)[p.uid] for p in convo.posts.values()])
+
+
+def recursive_features(convo):
+    posts = [{
+        'degree':    old_post_depth(p, convo),
+        'in_degree': old_in_degrees_by_uid(convo)[p.uid],
+        'depth':     old_post_depth(p, convo),
+        'width':     old_post_width(p, convo),
+    } for p in convo.posts.values()]
+    return posts, old_degree_size_distribution(convo), old_degree_in_size_distribution(convo), old_depth_dist(convo)
+
+
+def metric_features(convo):
+    posts = [tree_features(p, convo) for p in convo.posts.values()]
+    return posts, degree_size_distribution(convo), degree_in_size_distribution(convo), depth_dist(convo)
+
+
+def timed(fn, *args):
+    start = time.perf_counter()
+    out = fn(*args)
+    return time.perf_counter() - start, out
+
+
+if __name__ == '__main__':
+    parser = ArgumentParser('Tree metrics benchmark.')
+    parser.add_argument('--sizes', dest='sizes', type=int, nargs='+', default=[300, 3_000, 30_000],
+                        help='Thread sizes (number of posts)')
+    parser.add_argument('--depth', dest='depth', type=int, default=20_000, help='Length of the deep reply chain')
+    args = parser.parse_args()
+
+    for n in args.sizes:
+        convo = chan_thread(n)
+        old_t, expected = timed(recursive_features, convo)
+        FEATURE_CACHE.cache_clear()
+        new_t, out = timed(metric_features, convo)
+        assert out == expected
+
+        print(f'{n:>7,} posts | recursive: {old_t:7.3f}s | single pass: {new_t:7.3f}s ({old_t / new_t:5.2f}x)')
+
+    # listed newest first, as threads often are
+    chain = Conversation()
+    for ix in reversed(range(args.depth)):
+        chain.add_post(ChanPost(uid=ix, reply_to={ix - 1} if ix else None))
+
+    try:
+        old_t, _ = timed(recursive_features, chain)
+        print(f'{args.depth:,}-deep chain | recursive: {old_t:7.3f}s')
+    except RecursionError:
+        print(f'{args.depth:,}-deep chain | recursive: RecursionError')
+
+    new_t, out = timed(metric_features, chain)
+    print(f'{args.depth:,}-deep chain | single pass: {new_t:7.3f}s (max depth {max(out[3]):,})')
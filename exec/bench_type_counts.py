@@ -0,0 +1,84 @@
+"""
+Benchmark of conversation type frequency distributions on a large thread:
+the previous `reduce` over `Counter + Counter` (reproduced here)
+against the running aggregate of `Conversation.type_counts`,
+for the whole thread, large and small sub-views of it, the posts of one user,
+and keeping the distribution up to date while the thread grows.
+"""
+import random
+import time
+from argparse import ArgumentParser
+from collections import Counter
+from functools import reduce
+
+from pyconversations.convo import Conversation
+from pyconversations.feature_extraction.post import type_frequency_distribution as post_freq
+from pyconversations.message import RedditPost
+
+
+def synthetic_thread(n, vocab, seed=0):
+    rng = random.Random(seed)
+    words = [f'w{ix}' for ix in range(vocab)]
+    weights = [1 / (rank + 1) for rank in range(vocab)]  # Zipfian
+    posts = []
+    for ix in range(n):
+        posts.append(RedditPost(
+            uid=ix,
+            text=' '.join(rng.choices(words, weights, k=rng.randint(5, 60))),
+            author=f'user_{rng.randrange(500)}',
+            reply_to={rng.randrange(ix)} if ix else None,
+        ))
+    return posts
+
+
+def reduced(convo):
+    # the previous implementation
+    return reduce(lambda x, y: x + y, map(post_freq, convo.posts.values()), Counter())
+
+
+def timed(fn, *args):
+    start = time.perf_counter()
+    out = fn(*args)
+    return time.perf_counter() - start, out
+
+
+if __name__ == '__main__':
+    parser = ArgumentParser('Type frequency distribution benchmark.')
+    parser.add_argument('--n', dest='n', type=int, default=20_000, help='Number of posts in the thread')
+    parser.add_argument('--vocab', dest='vocab', type=int, default=5_000, help='Vocabulary size')
+    args = parser.parse_args()
+
+    posts = synthetic_thread(args.n, args.vocab)
+    for post in posts:
+        post.type_counts  # tokenize once, outside of the timings
+
+    convo = Conversation()
+    for post in posts:
+        convo.add_post(post)
+    user = posts[0].author
+
+    views = [
+        ('thread', lambda: convo),
+        ('descendants of the root', lambda: convo.get_descendants(0)),
+        ('ancestors of the last post', lambda: convo.get_ancestors(args.n - 1, include_post=True)),
+        ('posts of a user', lambda: Conversation(posts={uid: convo.posts[uid] for uid in convo.filter(by_author=user)})),
+    ]
+    for name, view in views:
+        old_t, expected = timed(lambda: reduced(view()))
+        new_t, out = timed(lambda: view().type_counts)
+        assert out == expected
+        print(f'{name:>26} | reduce: {old_t:8.3f}s | running aggregate: {new_t:8.3f}s ({old_t / new_t:7.1f}x)')
+
+    # growing the thread, with its distribution needed after every 5,000 posts
+    def grow(count):
+        growing = Conversation()
+        for ix, post in enumerate(posts):
+            growing.add_post(post)
+            if not (ix + 1) % 5_000:
+                count(growing)
+        return count(growing)
+
+    old_t, expected = timed(grow, reduced)
+    new_t, out = timed(grow, lambda c: c.type_counts)
+    assert out == expected
+    print(f'{"growing thread":>26} | reduce: {old_t:8.3f}s | running aggregate: {new_t:8.3f}s ({old_t / new_t:7.1f}x)')
@@ -0,0 +1,77 @@
+"""
+Benchmark of the features of users across the conversations of a synthetic corpus:
+per user, by scanning every post of the corpus (the previous behaviour of `UserAcrossConvoFeatures`),
+and for all users together, from a `CorpusIndex` (as `UserVectorizer` now does).
+"""
+import random
+import time
+import warnings
+from argparse import ArgumentParser
+from datetime import datetime
+from datetime import timedelta
+
+from pyconversations.convo import Conversation
+from pyconversations.feature_extraction.cache import cache_clear
+from pyconversations.feature_extraction.corpus import CorpusIndex
+from pyconversations.feature_extraction.post_in_conv import agg_post_stats_
+from pyconversations.feature_extraction.user_across_conv import across_convo_features
+from pyconversations.feature_extraction.user_across_conv import gather_all_user_posts_in_convo
+from pyconversations.feature_extraction.user_across_conv import sum_user_booleans_across_convos
+from pyconversations.feature_extraction.user_across_conv import sum_user_ints_across_convos
+from pyconversations.feature_extraction.user_in_conv import mixing_features
+from pyconversations.message import Tweet
+
+
+def synthetic_corpus(n, users, seed=0):
+    rng = random.Random(seed)
+    words = [f'w{ix}' for ix in range(500)]
+    convos = []
+    uid = 0
+    for cx in range(n):
+        convo = Conversation(convo_id=f'c{cx}')
+        start = datetime(2020, 1, 1) + timedelta(hours=cx)
+        for ix in range(rng.randint(1, 20)):
+            convo.add_post(Tweet(uid=uid, text=' '.join(rng.choices(words, k=rng.randint(1, 20))),
+                                 author=f'user{rng.randrange(users)}', reply_to={uid - rng.randint(1, ix)} if ix else None,
+                                 created_at=start + timedelta(minutes=ix)))
+            uid += 1
+        convos.append(convo)
+
+    return convos
+
+
+def scanned_features(user, convos):
+    ints = sum_user_ints_across_convos(user, convos)
+    ints.update(sum_user_booleans_across_convos(user, convos))
+    floats = mixing_features(user, gather_all_user_posts_in_convo(user, convos))
+    floats.update(agg_post_stats_(convos, filter_by=lambda p: p.author == user))
+    return {**ints, **floats}
+
+
+def timed(fn):
+    start = time.perf_counter()
+    out = fn()
+    return time.perf_counter() - start, out
+
+
+if __name__ == '__main__':
+    parser = ArgumentParser('Across-conversation user feature benchmark.')
+    parser.add_argument('--n', dest='n', type=int, default=200, help='Number of conversations')
+    parser.add_argument('--users', dest='users', type=int, default=300, help='Number of users')
+    args = parser.parse_args()
+
+    warnings.simplefilter('ignore', RuntimeWarning)
+
+    convos = synthetic_corpus(args.n, args.users)
+    users = CorpusIndex(convos).users
+    print(f'{args.n:,} conversations, {sum(len(c.posts) for c in convos):,} posts, {len(users):,} users')
+
+    # (each post feature is computed once in both cases, then cached)
+    cache_clear()
+    before_t, expected = timed(lambda: [scanned_features(user, convos) for user in users])
+    print(f'per-user scans: {before_t:7.2f}s')
+
+    cache_clear()
+    after_t, out = timed(lambda: [{**ints, **floats} for ints, floats in across_convo_features(CorpusIndex(convos))])
+    assert [list(x) for x in out] == [list(x) for x in expected]
+    print(f'corpus index:   {after_t:7.2f}s ({before_t / after_t:5.2f}x)')
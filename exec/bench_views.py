@@ -0,0 +1,65 @@
+"""
+Benchmark of the relational subsets of every post of a synthetic thread
+(ancestors, descendants, parents, children, siblings, before and after),
+as views of the thread and as copied conversations (the previous behaviour, through `materialize`).
+"""
+import random
+import time
+from argparse import ArgumentParser
+from datetime import datetime
+from datetime import timedelta
+
+from pyconversations.convo import Conversation
+from pyconversations.message import Tweet
+
+
+def synthetic_thread(n, seed=0):
+    rng = random.Random(seed)
+    start = datetime(2020, 1, 1)
+    convo = Conversation(convo_id='bench')
+    for ix in range(n):
+        convo.add_post(Tweet(uid=ix, text='some words', reply_to={rng.randrange(ix)} if ix else None,
+                             created_at=start + timedelta(seconds=ix)))
+
+    return convo
+
+
+def relations(convo, uid):
+    return [
+        convo.get_ancestors(uid, include_post=True), convo.get_descendants(uid, include_post=True),
+        convo.get_parents(uid, include_post=True), convo.get_children(uid, include_post=True),
+        convo.get_siblings(uid, include_post=True), convo.get_before(uid), convo.get_after(uid),
+    ]
+
+
+def subsets(convo, copy):
+    sizes = 0
+    for uid in convo.posts:
+        for sub in relations(convo, uid):
+            if copy:
+                sub = sub.materialize()
+            sizes += len(sub.posts)
+
+    return sizes
+
+
+def timed(fn):
+    start = time.perf_counter()
+    out = fn()
+    return time.perf_counter() - start, out
+
+
+if __name__ == '__main__':
+    parser = ArgumentParser('Relational subset benchmark.')
+    parser.add_argument('--n', dest='n', type=int, default=2_000, help='Number of posts in the thread')
+    args = parser.parse_args()
+
+    convo = synthetic_thread(args.n)
+    print(f'{args.n:,} posts')
+
+    copy_t, expected = timed(lambda: subsets(convo, copy=True))
+    print(f'copied: {copy_t:7.2f}s')
+
+    view_t, out = timed(lambda: subsets(convo, copy=False))
+    assert out == expected
+    print(f'views:  {view_t:7.2f}s ({copy_t / view_t:5.2f}x)')
@@ -1,4 +1,3 @@
-import json
 import os
 
 from pyconversations.reader import BNCReader
@@ -22,7 +21,7 @@ if __name__ == '__main__':
         'non': 0,
     }
     for convo in convos:
-        cache.append(json.dumps(convo.to_json()))
+        cache.append(convo.to_json(serialize=True))
 
         ah = False
         for post in convo.posts.values():
@@ -4,7 +4,6 @@ conversion from a raw representation
 into a conversation segmented, JSON-line separated output
 for further downstream analysis.
 """
-import json
 import os
 from argparse import ArgumentParser
 
@@ -18,7 +17,7 @@ from pyconversations.reader import ThreadsReader
 def preprocess_buzzface():
     for pagename, convo_chunk in RawFBReader.iter_read(data_root + 'BuzzFace/data*/'):
         print(f'{pagename}: {len(convo_chunk)} conversations')
-        lines = [json.dumps(convo.to_json()) for convo in convo_chunk]
+        lines = [convo.to_json(serialize=True) for convo in convo_chunk]
 
         os.makedirs(out + 'FB/BuzzFace', exist_ok=True)
         with open(out + f'FB/BuzzFace/{pagename}.json', 'w+') as fp:
@@ -28,7 +27,7 @@ def preprocess_buzzface():
 def preprocess_outlets():
     for pagename, convo_chunk in RawFBReader.iter_read(data_root + 'Outlets/data*/'):
         print(f'{pagename}: {len(convo_chunk)} conversations')
-        lines = [json.dumps(convo.to_json()) for convo in convo_chunk]
+        lines = [convo.to_json(serialize=True) for convo in convo_chunk]
 
         os.makedirs(out + 'FB/Outlets', exist_ok=True)
         with open(out + f'FB/Outlets/{pagename}.json', 'w+') as fp:
@@ -38,7 +37,7 @@ def preprocess_outlets():
 def preprocess_chunked_4chan(board):
     for ix, convo_chunk in ChanReader.iter_read(data_root + f'4chan/{board}/'):
         print(f'{ix}: {len(convo_chunk)} conversations')
-        lines = [json.dumps(convo.to_json()) for convo in convo_chunk]
+        lines = [convo.to_json(serialize=True) for convo in convo_chunk]
 
         os.makedirs(out + f'4chan/{board}/', exist_ok=True)
         with open(out + f'4chan/{board}/{ix:02d}.json', 'w+') as fp:
@@ -58,7 +57,7 @@ def pre_process_quote_tweets(sharding=100):
     shard = 0
     for convo in convo_chunks:
         # convo.redact()
-        cache.append(json.dumps(convo.to_json()))
+        cache.append(convo.to_json(serialize=True))
 
         if len(cache) >= cap:
             with open(out + f'Twitter/CTQ/{shard:02d}.json', 'w+') as fp:
@@ -80,7 +79,7 @@ def preprocess_newstweetthreads(per_file=1_000):
         print(f'{ix}: {len(convo_chunk)} conversations')
         # for chunk in convo_chunk:
         #     chunk.redact()
-        write_cache.extend([json.dumps(convo.to_json()) for convo in convo_chunk])
+        write_cache.extend([convo.to_json(serialize=True) for convo in convo_chunk])
 
         if len(write_cache) >= per_file:
             with open(out + f'Twitter/NTT/{cnt:04d}.json', 'w+') as fp:
@@ -99,7 +98,7 @@ def preprocess_reddit_cmv(per_file=1_000):
     write_cache = []
     cnt = 0
     for convo_chunk in RedditReader.iter_read(data_root + 'cmv-full-2017-09-22/'):
-        write_cache.extend([json.dumps(convo.to_json()) for convo in convo_chunk])
+        write_cache.extend([convo.to_json(serialize=True) for convo in convo_chunk])
 
         if len(write_cache) >= per_file:
             with open(out + f'Reddit/CMV/{cnt:06d}.json', 'w+') as fp:
@@ -117,7 +116,7 @@ def preprocess_reddit_dialog(board):
 
     cnt = 0
     for convo_chunk in RedditReader.iter_read(data_root + f'raw_rd/[0-9][0-9][0-9][0-9]-[0-9][0-9]_{board}', rd=True):
-        write = [json.dumps(convo.to_json()) for convo in convo_chunk]
+        write = [convo.to_json(serialize=True) for convo in convo_chunk]
         with open(out + f'Reddit/RD_{board}/{cnt:03d}.json', 'w+') as fp:
             fp.write('\n'.join(write))
         cnt += 1
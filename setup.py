@@ -76,10 +76,11 @@ setup(
         'numpy>=1.12',
         'tqdm>=4.59',
         'nltk>=3.0',
-        'demoji>=1.0',
+        'demoji>=1.0,<2.1',
         'scipy>=1.7.0'
     ],
     extras_require={
+        'fast': ['msgspec>=0.16'],
         # eg:
         #   'rst': ['docutils>=0.11'],
         #   ':python_version=="2.6"': ['argparse'],
@@ -0,0 +1,181 @@
+"""
+JSON encoding and decoding for the universal conversation format.
+
+A fast backend is used when one is installed (``msgspec`` for decoding and encoding, ``orjson`` for encoding),
+otherwise the standard library ``json`` module is used.
+Any value a fast backend refuses (e.g., ``NaN`` literals, or integers beyond 64 bits for ``orjson``)
+is handed to the standard library, so results and raised errors match ``json.loads`` and ``json.dumps``.
+So are the values the fast backends would encode differently:
+non-finite floats (written as ``null`` rather than ``NaN`` or ``Infinity``) and sets (which ``json.dumps`` refuses).
+
+``orjson`` is never used for decoding as it silently parses integers beyond 64 bits (e.g., Tweet IDs) into floats.
+"""
+import json
+from math import isfinite
+
+try:
+    import msgspec
+except ImportError:  # pragma: no cover
+    msgspec = None
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover
+    orjson = None
+
+BACKENDS = ('msgspec', 'orjson', 'json')
+
+_loads = json.loads
+_dumps = json.dumps
+_backend = None
+
+
+def _msgspec_loads(s):
+    try:
+        return msgspec.json.decode(s)
+    except msgspec.DecodeError:
+        return json.loads(s)
+
+
+def _as_stdlib(obj):
+    """
+    Whether the fast backends encode `obj` as ``json.dumps`` does: it holds no sets and no non-finite floats.
+    """
+    stack = [obj]
+    while stack:
+        x = stack.pop()
+        t = type(x)
+        if t is str or t is int or x is None:
+            continue
+
+        if t is dict:
+            stack.extend(x.values())
+        elif t is list or t is tuple:
+            stack.extend(x)
+        elif isinstance(x, float):
+            if not isfinite(x):
+                return False
+        elif isinstance(x, (set, frozenset)):
+            return False
+
+    return True
+
+
+def _msgspec_dumps(obj):
+    if not _as_stdlib(obj):
+        return json.dumps(obj)
+
+    try:
+        return msgspec.json.encode(obj).decode('utf-8')
+    except (TypeError, ValueError, OverflowError):
+        return json.dumps(obj)
+
+
+def _orjson_dumps(obj):
+    if not _as_stdlib(obj):
+        return json.dumps(obj)
+
+    try:
+        return orjson.dumps(obj).decode('utf-8')
+    except TypeError:
+        return json.dumps(obj)
+
+
+def available_backends():
+    """
+    Returns the JSON backends that are importable in this environment, fastest first.
+
+    Returns
+    -------
+    list(str)
+        The names of the available backends
+    """
+    modules = {'msgspec': msgspec, 'orjson': orjson, 'json': json}
+    return [name for name in BACKENDS if modules[name] is not None]
+
+
+def get_backend():
+    """
+    Returns the name of the active JSON backend.
+
+    Returns
+    -------
+    str
+        The active backend
+    """
+    return _backend
+
+
+def set_backend(name=None):
+    """
+    Selects the JSON backend used by `loads` and `dumps`.
+
+    Parameters
+    ----------
+    name : str
+        One of `BACKENDS`, or None to select the fastest available backend. (Default: None)
+
+    Raises
+    ------
+    KeyError
+        If the backend is unknown or is not installed
+    """
+    global _backend, _loads, _dumps
+
+    available = available_backends()
+    if name is None:
+        name = available[0]
+
+    if name not in available:
+        raise KeyError(f'Unrecognized or unavailable JSON backend: {name}')
+
+    if name == 'msgspec':
+        _loads, _dumps = _msgspec_loads, _msgspec_dumps
+    elif name == 'orjson':
+        _loads, _dumps = (_msgspec_loads if msgspec is not None else json.loads), _orjson_dumps
+    else:
+        _loads, _dumps = json.loads, json.dumps
+
+    _backend = name
+
+
+def loads(s):
+    """
+    Decodes a JSON document.
+
+    Parameters
+    ----------
+    s : str or bytes
+        The JSON document
+
+    Returns
+    -------
+    object
+        The decoded value
+
+    Raises
+    ------
+    json.JSONDecodeError
+        If the document is not valid JSON
+    """
+    return _loads(s)
+
+
+def dumps(obj):
+    """
+    Encodes a value as a single-line JSON document.
+
+    Parameters
+    ----------
+    obj : object
+        The value to encode
+
+    Returns
+    -------
+    str
+        The JSON document
+    """
+    return _dumps(obj)
+
+
+set_backend()
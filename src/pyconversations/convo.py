@@ -1,8 +1,18 @@
+from bisect import bisect_left
+from bisect import bisect_right
+from collections import Counter
 from collections import defaultdict
+from collections.abc import ItemsView
+from collections.abc import Mapping
+from collections.abc import ValuesView
+from datetime import datetime
 
 import networkx as nx
 
+from .codec import dumps
+from .codec import loads
 from .message import get_constructor_by_platform
+from .redact import Redactor
 
 
 class Conversation:
@@ -19,14 +29,46 @@ class Conversation:
         posts
             An optional dictionary of messages/posts; keys should be unique IDs.
         """
-        if not posts:
+        if posts is None:
             posts = {}
 
         self._posts = posts  # uid -> post object
         self._convo_id = convo_id
 
-        self._relation_map = defaultdict(dict)
-        self._author_set = set()
+        # author -> UIDs of their posts (as the ordered keys of a dict), built on first use.
+        # Once built, it is updated incrementally by `add_post` and `remove_post`,
+        # and as posts are modified in place (see `_post_modified`).
+        self._by_author = None
+
+        # secondary indexes over the posts (see `_index`), built on first use and updated as above
+        # (the time index is only dropped, to be sorted again, when a creation time is modified in place).
+        self._indexes = {}
+
+        # forward adjacency (uid -> set of UIDs of posts replying to it), built on first use and updated as above.
+        # The reverse direction is held by each post's `reply_to`.
+        self._children = None
+
+        # modification counter (see `version`),
+        # and that of the additions and removals of posts and of the modifications of their replies or creation times,
+        # which decide the posts of the views drawn from this conversation (see `ConversationView`)
+        self._version = 0
+        self._structure = 0
+        self._own()
+
+        # running type frequency distribution of the posts (see `type_counts`), built on first use,
+        # with the counts of the posts it holds, keyed by UID,
+        # and the UIDs of the posts modified in place since (to recount)
+        self._type_counts = None
+        self._counted = None
+        self._dirty = None
+
+        # a conversation sharing most of these posts (this is a sub-view or combination of it),
+        # from which the type counts may be derived rather than recounted
+        self._type_source = None
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._own()
 
     def __add__(self, other):
         """
@@ -49,8 +91,31 @@ class Conversation:
             convo.add_post(post)
         for post in self.posts.values():
             convo.add_post(post)
+
+        # the posts of `other` were added first (and those of this conversation merged into them)
+        convo._type_source = other if other._type_counts is not None else self
+
         return convo
 
+    def __ior__(self, other):
+        """
+        Merges the posts of another conversation into this one (in place).
+        Posts sharing a UID are merged, as in `add_post`.
+
+        Parameters
+        ---------
+        other : Conversation
+            Another conversation to be merged into this one.
+
+        Returns
+        -------
+        Conversation
+            This conversation
+        """
+        for post in other.posts.values():
+            self.add_post(post)
+        return self
+
     @property
     def posts(self):
         """
@@ -75,12 +140,71 @@ class Conversation:
         """
         return self._convo_id if self._convo_id else 'CONV_' + '-'.join(map(str, sorted(self.get_sources())))
 
+    @property
+    def version(self):
+        """
+        A counter of the posts added to (or merged into) and removed from this conversation,
+        of its redactions and of the modifications of its posts (see `UniMessage.version`),
+        used to invalidate features cached for it.
+
+        Returns
+        -------
+        int
+            The number of modifications of this conversation
+        """
+        return self._version
+
+    @property
+    def type_counts(self):
+        """
+        The type frequency (unigram) distribution of the tokens of all posts in this conversation.
+        It is kept as a running aggregate: built on first use
+        (derived from the conversation this one is a sub-view of, when that is cheaper),
+        then updated in place as posts are added, removed or modified.
+        The returned Counter is shared and should not be modified.
+
+        Returns
+        -------
+        collections.Counter
+            The count of each token type
+        """
+        if self._type_counts is None:
+            self._init_type_counts()
+        else:
+            self._sync_type_counts()
+
+        return self._type_counts
+
     @property
     def authors(self):
-        if not self._author_set:
-            self._author_set = set([self.posts[pid].author for pid in self.posts])
+        """
+        The authors of the posts of this conversation.
+
+        Returns
+        -------
+        set(str)
+            The set of authors
+        """
+        return set(self.posts_by_author)
+
+    @property
+    def posts_by_author(self):
+        """
+        The UIDs of the posts of each author, kept up to date as posts are added, merged and removed.
+        The returned mapping is shared and should not be modified.
+
+        Returns
+        -------
+        dict(str, dict(UID, None))
+            The UIDs of the posts of each author (the keys of each dict, in the order the posts were added)
+        """
+        if self._by_author is None:
+            self._by_author = defaultdict(dict)
+            for uid, post in self._posts.items():
+                self._by_author[post.author][uid] = None
+            self._by_author = dict(self._by_author)
 
-        return self._author_set
+        return self._by_author
 
     def add_post(self, post):
         """
@@ -95,12 +219,27 @@ class Conversation:
         -------
         None
         """
+        prev = self._posts.get(post.uid)
+
         if post.uid in self._posts and self._posts[post.uid]:
+            # (the fields the merge modifies are re-indexed as it is signalled, see `_post_modified`)
             self._posts[post.uid] |= post
         else:
             self._posts[post.uid] = post
+            post._add_owner(self)
+            if prev is not None:
+                prev._remove_owner(self)
+                self._unindex_post(post.uid, prev)
+            self._index_post(post.uid, post)
+
+        self._version += 1
+        self._structure += 1
 
-        self._author_set.add(post.author)
+        if self._type_counts is not None:
+            if post.uid in self._counted:
+                self._uncount(post.uid)
+            self._count(post.uid, self._posts[post.uid])
+            self._dirty.discard(post.uid)
 
     def remove_post(self, uid):
         """
@@ -115,8 +254,16 @@ class Conversation:
         -------
         None
         """
-        del self._posts[uid]
-        self._author_set = set()
+        post = self._posts.pop(uid)
+        post._remove_owner(self)
+        self._unindex_post(uid, post)
+        self._version += 1
+        self._structure += 1
+
+        if self._type_counts is not None:
+            if uid in self._counted:
+                self._uncount(uid)
+            self._dirty.discard(uid)
 
     def as_graph(self):
         """
@@ -136,7 +283,7 @@ class Conversation:
 
         # add reply connections as edges
         for uid, post in self._posts.items():
-            for rid in post.reply_to:
+            for rid in post._reply_ids:
                 if uid in self._posts and rid in self._posts:
                     graph.add_edge(uid, rid)
 
@@ -153,25 +300,25 @@ class Conversation:
         list(Conversation)
             A list of sub-conversations
         """
-        segments = []
-        for node_set in nx.connected_components(self.as_graph()):
-            convo = Conversation()
-            for uid in node_set:
-                convo.add_post(self.posts[uid])
-            segments.append(convo)
+        return Segmenter(self._posts.values()).segments()
 
-        return segments
-
-    def to_json(self):
+    def to_json(self, serialize=False):
         """
         Returns a JSON representation of this object.
 
+        Parameters
+        ---------
+        serialize : bool
+            Whether to return the encoded JSON string (a single line) rather than the list of post dictionaries.
+            (Default: False)
+
         Returns
         -------
-        list(JSON/dict)
+        list(JSON/dict) or str
             The dictionary/JSON representation of the Conversation
         """
-        return [post.to_json() for post in self.posts.values()]
+        out = [post.to_json() for post in self._posts.values()]
+        return dumps(out) if serialize else out
 
     @staticmethod
     def from_json(raw):
@@ -180,14 +327,17 @@ class Conversation:
 
         Parameters
         ---------
-        raw : JSON/dict
-            The raw JSON
+        raw : JSON/dict or str or bytes
+            The raw JSON, either decoded or as an encoded string
 
         Returns
         -------
         Conversation
             The conversation read from the raw JSON
         """
+        if isinstance(raw, (str, bytes)):
+            raw = loads(raw)
+
         convo = Conversation()
         for p in [get_constructor_by_platform(pjson['platform']).from_json(pjson) for pjson in raw]:
             convo.add_post(p)
@@ -202,11 +352,13 @@ class Conversation:
         set(UID)
             The set of unique IDs of posts that originate conversation (are not replies)
         """
-        return {uid for uid, post in self._posts.items() if not {rid for rid in post.reply_to if rid in self._posts}}
+        return {uid for uid, post in self._posts.items() if not {rid for rid in post._reply_ids if rid in self._posts}}
 
     def filter(self, by_langs=None, min_chars=0, before=None, after=None, by_tags=None, by_platform=None, by_author=None):
         """
-        Returns the set of post UIDs that meet the parameterized criteria
+        Returns the set of post UIDs that meet the parameterized criteria.
+        Authors, languages, tags and creation times are looked up in secondary indexes (built on first use),
+        the remaining criteria are only checked on the posts these select.
 
         Parameters
         ---------
@@ -230,53 +382,51 @@ class Conversation:
         set(hashable)
             Set of UIDs
         """
-        drop = set()
-        keep = set(self.posts.keys())
-        for uid, post in self._posts.items():
-            if by_author is not None and post.author != by_author:
-                drop.add(uid)
-                continue
+        keep = None
+        if by_author is not None:
+            keep = set(self.posts_by_author.get(by_author, ()))
 
-            if len(post.text) < min_chars:
-                drop.add(uid)
-                continue
+        if by_langs:
+            keep = self._intersect(keep, self._union('lang', by_langs))
 
-            if by_langs and post.lang not in by_langs:
-                drop.add(uid)
-                continue
+        if by_tags:
+            for tag in by_tags:
+                keep = self._intersect(keep, self._index('tag').get(tag, ()))
 
-            if before and (post.created_at is None or post.created_at >= before):
-                drop.add(uid)
-                continue
-            if after and (post.created_at is None or post.created_at <= after):
-                drop.add(uid)
-                continue
+        if before:
+            keep = self._intersect(keep, self._time_slice(before=before))
+        if after:
+            keep = self._intersect(keep, self._time_slice(after=after))
 
-            if by_tags and by_tags != (by_tags & post.tags):
-                drop.add(uid)
-                continue
+        if keep is None:
+            keep = set(self._posts)
 
-            if by_platform and post.platform not in by_platform:
-                drop.add(uid)
-                continue
+        if min_chars > 0 or by_platform:
+            keep = {
+                uid for uid in keep
+                if len(self._posts[uid].text) >= min_chars and
+                (not by_platform or self._posts[uid].platform in by_platform)
+            }
 
-        keep -= drop
         return keep
 
     def time_order(self):
         """
-        Returns a time series of the UIDs of posts within this Conversation.
+        Returns a time series of the UIDs of posts within this Conversation
+        (empty if some posts have no creation time), kept sorted by the time index.
 
         Returns
         -------
         list(UID)
             The list of UIDs of the posts in the conversation, in temporal order
         """
-        try:
-            return sorted(self._posts.keys(), key=lambda k: self._posts[k].created_at)
-        except TypeError:
+        times, uids, untimed = self._index('time')
+        if untimed and len(self._posts) > 1:
+            # (creation times that cannot be compared)
             return []
 
+        return list(uids) if uids else list(self._posts)
+
     def text_stream(self):
         """
         Returns the text of the Conversation as a single stream.
@@ -313,8 +463,331 @@ class Conversation:
                 if user not in rd:
                     rd[user] = f'USER{len(rd)}' if assign_ints else 'USER'
 
+        # compiled once, each text is then rewritten in a single pass
+        # (the posts signal the authors they rename, see `_post_modified`)
+        redactor = Redactor(rd)
         for uid in self._posts:
-            self._posts[uid].redact(rd)
+            self._posts[uid].redact(redactor)
+
+        self._version += 1
+
+    def _own(self):
+        """
+        Registers this conversation with its posts, to be told of their modifications (see `_post_modified`).
+        """
+        for post in self._posts.values():
+            post._add_owner(self)
+
+    def _post_modified(self, uid, old):
+        """
+        Records the modification of the post `uid` in place, given the previous values of its fields modified:
+        only the entries of the indexes and reply structure built over the posts that these fields key are updated,
+        and the post is only recounted (see `type_counts`) if its text changed.
+        """
+        self._version += 1
+        if 'reply_to' in old or 'created_at' in old:
+            self._structure += 1
+        post = self._posts[uid]
+
+        if 'author' in old and self._by_author is not None:
+            self._unindex_author(uid, old['author'])
+            self._by_author.setdefault(post.author, {})[uid] = None
+
+        if 'lang' in old and 'lang' in self._indexes:
+            self._unindex('lang', old['lang'], uid)
+            self._indexes['lang'].setdefault(post.lang, set()).add(uid)
+
+        if 'tags' in old and 'tag' in self._indexes:
+            tags = set(post._tag_ids)
+            for tag in old['tags'] - tags:
+                self._unindex('tag', tag, uid)
+            for tag in tags - old['tags']:
+                self._indexes['tag'].setdefault(tag, set()).add(uid)
+
+        if 'created_at' in old:
+            # (sorted again on next use: the position of the post decides its order among posts created at once)
+            self._indexes.pop('time', None)
+
+        if 'reply_to' in old and self._children is not None:
+            rids = set(post._reply_ids)
+            for rid in old['reply_to'] - rids:
+                self._unlink_child(rid, uid)
+            for rid in rids - old['reply_to']:
+                self._children[rid].add(uid)
+
+        if 'text' in old and self._dirty is not None:
+            self._dirty.add(uid)
+
+    def _index_post(self, uid, post):
+        """
+        Adds a post (appended to the posts) to the indexes and reply structure built so far.
+        """
+        if self._by_author is not None:
+            self._by_author.setdefault(post.author, {})[uid] = None
+
+        if 'lang' in self._indexes:
+            self._indexes['lang'].setdefault(post.lang, set()).add(uid)
+
+        if 'tag' in self._indexes:
+            for tag in post._tag_ids:
+                self._indexes['tag'].setdefault(tag, set()).add(uid)
+
+        if 'time' in self._indexes:
+            times, uids, untimed = self._indexes['time']
+            ts = post.timestamp
+            if ts is None:
+                self._indexes['time'] = times, uids, untimed + 1
+            else:
+                # (after the posts created at the same time, as it was added after them)
+                ix = bisect_right(times, ts)
+                times.insert(ix, ts)
+                uids.insert(ix, uid)
+
+        if self._children is not None:
+            for rid in post._reply_ids:
+                self._children[rid].add(uid)
+
+    def _unindex_post(self, uid, post):
+        """
+        Removes a post from the indexes and reply structure built so far.
+        """
+        if self._by_author is not None:
+            self._unindex_author(uid, post.author)
+
+        if 'lang' in self._indexes:
+            self._unindex('lang', post.lang, uid)
+
+        if 'tag' in self._indexes:
+            for tag in post._tag_ids:
+                self._unindex('tag', tag, uid)
+
+        if 'time' in self._indexes:
+            times, uids, untimed = self._indexes['time']
+            ts = post.timestamp
+            if ts is None:
+                self._indexes['time'] = times, uids, untimed - 1
+            else:
+                ix = uids.index(uid, bisect_left(times, ts))
+                del times[ix]
+                del uids[ix]
+
+        if self._children is not None:
+            for rid in post._reply_ids:
+                self._unlink_child(rid, uid)
+
+    def _count(self, uid, post):
+        """
+        Adds the type counts of a post to the running aggregate.
+        """
+        counts = post.type_counts
+        self._counted[uid] = counts
+        self._type_counts.update(counts)
+
+    def _uncount(self, uid):
+        """
+        Removes the type counts of a post (as they were counted) from the running aggregate.
+        """
+        counts = self._counted.pop(uid)
+        agg = self._type_counts
+        for tok, cnt in counts.items():
+            left = agg[tok] - cnt
+            if left > 0:
+                agg[tok] = left
+            else:
+                del agg[tok]
+
+    def _unindex_author(self, uid, author):
+        """
+        Removes a post from the UIDs of its author.
+        """
+        uids = self._by_author[author]
+        del uids[uid]
+        if not uids:
+            del self._by_author[author]
+
+    def _unindex(self, name, key, uid):
+        """
+        Removes a post from the UIDs under `key` in the secondary index `name` (`lang` or `tag`).
+        """
+        uids = self._indexes[name][key]
+        uids.discard(uid)
+        if not uids:
+            del self._indexes[name][key]
+
+    def _unlink_child(self, rid, uid):
+        """
+        Removes a post from the children of `rid` in the forward adjacency.
+        """
+        children = self._children.get(rid)
+        if children is not None:
+            children.discard(uid)
+            if not children:
+                del self._children[rid]
+
+    def _index(self, name):
+        """
+        Returns the secondary index `name`, building it on first use:
+        `time` (the timestamps of the timed posts in ascending order, their UIDs, and the number of untimed posts),
+        or the map of each `lang` or `tag` to the UIDs of its posts (authors are indexed by `posts_by_author`).
+        """
+        if name in self._indexes:
+            return self._indexes[name]
+
+        if name == 'time':
+            timed = []
+            for uid, post in self._posts.items():
+                ts = post.timestamp
+                if ts is not None:
+                    timed.append((ts, uid))
+
+            # (stable: posts created at the same time keep their order)
+            timed.sort(key=lambda x: x[0])
+            index = ([ts for ts, _ in timed], [uid for _, uid in timed], len(self._posts) - len(timed))
+        else:
+            index = defaultdict(set)
+            for uid, post in self._posts.items():
+                if name == 'tag':
+                    for tag in post._tag_ids:
+                        index[tag].add(uid)
+                else:
+                    index[post.lang].add(uid)
+            index = dict(index)
+
+        self._indexes[name] = index
+        return index
+
+    def _union(self, name, values):
+        """
+        Returns the UIDs of the posts whose `name` (see `_index`) is any of `values`.
+        """
+        index = self._index(name)
+        out = set()
+        for value in values:
+            out |= index.get(value, set())
+
+        return out
+
+    @staticmethod
+    def _intersect(keep, uids):
+        """
+        Restricts a candidate UID set (None for all posts) to `uids`.
+        """
+        if keep is None:
+            return set(uids)
+
+        return keep.intersection(uids)
+
+    def _time_slice(self, before=None, after=None):
+        """
+        Returns the UIDs of the posts created strictly before `before` and/or strictly after `after`
+        (datetimes or POSIX timestamps), found by bisecting the time index.
+        """
+        times, uids, _ = self._index('time')
+
+        lo, hi = 0, len(times)
+        if after is not None:
+            lo = bisect_right(times, after.timestamp() if isinstance(after, datetime) else after)
+        if before is not None:
+            hi = bisect_left(times, before.timestamp() if isinstance(before, datetime) else before)
+
+        return uids[lo:hi]
+
+    def _init_type_counts(self):
+        """
+        Builds the running type count aggregate,
+        either by correcting that of the source conversation for the posts they do not share,
+        or by counting every post.
+        """
+        source, self._type_source = self._type_source, None
+        self._counted = {}
+        self._dirty = set()
+
+        # (at least the posts of the source missing from here would need correcting)
+        if source is not None and source._type_counts is not None and \
+                len(source._posts) - len(self._posts) < len(self._posts):
+            shared = source._posts
+            src_counts = source.type_counts  # brought up to date first
+            missing = [uid for uid, post in shared.items() if self._posts.get(uid) is not post]
+            extra = [uid for uid, post in self._posts.items() if shared.get(uid) is not post]
+
+            if len(missing) + len(extra) < len(self._posts):
+                self._type_counts = Counter(src_counts)
+                self._counted = dict(source._counted)
+                for uid in missing:
+                    self._uncount(uid)
+                for uid in extra:
+                    self._count(uid, self._posts[uid])
+                return
+
+        self._type_counts = Counter()
+        for uid, post in self._posts.items():
+            self._count(uid, post)
+
+    def _sync_type_counts(self):
+        """
+        Recounts the posts modified in place since they were added to the running aggregate
+        (as signalled by the posts, see `_post_modified`).
+        """
+        if not self._dirty:
+            return
+
+        for uid in self._dirty:
+            self._uncount(uid)
+            self._count(uid, self._posts[uid])
+        self._dirty.clear()
+
+    def _build_adjacency(self):
+        """
+        Builds the forward adjacency map (parent UID -> children UIDs) over all reply edges.
+        Once built, it is updated incrementally by `add_post` and `remove_post`, and as posts are modified in place.
+        """
+        self._children = defaultdict(set)
+        for uid, post in self._posts.items():
+            for rid in post._reply_ids:
+                self._children[rid].add(uid)
+
+    def _child_ids(self, uid):
+        """
+        Returns the UIDs of the posts in this conversation that reply to `uid`.
+        """
+        if self._children is None:
+            self._build_adjacency()
+
+        return self._children.get(uid, set())
+
+    def _parent_ids(self, uid):
+        """
+        Returns the UIDs of the posts in this conversation that `uid` replies to.
+        """
+        return {rid for rid in self._posts[uid]._reply_ids if rid in self._posts}
+
+    def _reachable_ids(self, uid, step):
+        """
+        Returns the UIDs reachable from `uid` by repeatedly following `step` (a UID -> set(UID) function).
+        `uid` itself is only included if it can reach itself.
+        """
+        seen = set()
+        stack = list(step(uid))
+        while stack:
+            xid = stack.pop()
+            if xid in seen:
+                continue
+
+            seen.add(xid)
+            stack.extend(step(xid) - seen)
+
+        return seen
+
+    def _subset(self, pids, uid, relation, include_post):
+        """
+        Creates the (read-only) view of the posts in `pids`,
+        optionally including the post `uid`, labeled by a `relation` to `uid`.
+        """
+        uids = dict.fromkeys(pids)
+        if include_post:
+            uids[uid] = None
+
+        return ConversationView(self, uids, label=(uid, relation))
 
     def get_ancestors(self, uid, include_post=False):
         """
@@ -330,31 +803,10 @@ class Conversation:
 
         Returns
         -------
-        Conversation
+        ConversationView
             The collection of ancestor posts
         """
-        if 'ancestors' in self._relation_map and uid in self._relation_map['ancestors']:
-            pids = self._relation_map['ancestors'][uid]
-            filt_ps = {pid: self.posts[pid] for pid in pids}
-        else:
-            # get parents
-            ps = self.get_parents(uid)
-            filt_ps = dict(ps.posts)
-
-            # for each parent, add its ancestors
-            for pid in ps.posts:
-                for xid in self.get_ancestors(pid).posts:
-                    if xid not in filt_ps:
-                        filt_ps[xid] = self.posts[xid]
-
-            self._relation_map['ancestors'][uid] = set(filt_ps.keys())
-
-        ancestors = Conversation(posts=filt_ps, convo_id=self.convo_id + '-' + str(uid) + '-ancestors')
-
-        if include_post:
-            ancestors.add_post(self.posts[uid])
-
-        return ancestors
+        return self._subset(self._reachable_ids(uid, self._parent_ids), uid, 'ancestors', include_post)
 
     def get_descendants(self, uid, include_post=False):
         """
@@ -370,31 +822,10 @@ class Conversation:
 
         Returns
         -------
-        Conversation
+        ConversationView
             The collection of descendant posts
         """
-        if 'descendant' in self._relation_map and uid in self._relation_map['descendant']:
-            pids = self._relation_map['descendant'][uid]
-            filt_ps = {pid: self.posts[pid] for pid in pids}
-        else:
-            # get children
-            ps = self.get_children(uid)
-            filt_ps = dict(ps.posts)
-
-            # for each child, add its descendants
-            for pid in ps.posts:
-                for xid in self.get_descendants(pid).posts:
-                    if xid not in filt_ps:
-                        filt_ps[xid] = self.posts[xid]
-
-            self._relation_map['descendant'][uid] = set(filt_ps.keys())
-
-        descendants = Conversation(posts=filt_ps, convo_id=self.convo_id + '-' + str(uid) + '-descendant')
-
-        if include_post:
-            descendants.add_post(self.posts[uid])
-
-        return descendants
+        return self._subset(self._reachable_ids(uid, self._child_ids), uid, 'descendant', include_post)
 
     def get_parents(self, uid, include_post=False):
         """
@@ -410,22 +841,10 @@ class Conversation:
 
         Returns
         -------
-        Conversation
+        ConversationView
             The collection of parent posts
         """
-        if 'parents' in self._relation_map and uid in self._relation_map['parents']:
-            pids = self._relation_map['parents'][uid]
-            filt_ps = {pid: self.posts[pid] for pid in pids}
-        else:
-            filt_ps = {pid: post for pid, post in self.posts.items() if pid in self.posts[uid].reply_to}
-            self._relation_map['parents'][uid] = set(filt_ps.keys())
-
-        cx = Conversation(posts=filt_ps, convo_id=self.convo_id + '-' + str(uid) + '-parents')
-
-        if include_post:
-            cx.add_post(self.posts[uid])
-
-        return cx
+        return self._subset(self._parent_ids(uid), uid, 'parents', include_post)
 
     def get_children(self, uid, include_post=False):
         """
@@ -441,22 +860,10 @@ class Conversation:
 
         Returns
         -------
-        Conversation
+        ConversationView
             The collection of children posts
         """
-        if 'children' in self._relation_map and uid in self._relation_map['children']:
-            pids = self._relation_map['children'][uid]
-            filt_ps = {pid: self.posts[pid] for pid in pids}
-        else:
-            filt_ps = {pid: post for pid, post in self.posts.items() if uid in self.posts[pid].reply_to}
-            self._relation_map['children'][uid] = set(filt_ps.keys())
-
-        cx = Conversation(posts=filt_ps, convo_id=self.convo_id + '-' + str(uid) + '-children')
-
-        if include_post:
-            cx.add_post(self.posts[uid])
-
-        return cx
+        return self._subset(self._child_ids(uid), uid, 'children', include_post)
 
     def get_siblings(self, uid, include_post=False):
         """
@@ -473,29 +880,15 @@ class Conversation:
 
         Returns
         -------
-        Conversation
+        ConversationView
             The collection of sibling posts
         """
-        if 'siblings' in self._relation_map and uid in self._relation_map['siblings']:
-            pids = self._relation_map['siblings'][uid]
-            siblings = Conversation(posts={pid: self.posts[pid] for pid in pids}, convo_id=self.convo_id + '-' + str(uid) + '-siblings')
-        else:
-            # just caches the parent IDs
-            self.get_parents(uid)
+        pids = set()
+        for pid in self._parent_ids(uid):
+            pids |= self._child_ids(pid)
+        pids.discard(uid)
 
-            siblings = Conversation(convo_id=self.convo_id + '-' + str(uid) + '-siblings')
-            for pid in self._relation_map['parents'][uid]:
-                siblings += self.get_children(pid)
-
-            self._relation_map['siblings'][uid] = set(siblings.posts.keys())
-
-        if uid in siblings.posts and not include_post:
-            siblings.remove_post(uid)
-
-        if include_post and uid not in siblings.posts:
-            siblings.add_post(self.posts[uid])
-
-        return siblings
+        return self._subset(pids, uid, 'siblings', include_post)
 
     def get_before(self, uid, include_post=False):
         """
@@ -512,7 +905,7 @@ class Conversation:
 
         Returns
         -------
-        Conversation
+        ConversationView
             The collection of posts posted before uid
 
         Raises
@@ -520,19 +913,10 @@ class Conversation:
         KeyError
             When `uid` is not in the Conversation
         """
-        if 'before' in self._relation_map and uid in self._relation_map['before']:
-            pids = self._relation_map['before'][uid]
-            filt_posts = {pid: self.posts[pid] for pid in pids}
-        else:
-            filt_posts = {pid: self.posts[pid] for pid in self.filter(before=self._posts[uid].created_at)}
-            self._relation_map['before'][uid] = set(filt_posts.keys())
+        ts = self._posts[uid].timestamp
+        pids = self._posts if ts is None else self._time_slice(before=ts)
 
-        cx = Conversation(posts=filt_posts, convo_id=self.convo_id + '-' + str(uid) + '-before')
-
-        if include_post:
-            cx.add_post(self.posts[uid])
-
-        return cx
+        return self._subset(pids, uid, 'before', include_post)
 
     def get_after(self, uid, include_post=False):
         """
@@ -549,7 +933,7 @@ class Conversation:
 
         Returns
         -------
-        Conversation
+        ConversationView
             The collection of posts posted after uid
 
         Raises
@@ -557,16 +941,360 @@ class Conversation:
         KeyError
             When `uid` is not in the Conversation
         """
-        if 'after' in self._relation_map and uid in self._relation_map['after']:
-            pids = self._relation_map['after'][uid]
-            filt_posts = {pid: self.posts[pid] for pid in pids}
-        else:
-            filt_posts = {pid: self.posts[pid] for pid in self.filter(after=self._posts[uid].created_at)}
-            self._relation_map['after'][uid] = set(filt_posts.keys())
+        ts = self._posts[uid].timestamp
+        pids = self._posts if ts is None else self._time_slice(after=ts)
 
-        cx = Conversation(posts=filt_posts, convo_id=self.convo_id + '-' + str(uid) + '-after')
+        return self._subset(pids, uid, 'after', include_post)
 
-        if include_post:
-            cx.add_post(self.posts[uid])
+
+class _PostsView(Mapping):
+
+    """
+    A read-only mapping of some of the posts of a conversation (or view), restricted to a set of UIDs.
+    It refuses to be read once posts have been added to or removed from the conversation,
+    or their replies or creation times modified, as its UIDs may no longer hold:
+    this is checked on each lookup, and once per iteration over its keys, items or values.
+    """
+
+    __slots__ = ('_convo', '_posts', '_uids', '_structure')
+
+    def __init__(self, convo, uids):
+        # (views of views are checked against, and read from, the conversation at the root)
+        while isinstance(convo, ConversationView):
+            convo = convo._convo
+        self._convo = convo
+        self._posts = convo._posts
+        self._uids = uids
+        self._structure = convo._structure
+
+    def _check(self):
+        if self._convo._structure != self._structure:
+            raise RuntimeError('The posts of the conversation of this view changed; materialize views to keep them.')
+
+    def __getitem__(self, uid):
+        self._check()
+        if uid not in self._uids:
+            raise KeyError(uid)
+
+        return self._posts[uid]
+
+    def __contains__(self, uid):
+        self._check()
+        return uid in self._uids
+
+    def __iter__(self):
+        self._check()
+        return iter(self._uids)
+
+    def __len__(self):
+        self._check()
+        return len(self._uids)
+
+    def items(self):
+        return _PostsItems(self)
+
+    def values(self):
+        return _PostsValues(self)
+
+
+class _PostsItems(ItemsView):
+
+    __slots__ = ()
+
+    def __iter__(self):
+        view = self._mapping
+        view._check()
+        posts = view._posts
+        for uid in view._uids:
+            yield uid, posts[uid]
+
+
+class _PostsValues(ValuesView):
+
+    __slots__ = ()
+
+    def __iter__(self):
+        view = self._mapping
+        view._check()
+        posts = view._posts
+        for uid in view._uids:
+            yield posts[uid]
+
+
+class ConversationView(Conversation):
+
+    """
+    A read-only Conversation of some of the posts of another conversation (e.g., the ancestors of a post),
+    backed by the posts of that conversation and the UIDs of the posts it holds, rather than a copy of them.
+    Its identifier is only built when asked for.
+
+    A view is invalidated when posts are added to or removed from the conversation it is drawn from,
+    or their replies or creation times modified (see `_PostsView`):
+    views to keep (or modify) should be copied with `materialize` first.
+    Other modifications of posts are followed, by dropping what was built over them (see `_sync`).
+    """
+
+    def __init__(self, convo, uids, label=None):
+        """
+        Constructor for ConversationView.
+
+        Parameters
+        ---------
+        convo : Conversation
+            The conversation (or view) viewed
+        uids : dict(UID, None) or set(UID)
+            The UIDs of the posts of `convo` in this view (iterated in order)
+        label : (UID, str)
+            The post this view is relative to and their relation, labeling its `convo_id`. (Default: None)
+        """
+        super().__init__(posts=_PostsView(convo, uids))
+        self._convo = convo
+        self._label = label
+
+        # the type counts are derived from those of the conversation viewed
+        self._type_source = convo
+
+        # the version of the conversation at the root that the indexes, adjacency and type counts were built at
+        self._synced = self._posts._convo._version
+
+    @property
+    def convo_id(self):
+        """
+        The conversation identifier: that of the conversation viewed, followed by the label of the view.
+
+        Returns
+        -------
+        Any (or str)
+            Returns a conversation identifier
+        """
+        if self._label is None:
+            return self._convo.convo_id
+
+        uid, relation = self._label
+        return self._convo.convo_id + '-' + str(uid) + '-' + relation
+
+    @property
+    def version(self):
+        """
+        The version of the conversation viewed (see `Conversation.version`).
+
+        Returns
+        -------
+        int
+            The number of modifications of the conversation viewed
+        """
+        return self._convo.version
+
+    def materialize(self):
+        """
+        Copies this view into a (modifiable) Conversation of the same posts.
+
+        Returns
+        -------
+        Conversation
+            The conversation of the posts of this view
+        """
+        cx = Conversation(posts=dict(self._posts.items()), convo_id=self.convo_id)
+        cx._type_source = self if self._type_counts is not None else self._convo
 
         return cx
+
+    @property
+    def type_counts(self):
+        """
+        The type frequency distribution of the posts of this view (see `Conversation.type_counts`).
+
+        Returns
+        -------
+        collections.Counter
+            The count of each token type
+        """
+        self._sync()
+        return super().type_counts
+
+    @property
+    def posts_by_author(self):
+        """
+        The UIDs of the posts of each author in this view (see `Conversation.posts_by_author`).
+
+        Returns
+        -------
+        dict(str, dict(UID, None))
+            The UIDs of the posts of each author
+        """
+        self._sync()
+        return super().posts_by_author
+
+    def _index(self, name):
+        self._sync()
+        return super()._index(name)
+
+    def _child_ids(self, uid):
+        self._sync()
+        return super()._child_ids(uid)
+
+    def _sync(self):
+        """
+        Checks that this view still holds (see `_PostsView`),
+        and drops what was built over its posts if any post of the conversation viewed was modified since.
+        Views are not told of the modifications of their posts (see `_own`), so they compare versions instead.
+        """
+        self._posts._check()
+
+        version = self._posts._convo._version
+        if self._synced != version:
+            self._synced = version
+            self._by_author = None
+            self._indexes.clear()
+            self._children = None
+            self._type_counts = self._counted = self._dirty = None
+            self._type_source = self._convo
+
+    def _own(self):
+        """
+        Views are not registered with their posts: their modifications are signalled to the conversation viewed,
+        whose version views share.
+        """
+
+    def _read_only(self, *args, **kwargs):
+        raise TypeError('ConversationView is read-only; use `materialize` to modify a copy.')
+
+    add_post = _read_only
+    remove_post = _read_only
+    redact = _read_only
+    __ior__ = _read_only
+
+
+class Segmenter:
+
+    """
+    Incrementally segments a stream of posts into disjoint (i.e., not connected by any replies) conversations.
+
+    Posts are grouped with a disjoint-set (union-find) forest over their `reply_to` edges,
+    so memory grows with the number of posts rather than with a full graph representation.
+    A reply edge only joins two posts once both of them have been added,
+    which gives the same segments as `Conversation.segment` regardless of arrival order.
+    """
+
+    def __init__(self, posts=None):
+        """
+        Constructor for Segmenter.
+
+        Parameters
+        ----------
+        posts : iterable(UniMessage)
+            Optional posts to begin segmenting with
+        """
+        self._posts = {}  # uid -> post object
+        self._parent = {}  # uid -> parent uid in the union-find forest
+        self._size = {}  # root uid -> number of posts in its segment
+        self._pending = defaultdict(list)  # unseen uid -> UIDs of posts that reply to it
+
+        if posts:
+            self.update(posts)
+
+    def __len__(self):
+        return len(self._posts)
+
+    @property
+    def posts(self):
+        """
+        Returns a dictionary of all posts added so far, keyed by their UIDs.
+
+        Returns
+        -------
+        dict(UID, UniMessage)
+            The dictionary of posts contained in this Segmenter
+        """
+        return self._posts
+
+    def _find(self, uid):
+        """
+        Returns the root UID of the segment containing `uid` (with path halving).
+        """
+        parent = self._parent
+        while parent[uid] != uid:
+            parent[uid] = parent[parent[uid]]
+            uid = parent[uid]
+        return uid
+
+    def _union(self, a, b):
+        """
+        Joins the segments containing `a` and `b` (union by size).
+        """
+        a, b = self._find(a), self._find(b)
+        if a == b:
+            return
+
+        if self._size[a] < self._size[b]:
+            a, b = b, a
+
+        self._parent[b] = a
+        self._size[a] += self._size.pop(b)
+
+    def add_post(self, post):
+        """
+        Adds a post to the segmentation.
+        Posts that share a UID with a previously added post are merged into it.
+
+        Parameters
+        ----------
+        post : UniMessage
+            The post to add
+
+        Returns
+        -------
+        None
+        """
+        uid = post.uid
+        if uid in self._posts:
+            self._posts[uid] |= post
+        else:
+            self._posts[uid] = post
+            self._parent[uid] = uid
+            self._size[uid] = 1
+
+            # join any earlier posts that were waiting on this one
+            for cid in self._pending.pop(uid, ()):
+                self._union(cid, uid)
+
+        for rid in post._reply_ids:
+            if rid in self._parent:
+                self._union(uid, rid)
+            else:
+                self._pending[rid].append(uid)
+
+    def update(self, posts):
+        """
+        Adds several posts (e.g., the posts of a Conversation fragment) to the segmentation, in order.
+
+        Parameters
+        ----------
+        posts : iterable(UniMessage)
+            The posts to add
+
+        Returns
+        -------
+        None
+        """
+        for post in posts:
+            self.add_post(post)
+
+    def segments(self):
+        """
+        Returns the disjoint conversations among all posts added so far.
+        Segments are ordered by the earliest added post they contain.
+
+        Returns
+        -------
+        list(Conversation)
+            A list of sub-conversations
+        """
+        segments = {}
+        for uid, post in self._posts.items():
+            root = self._find(uid)
+            if root not in segments:
+                segments[root] = Conversation()
+            segments[root].add_post(post)
+
+        return list(segments.values())
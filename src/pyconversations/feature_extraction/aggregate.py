@@ -0,0 +1,218 @@
+"""
+Grouped summary statistics of feature matrices.
+
+The rows of a matrix (e.g., the features of posts) are split into contiguous groups (e.g., the posts of each user),
+and each statistic of every column is computed for all the groups at once, by a few reductions over the matrix,
+rather than by a numpy call per group and column.
+The statistics are those of `np.nanmin`, `np.nanmax`, `np.nanmean`, `np.median` and `np.nanstd` (in that order).
+"""
+from itertools import chain
+
+import numpy as np
+
+STATS = ('min', 'max', 'mean', 'median', 'std')
+
+
+def group_starts(sizes):
+    """
+    Returns the row index starting each group, given the size of each group.
+
+    Parameters
+    ----------
+    sizes : list(int)
+        The (positive) number of rows of each group, in order
+
+    Returns
+    -------
+    np.array
+    """
+    starts = np.zeros(len(sizes), dtype=np.intp)
+    np.cumsum(sizes[:-1], out=starts[1:])
+    return starts
+
+
+def group_by(keys):
+    """
+    Groups the rows of a matrix by key, e.g. the posts of a conversation by author.
+
+    Parameters
+    ----------
+    keys : list
+        The (hashable) key of each row
+
+    Returns
+    -------
+    list
+        The distinct keys, in the order they first appear in
+    np.array
+        The rows sorted by group (stable within each group), to index the matrix with
+    np.array
+        The row index (of the sorted matrix) starting each group
+    """
+    groups = {}
+    for row, key in enumerate(keys):
+        groups.setdefault(key, []).append(row)
+
+    order = np.fromiter(chain.from_iterable(groups.values()), dtype=np.intp, count=len(keys))
+    return list(groups), order, group_starts([len(rows) for rows in groups.values()])
+
+
+def grouped_sums(values, starts):
+    """
+    Returns the sum of each column over each group of rows.
+
+    Parameters
+    ----------
+    values : np.array
+        A (rows, columns) matrix, its rows sorted by group
+    starts : np.array
+        The row index starting each (non-empty) group
+
+    Returns
+    -------
+    np.array
+        A (groups, columns) matrix, of the dtype of `values`
+    """
+    values = np.asarray(values)
+    if not len(starts):
+        return np.zeros((0,) + values.shape[1:], dtype=values.dtype)
+
+    return np.add.reduceat(values, starts, axis=0)
+
+
+def grouped_stats(values, starts, single_std=None):
+    """
+    Returns the statistics of each column over each group of rows:
+    NaN values are ignored, except by the median (NaN for groups holding any), as by the numpy functions.
+
+    Parameters
+    ----------
+    values : np.array
+        A (rows, columns) matrix, its rows sorted by group
+    starts : np.array
+        The row index starting each (non-empty) group
+    single_std : float
+        The standard deviation of the groups of a single row. Default: None (computed, i.e., 0 or NaN)
+
+    Returns
+    -------
+    dict(str, np.array)
+        A (groups, columns) matrix for each statistic of `STATS`
+    """
+    values = np.asarray(values, dtype=float)
+    starts = np.asarray(starts, dtype=np.intp)
+    if not len(starts) or not values.shape[1]:
+        return {stat: np.zeros((len(starts), values.shape[1])) for stat in STATS}
+
+    sizes = np.diff(np.append(starts, len(values)))
+    group = np.repeat(np.arange(len(starts)), sizes)
+
+    missing = np.isnan(values)
+    counts = np.add.reduceat((~missing).astype(np.intp), starts, axis=0)
+
+    # (groups of NaNs only are NaN, silently)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        mean = np.add.reduceat(np.where(missing, 0, values), starts, axis=0) / counts
+        dev = np.where(missing, 0, values - mean[group])
+        std = np.sqrt(np.add.reduceat(dev * dev, starts, axis=0) / counts)
+    if single_std is not None:
+        std[sizes == 1] = single_std
+
+    return {
+        'min':    np.fmin.reduceat(values, starts, axis=0),
+        'max':    np.fmax.reduceat(values, starts, axis=0),
+        'mean':   mean,
+        'median': _grouped_median(values, missing, group, starts, sizes),
+        'std':    std,
+    }
+
+
+def _grouped_median(values, missing, group, starts, sizes):
+    """
+    Returns the median of each column over each group of rows, sorting each column within groups.
+    """
+    lo = starts + (sizes - 1) // 2
+    hi = starts + sizes // 2
+    odd = lo == hi
+
+    out = np.empty((len(starts), values.shape[1]))
+    for col in range(values.shape[1]):
+        ordered = values[np.lexsort((values[:, col], group)), col]
+        out[:, col] = np.where(odd, ordered[lo], (ordered[lo] + ordered[hi]) / 2)
+
+    out[np.maximum.reduceat(missing, starts, axis=0)] = np.nan
+    return out
+
+
+def stats_names(keys, prefix):
+    """
+    Returns the names of the statistics of each column, as `stats_dict` reports them.
+
+    Parameters
+    ----------
+    keys : list(str)
+        The name of each column
+    prefix : str
+        The prefix of the names (e.g., `post`)
+
+    Returns
+    -------
+    list(str)
+    """
+    return [f'{prefix}_{stat}_{key}' for key in keys for stat in STATS]
+
+
+def stats_dict(stats, row, keys, prefix):
+    """
+    Returns the statistics of a group as a flat dictionary,
+    named `{prefix}_{stat}_{key}` by column, then by statistic.
+
+    Parameters
+    ----------
+    stats : dict(str, np.array)
+        The statistics of the groups (see `grouped_stats`)
+    row : int
+        The index of the group
+    keys : list(str)
+        The name of each column
+    prefix : str
+        The prefix of the names (e.g., `post`)
+
+    Returns
+    -------
+    dict(str, float)
+    """
+    out = {}
+    for col, key in enumerate(keys):
+        for stat in STATS:
+            out[f'{prefix}_{stat}_{key}'] = float(stats[stat][row, col])
+
+    return out
+
+
+def summarize(rows, prefix, single_std=None):
+    """
+    Returns the statistics of each feature over a collection of feature dictionaries
+    (e.g., the features of each user of a conversation), as a flat dictionary (see `stats_dict`).
+    Features missing from some of the dictionaries are NaN there.
+
+    Parameters
+    ----------
+    rows : list(dict(str, float))
+        The features of each item
+    prefix : str
+        The prefix of the names (e.g., `user`)
+    single_std : float
+        The standard deviation of a single item. Default: None (computed)
+
+    Returns
+    -------
+    dict(str, float)
+        The statistics of each feature (empty if there are no rows)
+    """
+    if not rows:
+        return {}
+
+    keys = list(dict.fromkeys(chain.from_iterable(rows)))
+    values = np.array([[row.get(k, np.nan) for k in keys] for row in rows], dtype=float)
+    return stats_dict(grouped_stats(values, [0], single_std=single_std), 0, keys, prefix)
@@ -0,0 +1,234 @@
+"""
+A shared, bounded cache for the feature functions of this package.
+
+Conversations and messages passed to a feature function are keyed by identity and only weakly referenced:
+a cached value is filed under each of them (its owners) and dropped as soon as any of them is garbage collected,
+rather than keeping them alive.
+Each value remembers the `version` of its owners when it was computed
+and is recomputed once any of them has been modified (e.g., after `Conversation.add_post`).
+"""
+from collections import OrderedDict
+from functools import wraps
+from inspect import signature
+from weakref import ref
+
+from .params import CACHE_SIZE
+
+
+class FeatureCache:
+
+    """
+    A least-recently-used store of feature values, bounded by a global number of entries.
+    """
+
+    def __init__(self, maxsize=CACHE_SIZE):
+        """
+        Parameters
+        ----------
+        maxsize : int
+            The maximum number of cached values, across all functions and owners. (Default: CACHE_SIZE)
+        """
+        self._maxsize = maxsize
+        self._entries = OrderedDict()  # (function name, arguments or owner ids) -> (owner ids, owner versions, value)
+        self._owners = {}  # owner id -> (weak reference to the owner, keys of its entries)
+        self._weakrefable = {}  # type -> whether its instances are owners
+
+        self._hits = 0
+        self._misses = 0
+        self._invalidations = 0
+        self._evictions = 0
+
+    def _drop_owner(self, oid):
+        _, keys = self._owners.pop(oid, (None, ()))
+        for key in keys:
+            self._drop(key)
+
+    def _drop(self, key):
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return
+
+        for oid in entry[0]:
+            if oid in self._owners:
+                keys = self._owners[oid][1]
+                keys.discard(key)
+                if not keys:
+                    del self._owners[oid]
+
+    def _evict(self):
+        while len(self._entries) > self._maxsize:
+            self._drop(next(iter(self._entries)))
+            self._evictions += 1
+
+    def call(self, func, name, args):
+        """
+        Returns `func(*args)`, from the cache when it holds an up-to-date value.
+        Calls with unhashable arguments are passed through.
+
+        Parameters
+        ----------
+        func : callable
+            The feature function
+        name : str
+            The qualified name of the feature function
+        args : tuple
+            The positional arguments of the call
+
+        Returns
+        -------
+        object
+            The value of the feature
+        """
+        if not self._maxsize:
+            return func(*args)
+
+        owners = []
+        parts = []
+        for arg in args:
+            cls = type(arg)
+            if cls not in self._weakrefable:
+                self._weakrefable[cls] = hasattr(cls, '__weakref__')
+
+            if self._weakrefable[cls]:
+                owners.append(arg)
+                parts.append(id(arg))
+            else:
+                parts.append(arg)
+
+        key = (name, tuple(parts))
+        versions = tuple([getattr(owner, 'version', None) for owner in owners])
+
+        try:
+            entry = self._entries.get(key)
+        except TypeError:
+            return func(*args)
+
+        if entry is not None:
+            if entry[1] == versions:
+                self._hits += 1
+                self._entries.move_to_end(key)
+                return entry[2]
+
+            self._invalidations += 1
+
+        self._misses += 1
+        value = func(*args)
+
+        oids = tuple(id(owner) for owner in owners)
+        self._entries[key] = (oids, versions, value)
+        self._entries.move_to_end(key)
+        for owner, oid in zip(owners, oids):
+            if oid not in self._owners:
+                self._owners[oid] = (ref(owner, lambda _, oid=oid: self._drop_owner(oid)), set())
+            self._owners[oid][1].add(key)
+        self._evict()
+
+        return value
+
+    def resize(self, maxsize):
+        """
+        Changes the maximum number of cached values, evicting the least recently used ones if needed.
+
+        Parameters
+        ----------
+        maxsize : int
+            The maximum number of cached values. 0 disables caching.
+        """
+        self._maxsize = maxsize
+        self._evict()
+
+    def cache_info(self):
+        """
+        Returns statistics of the cache.
+
+        Returns
+        -------
+        dict(str, int)
+            The number of `hits`, `misses` (of which `invalidations` were outdated values),
+            `evictions`, the `maxsize`, the current size (`currsize`) and number of `owners` of the cache
+        """
+        return {
+            'hits':          self._hits,
+            'misses':        self._misses,
+            'invalidations': self._invalidations,
+            'evictions':     self._evictions,
+            'maxsize':       self._maxsize,
+            'currsize':      len(self._entries),
+            'owners':        len(self._owners),
+        }
+
+    def cache_clear(self):
+        """
+        Empties the cache and resets its statistics.
+        """
+        self._entries.clear()
+        self._owners.clear()
+        self._hits = 0
+        self._misses = 0
+        self._invalidations = 0
+        self._evictions = 0
+
+
+FEATURE_CACHE = FeatureCache()
+
+
+def cached_feature(func):
+    """
+    Decorates a feature function so that its values are kept in the shared `FEATURE_CACHE`.
+    Keyword arguments and defaults are bound to positions, so that equivalent calls share their values.
+
+    Parameters
+    ----------
+    func : callable
+        The feature function
+
+    Returns
+    -------
+    callable
+        The cached feature function
+    """
+    sig = signature(func)
+    n_params = len(sig.parameters)
+    name = f'{func.__module__}.{func.__qualname__}'
+
+    @wraps(func)
+    def wrapper(*args, **kwargs):
+        if kwargs or len(args) != n_params:
+            bound = sig.bind(*args, **kwargs)
+            bound.apply_defaults()
+            args = bound.args
+
+        return FEATURE_CACHE.call(func, name, args)
+
+    return wrapper
+
+
+def cache_info():
+    """
+    Returns statistics of the shared feature cache.
+
+    Returns
+    -------
+    dict(str, int)
+        See `FeatureCache.cache_info`
+    """
+    return FEATURE_CACHE.cache_info()
+
+
+def cache_clear():
+    """
+    Empties the shared feature cache and resets its statistics.
+    """
+    FEATURE_CACHE.cache_clear()
+
+
+def set_cache_size(maxsize):
+    """
+    Changes the maximum number of values held by the shared feature cache.
+
+    Parameters
+    ----------
+    maxsize : int
+        The maximum number of cached values. 0 disables caching.
+    """
+    FEATURE_CACHE.resize(maxsize)
@@ -1,23 +1,24 @@
 from collections import Counter
-from collections import defaultdict
-from functools import lru_cache
 
 import networkx as nx
-import numpy as np
 
+from .aggregate import stats_names
+from .aggregate import summarize
+from .cache import cached_feature
+from .harmonic import MIXING_PARAMS
 from .harmonic import mixing
 from .harmonic import novelty
-from .params import CACHE_SIZE
+from .post_in_conv import PostInConvoFeatures as PICF
 from .post_in_conv import agg_post_stats
 from .post_in_conv import conversation_type_frequency_distribution as type_frequency_distribution
 from .post_in_conv import depth_dist
-from .post_in_conv import out_degree
-from .post_in_conv import post_degree
-from .post_in_conv import post_in_degree
 from .post_in_conv import sum_booleans_across_convo as sum_post_bools
 from .post_in_conv import sum_ints_across_convo as sum_post_ints
+from .tree import tree_metrics
+from .user_in_conv import UserInConvoFeatures
 from .user_in_conv import agg_user_stats
 from .user_in_conv import messages_per_user
+from .user_in_conv import post_sum_names
 
 
 class ConvoFeatures:
@@ -47,7 +48,7 @@ class ConvoFeatures:
 
     @staticmethod
     def floats(convo):
-        out = mixing_features(convo)
+        out = dict(mixing_features(convo))  # (the cached features are shared)
         out['duration'] = duration(convo)
         out['density'] = density(convo)
 
@@ -82,8 +83,29 @@ class ConvoFeatures:
     def strs(convo):
         return {}
 
+    @staticmethod
+    def schema():
+        """
+        Returns the names of the boolean, float and integer features, in the order they are computed in.
+
+        Returns
+        -------
+        dict(str, list(str))
+        """
+        post = PICF.schema()
+        user = UserInConvoFeatures.schema()
+        return {
+            'bools':  [],
+            'floats': (
+                MIXING_PARAMS + ['duration', 'density']
+                + stats_names(post['floats'] + post['ints'], 'post')
+                + stats_names(user['floats'] + user['ints'], 'user')
+            ),
+            'ints':   ['messages', 'tree_degree', 'tree_depth', 'tree_width', 'types', 'users'] + post_sum_names(post),
+        }
 
-@lru_cache(maxsize=CACHE_SIZE)
+
+@cached_feature
 def degree_size_distribution(convo):
     """
     Returns the post degree size distribution for this Conversation.
@@ -98,10 +120,10 @@ def degree_size_distribution(convo):
     -------
     collections.Counter
     """
-    return Counter([post_degree(p, convo) for p in convo.posts.values()])
+    return Counter(tree_metrics(convo).degree.tolist())
 
 
-@lru_cache(maxsize=CACHE_SIZE)
+@cached_feature
 def degree_in_size_distribution(convo):
     """
     Returns the post in-degree size distribution for this Conversation.
@@ -116,10 +138,10 @@ def degree_in_size_distribution(convo):
     -------
     collections.Counter
     """
-    return Counter([post_in_degree(p, convo) for p in convo.posts.values()])
+    return Counter(tree_metrics(convo).in_degree.tolist())
 
 
-@lru_cache(maxsize=CACHE_SIZE)
+@cached_feature
 def degree_out_size_distribution(convo):
     """
     Returns the post out-degree size distribution for this Conversation.
@@ -134,10 +156,10 @@ def degree_out_size_distribution(convo):
     -------
     collections.Counter
     """
-    return Counter([out_degree(p) for p in convo.posts.values()])
+    return Counter(tree_metrics(convo).out_degree.tolist())
 
 
-@lru_cache(maxsize=CACHE_SIZE)
+@cached_feature
 def user_size_dist(conv):
     """
     Returns a distribution of the number of posts per user mapping to the number of users
@@ -156,7 +178,7 @@ def user_size_dist(conv):
     return Counter(list(messages_per_user(conv).values()))
 
 
-@lru_cache(maxsize=CACHE_SIZE)
+@cached_feature
 def density(conv):
     """
     The density of the conversation as a DAG
@@ -178,7 +200,7 @@ def density(conv):
     return nx.density(conv.as_graph())
 
 
-@lru_cache(maxsize=CACHE_SIZE)
+@cached_feature
 def tree_depth(conv):
     """
     Returns the depth of the full conversation.
@@ -197,7 +219,7 @@ def tree_depth(conv):
     return max(depth_dist(conv).keys())
 
 
-@lru_cache(maxsize=CACHE_SIZE)
+@cached_feature
 def tree_width(conv):
     """
     Returns the width of the full conversation.
@@ -216,7 +238,7 @@ def tree_width(conv):
     return max(depth_dist(conv).values())
 
 
-@lru_cache(maxsize=CACHE_SIZE)
+@cached_feature
 def tree_degree(conv):
     """
     Returns the degree of the full conversation.
@@ -235,7 +257,7 @@ def tree_degree(conv):
     return max(degree_size_distribution(conv).keys())
 
 
-@lru_cache(maxsize=CACHE_SIZE)
+@cached_feature
 def time_series(conv, normalize_by_first=True):
     """
     Returns the list of timestamps of when posts where added to this Conversation.
@@ -252,7 +274,7 @@ def time_series(conv, normalize_by_first=True):
     list(float)
     """
     order = conv.time_order()
-    out = [conv.posts[uid].created_at.timestamp() for uid in order] if order else []
+    out = [conv.posts[uid].timestamp for uid in order] if order else []
     if normalize_by_first and out:
         start = out[0]
         out = [o - start for o in out]
@@ -260,7 +282,7 @@ def time_series(conv, normalize_by_first=True):
     return out
 
 
-@lru_cache(maxsize=CACHE_SIZE)
+@cached_feature
 def duration(conv):
     """
     Returns the length of the converation in seconds.
@@ -281,7 +303,7 @@ def duration(conv):
     return ts[-1] - ts[0]
 
 
-@lru_cache(maxsize=CACHE_SIZE)
+@cached_feature
 def mixing_features(convo):
     """
     Returns the measured parameters using the harmonic mixing law.
@@ -306,7 +328,7 @@ def mixing_features(convo):
     return mixing(freq)
 
 
-@lru_cache(maxsize=CACHE_SIZE)
+@cached_feature
 def novelty_vector(convo):
     """
     Returns the novelty vector measured from the convo text.
@@ -343,19 +365,5 @@ def agg_convo_stats(convos):
     -------
     dict(str, dict(str, float))
     """
-    agg = defaultdict(list)
-    fs = [ConvoFeatures.floats, ConvoFeatures.ints]
-    for conv in convos:
-        for f in fs:
-            for k, v in f(conv).items():
-                agg[k].append(v)
-
-    out = {}
-    for k, vs in agg.items():
-        out[f'convo_min_{k}'] = float(np.nanmin(vs))
-        out[f'convo_max_{k}'] = float(np.nanmax(vs))
-        out[f'convo_mean_{k}'] = float(np.nanmean(vs))
-        out[f'convo_median_{k}'] = float(np.median(vs))
-        out[f'convo_std_{k}'] = float(np.nanstd(vs) if len(vs) > 1 else 1)
-
-    return out
+    rows = [{**ConvoFeatures.floats(conv), **ConvoFeatures.ints(conv)} for conv in convos]
+    return summarize(rows, 'convo', single_std=1)
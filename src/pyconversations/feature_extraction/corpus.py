@@ -0,0 +1,91 @@
+"""
+A corpus-level index of the posts of each user across conversations.
+
+Features of users across conversations aggregate the features of their posts:
+with the postings of every user at hand, each post is visited once for all users,
+rather than every post of the corpus being scanned for each user.
+"""
+from collections import defaultdict
+
+
+class CorpusIndex:
+
+    """
+    The postings of the authors of a corpus of conversations:
+    for each author, the (conversation index, UID) of each of their posts, in the order of the corpus.
+    The index is built in a single pass over the corpus, which should not be modified afterwards.
+    """
+
+    def __init__(self, convos):
+        """
+        Constructor for CorpusIndex.
+
+        Parameters
+        ----------
+        convos : list(Conversation)
+            The conversations of the corpus
+        """
+        self._convos = list(convos)
+
+        postings = defaultdict(list)
+        for cx, convo in enumerate(self._convos):
+            for uid, post in convo.posts.items():
+                postings[post.author].append((cx, uid))
+        self._postings = dict(postings)
+
+    def __len__(self):
+        return len(self._postings)
+
+    def __contains__(self, user):
+        return user in self._postings
+
+    @property
+    def convos(self):
+        """
+        The conversations of the corpus.
+
+        Returns
+        -------
+        list(Conversation)
+        """
+        return self._convos
+
+    @property
+    def users(self):
+        """
+        The authors of the corpus, in the order they first appear in.
+
+        Returns
+        -------
+        list(str)
+        """
+        return list(self._postings)
+
+    def postings(self, user):
+        """
+        Returns the posts of a user, as (conversation index, UID) pairs in the order of the corpus.
+
+        Parameters
+        ----------
+        user : str
+
+        Returns
+        -------
+        list((int, UID))
+            The postings of the user (empty if they authored no post)
+        """
+        return self._postings.get(user, [])
+
+    def posts(self, user):
+        """
+        Returns the posts of a user, along with the conversation they appear in.
+
+        Parameters
+        ----------
+        user : str
+
+        Returns
+        -------
+        list((UniMessage, Conversation))
+        """
+        return [(self._convos[cx].posts[uid], self._convos[cx]) for cx, uid in self.postings(user)]
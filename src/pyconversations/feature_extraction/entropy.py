@@ -0,0 +1,272 @@
+import numpy as np
+
+from .cache import cached_feature
+from .tree import tree_metrics
+
+# the conversational splits around a post, in the order their entropies are reported
+SPLITS = ['ancestors', 'children', 'descendants', 'full', 'parents', 'post', 'siblings']
+
+# the pairs of splits compared (the post only ever on the left), in the order their entropies are reported
+SPLIT_PAIRS = [(ko, ki) for ko in SPLITS for ki in SPLITS if ko != ki and ki != 'post']
+
+# stands for the rows of the full conversation, which every union with it equals
+FULL = 'full'
+
+
+class EntropyEngine:
+
+    """
+    Token counts of the posts of a conversation, for measuring the entropies between conversational splits
+    without building a Conversation per split (or per pair of splits).
+
+    Token types are mapped to integer IDs and the counts of each post are stored once,
+    as a sparse (CSR) matrix whose rows follow the order of `conv.posts` (as in `TreeMetrics`).
+    The counts of a split (or union of splits) are the sum of its rows.
+    """
+
+    def __init__(self, conv):
+        """
+        Parameters
+        ----------
+        conv : Conversation
+            A collection of posts
+        """
+        vocab = {}
+        lengths = []
+        indices = []
+        data = []
+        for post in conv.posts.values():
+            counts = post.type_counts
+            lengths.append(len(counts))
+            indices.extend(vocab.setdefault(tok, len(vocab)) for tok in counts)
+            data.extend(counts.values())
+
+        self.vocab = vocab
+        self.indptr = np.concatenate(([0], np.cumsum(lengths, dtype=np.int64)))
+        self.indices = np.array(indices, dtype=np.int64)
+        self.data = np.array(data, dtype=np.int64)
+
+        # each row sorted by type ID, so that single rows can be used as they are
+        for ix in range(len(lengths)):
+            start, end = self.indptr[ix], self.indptr[ix + 1]
+            order = np.argsort(self.indices[start:end])
+            self.indices[start:end] = self.indices[start:end][order]
+            self.data[start:end] = self.data[start:end][order]
+
+        self.full = self.counts(np.arange(len(lengths)))
+
+    def counts(self, rows):
+        """
+        Returns the summed token counts of a set of posts.
+
+        Parameters
+        ----------
+        rows : np.ndarray
+            The distinct rows of the posts
+
+        Returns
+        -------
+        np.ndarray
+            The IDs of the types in these posts (sorted)
+        np.ndarray
+            The count of each type
+        """
+        if len(rows) == 1:
+            start, end = self.indptr[rows[0]], self.indptr[rows[0] + 1]
+            return self.indices[start:end], self.data[start:end]
+
+        starts = self.indptr[rows]
+        lengths = self.indptr[rows + 1] - starts
+        total = lengths.sum()
+        positions = np.repeat(starts - np.cumsum(lengths) + lengths, lengths) + np.arange(total)
+
+        ids, inverse = np.unique(self.indices[positions], return_inverse=True)
+        return ids, np.bincount(inverse, weights=self.data[positions], minlength=len(ids)).astype(np.int64)
+
+    @staticmethod
+    def entropy(left, joint):
+        """
+        Returns the average per token normed entropy of the `left` counts with respect to the `joint` counts
+        (which include every type of `left`).
+
+        Parameters
+        ----------
+        left : tuple(np.ndarray, np.ndarray)
+            Type IDs and counts
+        joint : tuple(np.ndarray, np.ndarray)
+            Type IDs and counts
+
+        Returns
+        -------
+        float
+            The entropy (0 if there are no tokens, or fewer than 2 joint types)
+        """
+        left_ids, left_counts = left
+        joint_ids, joint_counts = joint
+
+        joint_n = len(joint_ids)
+        joint_m = joint_counts.sum()
+        left_m = left_counts.sum()
+        if not left_m or joint_n < 2 or not joint_m:
+            return 0
+
+        numer = np.log(joint_counts[np.searchsorted(joint_ids, left_ids)] / joint_m)
+        denom = (np.log(joint_n) * left_m)
+        return -(numer / denom).sum()
+
+    def split_rows(self, ix, metrics):
+        """
+        Returns the rows of each split around a post (each including the post).
+
+        Parameters
+        ----------
+        ix : int
+            The row of the post
+        metrics : TreeMetrics
+            The structure of the conversation
+
+        Returns
+        -------
+        dict(str, frozenset(int))
+            The rows of each split, except for the full conversation (`FULL`)
+        """
+        parents = set(metrics.parents[ix])
+        children = set(metrics.replies[ix])
+
+        siblings = set()
+        for jx in parents:
+            siblings.update(metrics.replies[jx])
+        siblings.discard(ix)
+
+        rows = {
+            'ancestors':   reachable(ix, metrics.parents),
+            'children':    children,
+            'descendants': reachable(ix, metrics.replies),
+            'parents':     parents,
+            'post':        set(),
+            'siblings':    siblings,
+        }
+        out = {key: frozenset(rs | {ix}) for key, rs in rows.items()}
+        out['full'] = FULL
+
+        return out
+
+    def all_splits(self, ix, metrics):
+        """
+        Returns the average per token normed entropy between each pair of conversational splits around a post,
+        as `avg_token_entropy_all_splits` defines them.
+        Splits (and unions of splits) holding the same posts are counted once.
+
+        Parameters
+        ----------
+        ix : int
+            The row of the post
+        metrics : TreeMetrics
+            The structure of the conversation
+
+        Returns
+        -------
+        dict(str, float)
+            Mapping from a conversation split pair considered to the entropy measured
+        """
+        rows = self.split_rows(ix, metrics)
+        counted = {FULL: self.full}
+        measured = {}
+
+        def counts_of(rs):
+            if rs not in counted:
+                counted[rs] = self.counts(np.fromiter(rs, dtype=np.int64, count=len(rs)))
+            return counted[rs]
+
+        def entropy_of(left, joint):
+            if (left, joint) not in measured:
+                measured[left, joint] = float(self.entropy(counts_of(left), counts_of(joint)))
+            return measured[left, joint]
+
+        entropy = {}
+        for ko in SPLITS:
+            for ki in SPLITS:
+                # skip comparison of equal, and restrict post to first key only
+                if ko == ki or ki == 'post':
+                    continue
+
+                left = rows[ko]
+                if ko == 'post':
+                    # every split includes the post: it is its own joint collection
+                    e = entropy_of(left, rows[ki])
+                elif left is FULL:
+                    # nothing to compare: the joint collection is the full conversation
+                    e = 0.
+                else:
+                    joint = FULL if rows[ki] is FULL else left | rows[ki]
+                    joint_size = len(metrics.uids) if joint is FULL else len(joint)
+
+                    # nothing to compare if the joint collection is the left split
+                    if joint_size == len(left):
+                        e = 0.
+                    else:
+                        e = entropy_of(left, joint)
+
+                entropy[f'avg_token_entropy_{ko}-{ki}'] = e
+
+        return entropy
+
+
+def reachable(ix, step):
+    """
+    Returns the rows reachable from row `ix` by repeatedly following `step` (lists of rows, by row).
+    `ix` itself is only included if it can reach itself.
+    """
+    seen = set()
+    stack = list(step[ix])
+    while stack:
+        jx = stack.pop()
+        if jx in seen:
+            continue
+
+        seen.add(jx)
+        stack.extend(step[jx])
+
+    return seen
+
+
+@cached_feature
+def entropy_engine(conv):
+    """
+    Returns the token counts of the posts of the conversation, for measuring entropies between its splits.
+
+    Parameters
+    ----------
+    conv : Conversation
+        A collection of posts
+
+    Returns
+    -------
+    EntropyEngine
+    """
+    return EntropyEngine(conv)
+
+
+def split_entropies(post, conv):
+    """
+    Returns the average per token normed entropy between each pair of conversational splits around `post`.
+
+    Parameters
+    ----------
+    post : UniMessage
+        The post
+    conv : Conversation
+        The collection of posts
+
+    Returns
+    -------
+    dict(str, float) or None
+        Mapping from a conversation split pair considered to the entropy measured,
+        or None if the post is not in the conversation (as it currently is)
+    """
+    metrics = tree_metrics(conv)
+    ix = metrics.row(post)
+    if ix is None:
+        return None
+
+    return entropy_engine(conv).all_splits(ix, metrics)
@@ -6,11 +6,17 @@ from tqdm import tqdm
 
 from ..convo import Conversation
 from ..message import UniMessage
+from ..parallel import map_chunks
+from .cache import FEATURE_CACHE
 from .conv import ConvoFeatures
 from .conv import messages_per_user
+from .corpus import CorpusIndex
 from .post import PostFeatures
+from .post import prefetch_chunks
 from .post_in_conv import PostInConvoFeatures
+from .post_in_conv import post_feature_blocks
 from .user_across_conv import UserAcrossConvoFeatures
+from .user_across_conv import across_convo_features
 from .user_in_conv import UserInConvoFeatures
 
 
@@ -19,11 +25,22 @@ class Vectorizer(ABC):
     """
     Abstract vectorization class.
     Implements normalization.
+
+    Vectorizers compute the raw features of their input once (see `_features`), in the columns declared by the
+    schema of the features (e.g., `PostFeatures.schema`): fitting fits the normalization on them,
+    transforming normalizes them, and `fit_transform` does both from a single computation of the features.
     """
 
-    def __init__(self, normalization):
+    def __init__(self, normalization, cache_size=None, n_workers=1):
         self._stats = {}
 
+        # the number of processes computing the features of (chunks of) items, see `parallel.map_chunks`
+        self._n_workers = n_workers
+
+        # the feature cache is shared by all vectorizers (and feature functions)
+        if cache_size is not None:
+            FEATURE_CACHE.resize(cache_size)
+
         # feature name to column index
         self._num2col = {}
         self._bool2col = {}
@@ -31,11 +48,9 @@ class Vectorizer(ABC):
         # Can be None, 'minmax', 'mean', or 'standard'
         self._norm = normalization
 
-    @abstractmethod
     def fit(self, *args):
         """
-        Abstract method for fitting normalization and vectorization parameters
-        to data in `kwargs`
+        Fits normalization and vectorization parameters to data in `args`
 
         Parameters
         ----------
@@ -46,38 +61,122 @@ class Vectorizer(ABC):
         Vectorizer
             This object should return itself
         """
-        pass
+        values, _, _ = self._features(*args, fit=True)
+        self._fit_params(values)
+
+        return self
+
+    def transform(self, *args, include_ids=False):
+        """
+        Transforms data into a vector (or vectors)
+
+        Parameters
+        ----------
+        args : list
+        include_ids : bool
+
+        Returns
+        -------
+        np.ndarray
+        dict(Hashable, int)
+            Optional. Returned if include_ids=True: mapping from UID to integer row
+        """
+        values, bools, ids = self._features(*args)
+        return self._vectors(values, bools, ids, include_ids)
 
     @abstractmethod
-    def transform(self, *args):
+    def _features(self, *args, fit=False):
         """
-        Abstract method for transforming data into a vector (or vectors)
+        Abstract method computing the raw (not normalized) features of data in `args`,
+        in the columns of the vectorizer (set from the schema of the features if fitting)
 
         Parameters
         ----------
         args : list
+        fit : bool
+            Whether the vectorizer is being fit to the data
 
         Returns
         -------
         np.ndarray
+            The numeric features, one row per item
+        np.ndarray
+            The boolean features (as 0 or 1), one row per item
         dict(Hashable, int)
             Mapping from UID to integer row
         """
         pass
 
-    def fit_transform(self, *args):
+    @staticmethod
+    def cache_info():
+        """
+        Returns statistics of the (shared) feature cache.
+
+        Returns
+        -------
+        dict(str, int)
+            See `FeatureCache.cache_info`
         """
-        Applies both the fit and transform steps of vectorizer
+        return FEATURE_CACHE.cache_info()
+
+    @staticmethod
+    def cache_clear():
+        """
+        Empties the (shared) feature cache and resets its statistics.
+        """
+        FEATURE_CACHE.cache_clear()
+
+    def fit_transform(self, *args, include_ids=False):
+        """
+        Applies both the fit and transform steps of vectorizer,
+        computing the features once: normalization is fit to the raw features, which are then normalized in place.
 
         Parameters
         ----------
         args : List
+        include_ids : bool
+
+        Returns
+        -------
+        np.ndarray
+        dict(Hashable, int)
+            Optional. Returned if include_ids=True: mapping from UID to integer row
+        """
+        values, bools, ids = self._features(*args, fit=True)
+        self._fit_params(values)
+
+        return self._vectors(values, bools, ids, include_ids)
+
+    def _set_columns(self, num_keys, bool_keys):
+        """
+        Sets the column of each numeric and boolean feature.
+
+        Parameters
+        ----------
+        num_keys : list(str)
+            The names of the numeric features, in order
+        bool_keys : list(str)
+            The names of the boolean features, in order
+        """
+        self._num2col = {k: col for col, k in enumerate(num_keys)}
+        self._bool2col = {k: col for col, k in enumerate(bool_keys)}
+
+    def _vectors(self, values, bools, ids, include_ids):
+        """
+        Normalizes the numeric features (in place) and appends the boolean features to them.
 
         Returns
         -------
         np.ndarray
+        dict(Hashable, int)
+            Optional. Returned if include_ids=True
         """
-        return self.fit(*args).transform(*args)
+        out = np.hstack((self._normalize(values), bools))
+
+        if include_ids:
+            return out, ids
+
+        return out
 
     def _fit_params(self, values):
         """
@@ -117,27 +216,33 @@ class Vectorizer(ABC):
 
     def _normalize(self, values):
         """
-        Normalizes the data
+        Normalizes the data, in place
 
         Parameters
         ----------
-        values : np.ndarry
+        values : np.ndarry (2D, float)
 
         Returns
         -------
         np.ndarry
+            The normalized values
         """
         if self._norm is None:
             return values
         elif self._norm == 'minmax':
-            return (values - self._stats['min']) / self._stats['range']
+            values -= self._stats['min']
+            values /= self._stats['range']
         elif self._norm == 'mean':
-            return (values - self._stats['mean']) / self._stats['range']
+            values -= self._stats['mean']
+            values /= self._stats['range']
         elif self._norm == 'standard':
-            return (values - self._stats['mean']) / self._stats['std']
+            values -= self._stats['mean']
+            values /= self._stats['std']
         else:
             raise ValueError
 
+        return values
+
 
 class PostVectorizer(Vectorizer):
 
@@ -145,7 +250,7 @@ class PostVectorizer(Vectorizer):
     Vectorization engine for social media post featurization
     """
 
-    def __init__(self, normalization=None):
+    def __init__(self, normalization=None, cache_size=None, n_workers=1):
         """
         Constructor for PostVectorizer
 
@@ -153,14 +258,13 @@ class PostVectorizer(Vectorizer):
         ----------
         normalization : None or str
             Can be None, 'minmax', 'mean', or 'standard'
+        cache_size : None or int
+            If set, caps the number of values held by the shared feature cache (0 disables caching)
+        n_workers : int
+            The number of worker processes computing the features of conversations (or posts),
+            assigned by size; vectors are identical to those computed serially. Default: 1 (serially, in this process)
         """
-        super(PostVectorizer, self).__init__(normalization)
-
-        self._bool_fns = [PostFeatures.bools]
-        self._ic_bool_fns = [PostInConvoFeatures.bools]
-
-        self._num_fns = [PostFeatures.floats, PostFeatures.ints]
-        self._ic_num_fns = [PostInConvoFeatures.floats, PostInConvoFeatures.ints]
+        super(PostVectorizer, self).__init__(normalization, cache_size=cache_size, n_workers=n_workers)
 
     def fit(self, xs):
         """
@@ -174,93 +278,7 @@ class PostVectorizer(Vectorizer):
         -------
         PostVectorizer
         """
-        self._num2col = {}
-        self._bool2col = {}
-
-        if type(xs) == list:
-            if isinstance(xs[0], Conversation):
-                return self._fit_by_convs(xs)
-            elif isinstance(xs[0], UniMessage):
-                return self._fit_by_posts(xs)
-
-        elif isinstance(xs, Conversation):
-            return self._fit_by_convs([xs])
-
-        raise ValueError
-
-    def _fit_by_posts(self, posts):
-        """
-        Fits the parameters for standardization based on an arbitrary collection of posts
-        without their conversations for context
-
-        Parameters
-        ----------
-        posts : List(UniMessage)
-
-        Returns
-        -------
-        PostVectorizer
-        """
-        values = None
-        for ix, post in tqdm(enumerate(posts), desc='PostVec: Fitting by posts'):
-            if not ix:
-                for f in self._bool_fns:
-                    for k in f(post):
-                        self._bool2col[k] = len(self._bool2col)
-
-                for f in self._num_fns:
-                    for k in f(post):
-                        self._num2col[k] = len(self._num2col)
-
-                values = np.zeros((len(posts), len(self._num2col)))
-
-            for f in self._num_fns:
-                for k, v in f(post).items():
-                    values[ix, self._num2col[k]] = v
-
-        self._fit_params(values)
-
-        return self
-
-    def _fit_by_convs(self, convs):
-        """
-        Fits parameters for normalization using conversation information
-        for post feature extraction.
-
-        Parameters
-        ----------
-        convs : List(Conversation)
-
-        Returns
-        -------
-        PostVectorizer
-        """
-        ix = 0
-        total_posts = sum(map(lambda c: len(c.posts), convs))
-        values = None
-
-        for conv in tqdm(convs, desc='PostVec: Fitting by conversations'):
-            for post in conv.posts.values():
-                if not ix:
-                    for f in self._ic_bool_fns:
-                        for k in f(post, conv):
-                            self._bool2col[k] = len(self._bool2col)
-
-                    for f in self._ic_num_fns:
-                        for k in f(post, conv):
-                            self._num2col[k] = len(self._num2col)
-
-                    values = np.zeros((total_posts, len(self._num2col)))
-
-                for f in self._ic_num_fns:
-                    for k, v in f(post, conv).items():
-                        values[ix, self._num2col[k]] = v
-
-                ix += 1
-
-        self._fit_params(values)
-
-        return self
+        return super(PostVectorizer, self).fit(xs)
 
     def transform(self, xs, include_ids=False):
         """
@@ -280,93 +298,97 @@ class PostVectorizer(Vectorizer):
         dict(Hashable, int)
             Optional. Returned if include_ids=True and creates a map from UID to row in returned array
         """
+        return super(PostVectorizer, self).transform(xs, include_ids=include_ids)
+
+    def _features(self, xs, fit=False):
         if type(xs) == list:
             if isinstance(xs[0], Conversation):
-                return self._transform_by_convs(xs, include_ids)
+                return self._features_by_convs(xs, fit)
             elif isinstance(xs[0], UniMessage):
-                return self._transform_by_posts(xs, include_ids)
+                return self._features_by_posts(xs, fit)
         elif isinstance(xs, Conversation):
-            return self._transform_by_convs([xs], include_ids)
+            return self._features_by_convs([xs], fit)
 
         raise ValueError
 
-    def _transform_by_posts(self, posts, include_ids):
+    def _features_by_posts(self, posts, fit):
         """
-        Transforms a collection of posts into vectors
-        based on fit parameters
+        Computes the features of an arbitrary collection of posts
+        without their conversations for context
 
         Parameters
         ----------
         posts : List(UniMessage)
-        include_ids : bool
+        fit : bool
 
         Returns
         -------
         np.array
+        np.array
+        dict(Hashable, int)
         """
+        if fit:
+            schema = PostFeatures.schema()
+            self._set_columns(schema['floats'] + schema['ints'], schema['bools'])
+
         ids = {}
-        out = np.zeros((len(posts), len(self._num2col)))
-        out_bools = np.zeros((len(posts), len(self._bool2col)))
+        values = np.zeros((len(posts), len(self._num2col)))
+        bools = np.zeros((len(posts), len(self._bool2col)))
 
-        for ix, post in tqdm(enumerate(posts), desc='PostVec: Transforming by posts'):
-            for f in self._num_fns:
-                for k, v in f(post).items():
-                    out[ix, self._num2col[k]] = v
+        rows = map_chunks(_post_features, posts, sizes=[1 + len(post.text or '') for post in posts],
+                          n_workers=self._n_workers, desc='PostVec: Featurizing posts')
+        for ix, (post, (nums, flags)) in enumerate(zip(posts, rows)):
+            for k, v in nums.items():
+                values[ix, self._num2col[k]] = v
 
-            for f in self._bool_fns:
-                for k, v in f(post).items():
-                    out_bools[ix, self._bool2col[k]] = 1 if v else 0
+            for k, v in flags.items():
+                bools[ix, self._bool2col[k]] = 1 if v else 0
 
             ids[post.uid] = ix
 
-        out = self._normalize(out)
-        out = np.hstack((out, out_bools))
-
-        if include_ids:
-            return out, ids
+        return values, bools, ids
 
-        return out
-
-    def _transform_by_convs(self, convs, include_ids):
+    def _features_by_convs(self, convs, fit):
         """
-        Transforms a collection of conversations into vectors for each post
-        based on fit parameters
+        Computes the features of the posts of a collection of conversations,
+        using conversation information
 
         Parameters
         ----------
         convs : List(Conversation)
-        include_ids : bool
+        fit : bool
 
         Returns
         -------
         np.array
+        np.array
+        dict(Hashable, int)
         """
+        schema = PostInConvoFeatures.schema()
+        if fit:
+            self._set_columns(schema['floats'] + schema['ints'], schema['bools'])
+
+        num_cols = [self._num2col[k] for k in schema['floats'] + schema['ints']]
+        bool_cols = [self._bool2col[k] for k in schema['bools']]
+
         ix = 0
         ids = {}
         total_posts = sum(map(lambda c: len(c.posts), convs))
-        out = np.zeros((total_posts, len(self._num2col)))
-        out_bools = np.zeros((total_posts, len(self._bool2col)))
-
-        for conv in tqdm(convs, desc='PostVec: Transforming by conversations'):
-            for post in conv.posts.values():
-                for f in self._ic_num_fns:
-                    for k, v in f(post, conv).items():
-                        out[ix, self._num2col[k]] = v
-
-                for f in self._ic_bool_fns:
-                    for k, v in f(post, conv).items():
-                        out[ix, self._bool2col[k]] = 1 if v else 0
-
-                ids[(conv.convo_id, post.uid)] = ix
+        values = np.zeros((total_posts, len(self._num2col)))
+        bools = np.zeros((total_posts, len(self._bool2col)))
+
+        # the features of the posts (see `PostInConvoFeatures`), shared with the aggregates when computed serially
+        blocks = map_chunks(post_feature_blocks, convs, sizes=[len(conv.posts) for conv in convs],
+                            n_workers=self._n_workers, desc='PostVec: Featurizing by conversations')
+        for conv, (nums, flags) in zip(convs, blocks):
+            values[ix:ix + len(nums), num_cols] = nums
+            bools[ix:ix + len(flags), bool_cols] = flags
+
+            for uid in conv.posts:
+                ids[(conv.convo_id, uid)] = ix
                 ix += 1
 
-        out = self._normalize(out)
-        out = np.hstack((out, out_bools))
-
-        if include_ids:
-            return out, ids
-
-        return out
+        return values, bools, ids
 
 
 class ConversationVectorizer(Vectorizer):
@@ -375,7 +397,7 @@ class ConversationVectorizer(Vectorizer):
     Vectorization engine for social media conversation featurization
     """
 
-    def __init__(self, normalization=None):
+    def __init__(self, normalization=None, cache_size=None, n_workers=1):
         """
         Constructor for ConversationVectorizer
 
@@ -383,10 +405,13 @@ class ConversationVectorizer(Vectorizer):
         ----------
         normalization : None or str
             Can be None, 'minmax', 'mean', or 'standard'
+        cache_size : None or int
+            If set, caps the number of values held by the shared feature cache (0 disables caching)
+        n_workers : int
+            The number of worker processes computing the features of conversations (or posts),
+            assigned by size; vectors are identical to those computed serially. Default: 1 (serially, in this process)
         """
-        super(ConversationVectorizer, self).__init__(normalization)
-        self._num_fns = [ConvoFeatures.floats, ConvoFeatures.ints]
-        self._bool_fns = []
+        super(ConversationVectorizer, self).__init__(normalization, cache_size=cache_size, n_workers=n_workers)
 
     def fit(self, xs):
         """
@@ -400,34 +425,7 @@ class ConversationVectorizer(Vectorizer):
         -------
         ConversationVectorizer
         """
-        if isinstance(xs, Conversation):
-            return self.fit([xs])
-        elif type(xs) == list and isinstance(xs[0], Conversation):
-            values = None
-            self._num2col = {}
-            self._bool2col = {}
-
-            for ix, conv in tqdm(enumerate(xs), desc='ConvVec: Fitting by conversations', total=len(xs)):
-                if not ix:
-                    for f in self._bool_fns:
-                        for k in f(conv):
-                            self._bool2col[k] = len(self._bool2col)
-
-                    for f in self._num_fns:
-                        for k in f(conv):
-                            self._num2col[k] = len(self._num2col)
-
-                    values = np.zeros((len(xs), len(self._num2col)))
-
-                for f in self._num_fns:
-                    for k, v in f(conv).items():
-                        values[ix, self._num2col[k]] = v
-
-            self._fit_params(values)
-
-            return self
-
-        raise ValueError()
+        return super(ConversationVectorizer, self).fit(xs)
 
     def transform(self, xs, include_ids=False):
         """
@@ -444,28 +442,31 @@ class ConversationVectorizer(Vectorizer):
         dict(Hashable, int)
             Optional. Returned if include_ids=True and creates a map from UID to row in returned array
         """
+        return super(ConversationVectorizer, self).transform(xs, include_ids=include_ids)
+
+    def _features(self, xs, fit=False):
         if isinstance(xs, Conversation):
-            return self.transform([xs], include_ids=include_ids)
-        elif type(xs) == list and isinstance(xs[0], Conversation):
-            ids = {}
-            out = np.zeros((len(xs), len(self._num2col)))
+            return self._features([xs], fit=fit)
+        elif type(xs) != list or not isinstance(xs[0], Conversation):
+            raise ValueError
 
-            for ix, conv in tqdm(enumerate(xs), desc='ConvVec: Transforming by conversations', total=len(xs)):
-                for f in self._num_fns:
-                    for k, v in f(conv).items():
-                        out[ix, self._num2col[k]] = v
+        if fit:
+            schema = ConvoFeatures.schema()
+            self._set_columns(schema['floats'] + schema['ints'], schema['bools'])
 
-                if include_ids:
-                    ids[conv.convo_id] = ix
+        ids = {}
+        values = np.zeros((len(xs), len(self._num2col)))
+        bools = np.zeros((len(xs), len(self._bool2col)))
 
-            out = self._normalize(out)
+        rows = map_chunks(_convo_features, xs, sizes=[len(conv.posts) for conv in xs],
+                          n_workers=self._n_workers, desc='ConvVec: Featurizing conversations')
+        for ix, (conv, row) in enumerate(zip(xs, rows)):
+            for k, v in row.items():
+                values[ix, self._num2col[k]] = v
 
-            if include_ids:
-                return out, ids
+            ids[conv.convo_id] = ix
 
-            return out
-        else:
-            raise ValueError
+        return values, bools, ids
 
 
 class UserVectorizer(Vectorizer):
@@ -474,7 +475,7 @@ class UserVectorizer(Vectorizer):
     Vectorizer for creating user parameter vectors
     """
 
-    def __init__(self, normalization=None):
+    def __init__(self, normalization=None, cache_size=None, n_workers=1):
         """
         Constructor for UserVectorizer
 
@@ -482,30 +483,23 @@ class UserVectorizer(Vectorizer):
         ----------
         normalization : None or str
             Can be None, 'minmax', 'mean', or 'standard'
+        cache_size : None or int
+            If set, caps the number of values held by the shared feature cache (0 disables caching)
+        n_workers : int
+            The number of worker processes computing the features of conversations (or posts),
+            assigned by size; vectors are identical to those computed serially. Default: 1 (serially, in this process)
         """
-        super(UserVectorizer, self).__init__(normalization)
+        super(UserVectorizer, self).__init__(normalization, cache_size=cache_size, n_workers=n_workers)
 
         self._bool_fns = [UserInConvoFeatures.bools]
-        self._ac_bool_fns = [UserAcrossConvoFeatures.bools]
 
         self._num_fns = [UserInConvoFeatures.ints, UserInConvoFeatures.floats]
-        self._ac_num_fns = [UserAcrossConvoFeatures.ints, UserAcrossConvoFeatures.floats]
 
         self._across = False
 
-    def _get_user_cnt(self, xs):
-        # compute total users
-        seen_user = set()
-        for conv in xs:
-            for pid in conv.posts:
-                author = conv.posts[pid].author
-                if author in seen_user:
-                    continue
-
-                seen_user.add(author)
-        total_users = len(seen_user)
-
-        return total_users, seen_user
+    def _across_rows(self, index):
+        # the integer and float features of every user of the corpus, computed together (see `across_convo_features`)
+        return [{**ints, **floats} for ints, floats in across_convo_features(index, n_workers=self._n_workers)]
 
     def fit(self, xs):
         """
@@ -519,128 +513,120 @@ class UserVectorizer(Vectorizer):
         -------
         UserVectorizer
         """
-        self._num2col = {}
-        self._bool2col = {}
-
-        if type(xs) == list:
-            if isinstance(xs[0], Conversation):
-                values = None
-                total_users, users = self._get_user_cnt(xs)
-                for ix, user in tqdm(enumerate(users), desc='UserVec: Fitting by user', total=total_users):
-                    if not ix:
-                        self._across = True
-
-                        for f in self._ac_bool_fns:
-                            for k in f(user, xs):
-                                self._bool2col[k] = len(self._bool2col)
+        return super(UserVectorizer, self).fit(xs)
 
-                        for f in self._ac_num_fns:
-                            for k in f(user, xs):
-                                self._num2col[k] = len(self._num2col)
-
-                        values = np.zeros((total_users, len(self._num2col)))
+    def transform(self, xs, include_ids=False):
+        """
+        Returns a set of user vectors for each unique user found
 
-                    for f in self._ac_num_fns:
-                        for k, v in f(user, xs).items():
-                            values[ix, self._num2col[k]] = v
+        Parameters
+        ----------
+        xs : Conversation,  List(Conversation), or List(UniMessage)
+        include_ids : bool
 
-                self._fit_params(values)
+        Returns
+        -------
+        np.arrary
+        dict(Hashable, int)
+            Optional. Returned if include_ids=True and creates a map from UID to row in returned array
+        """
+        return super(UserVectorizer, self).transform(xs, include_ids=include_ids)
 
-                return self
+    def _features(self, xs, fit=False):
+        if type(xs) == list:
+            if isinstance(xs[0], Conversation):
+                return self._features_across(xs, fit)
             elif isinstance(xs[0], UniMessage):
                 x_ = Conversation(posts={post.uid: post for post in xs})
-                return self.fit(x_)
+                return self._features(x_, fit=fit)
         elif isinstance(xs, Conversation):
-            values = None
-            total_users = len(messages_per_user(xs))
-            users = xs.authors
-            for ix, user in tqdm(enumerate(users), desc='UserVec: Fitting by users', total=total_users):
-                if not ix:
-                    self._across = False
-                    for f in self._bool_fns:
-                        for k in f(user, xs):
-                            self._bool2col[k] = len(self._bool2col)
-
-                    for f in self._num_fns:
-                        for k in f(user, xs):
-                            self._num2col[k] = len(self._num2col)
-
-                    values = np.zeros((total_users, len(self._num2col)))
+            if self._across and not fit:
+                return self._features_across([xs], fit)
 
-            self._fit_params(values)
-
-            return self
+            return self._features_in_convo(xs, fit)
 
         raise ValueError()
 
-    def transform(self, xs, include_ids=False):
+    def _features_across(self, convs, fit):
         """
-        Returns a set of user vectors for each unique user found
+        Computes the features of the users of a collection of conversations, across these conversations
 
         Parameters
         ----------
-        xs : Conversation,  List(Conversation), or List(UniMessage)
-        include_ids : bool
+        convs : List(Conversation)
+        fit : bool
 
         Returns
         -------
-        np.arrary
+        np.array
+        np.array
         dict(Hashable, int)
-            Optional. Returned if include_ids=True and creates a map from UID to row in returned array
         """
+        if fit:
+            self._across = True
+            schema = UserAcrossConvoFeatures.schema()
+            self._set_columns(schema['ints'] + schema['floats'], schema['bools'])
+
+        index = CorpusIndex(convs)
+        rows = self._across_rows(index)
+
         ids = {}
-        if type(xs) == list:
-            if isinstance(xs[0], Conversation):
-                total_users, users = self._get_user_cnt(xs)
+        values = np.zeros((len(rows), len(self._num2col)))
+        bools = np.zeros((len(rows), len(self._bool2col)))
 
-                out = np.zeros((total_users, len(self._num2col)))
-                # out_bools = np.zeros((total_users, len(self._bool2col)))
+        for ix, (user, row) in enumerate(zip(index.users, rows)):
+            for k, v in row.items():
+                values[ix, self._num2col[k]] = v
 
-                for ix, user in tqdm(enumerate(users), desc='UserVec: Transforming by users', total=total_users):
-                    for f in self._ac_num_fns:
-                        for k, v in f(user, xs).items():
-                            out[ix, self._num2col[k]] = v
+            ids[user] = ix
 
-                    if include_ids:
-                        ids[user] = ix
+        return values, bools, ids
 
-                out = self._normalize(out)
-                # out = np.hstack((out, out_bools))
+    def _features_in_convo(self, conv, fit):
+        """
+        Computes the features of the users of a conversation, within it
 
-                if include_ids:
-                    return out, ids
+        Parameters
+        ----------
+        conv : Conversation
+        fit : bool
 
-                return out
-            elif isinstance(xs[0], UniMessage):
-                x_ = Conversation(posts={post.uid: post for post in xs})
-                return self.transform(x_, include_ids=include_ids)
-        elif isinstance(xs, Conversation):
-            if self._across:
-                return self.transform([xs], include_ids=include_ids)
+        Returns
+        -------
+        np.array
+        np.array
+        dict(Hashable, int)
+        """
+        if fit:
+            self._across = False
+            schema = UserInConvoFeatures.schema()
+            self._set_columns(schema['ints'] + schema['floats'], schema['bools'])
 
-            total_users = len(messages_per_user(xs))
-            users = xs.authors
-            out = np.zeros((total_users, len(self._num2col)))
-            out_bools = np.zeros((total_users, len(self._bool2col)))
+        ids = {}
+        total_users = len(messages_per_user(conv))
+        values = np.zeros((total_users, len(self._num2col)))
+        bools = np.zeros((total_users, len(self._bool2col)))
+
+        for ix, user in tqdm(enumerate(conv.posts_by_author), desc='UserVec: Featurizing users', total=total_users):
+            for f in self._num_fns:
+                for k, v in f(user, conv).items():
+                    values[ix, self._num2col[k]] = v
 
-            for ix, user in tqdm(enumerate(users), desc='UserVec: Transforming users by user', total=total_users):
-                for f in self._num_fns:
-                    for k, v in f(user, xs).items():
-                        out[ix, self._num2col[k]] = v
+            for f in self._bool_fns:
+                for k, v in f(user, conv).items():
+                    bools[ix, self._bool2col[k]] = 1 if v else 0
 
-                for f in self._bool_fns:
-                    for k, v in f(user, xs).items():
-                        out_bools[ix, self._bool2col[k]] = 1 if v else 0
+            ids[user] = ix
 
-                if include_ids:
-                    ids[user] = ix
+        return values, bools, ids
 
-            out = self._normalize(out)
-            out = np.hstack((out, out_bools))
 
-            if include_ids:
-                return out, ids
+def _post_features(posts):
+    # the numeric and boolean features of each post in isolation (see `parallel.map_chunks`)
+    return [({**PostFeatures.floats(post), **PostFeatures.ints(post)}, PostFeatures.bools(post))
+            for chunk in prefetch_chunks(posts) for post in chunk]
 
-            return out
 
-        raise ValueError
+def _convo_features(convs):
+    # the numeric features of each conversation (see `parallel.map_chunks`)
+    return [{**ConvoFeatures.floats(conv), **ConvoFeatures.ints(conv)} for conv in convs]
@@ -1,8 +1,16 @@
 from collections import Counter
+from collections import OrderedDict
 from collections import defaultdict
 
 import numpy as np
-from scipy.optimize import minimize
+
+from .params import CACHE_SIZE
+
+# the parameters of the harmonic mixing law, in the order they are reported
+MIXING_PARAMS = ['k1', 'theta', 'entropy', 'N_avg', 'M_avg']
+
+# the range of the k1 parameter, within which fits are kept (see `rebound`)
+K1_BOUNDS = (0.001, 1)
 
 
 def rebound(x, bounds):
@@ -50,29 +58,317 @@ def NLL_simple(x, fs, rs, bounds):
     return -(fs * np.log10(fhat / M)).sum()
 
 
-def params_simple(fs, rs, x0):
-    bounds = [(0.001, 1)]
-    result = minimize(NLL_simple, x0=x0, method='Nelder-Mead', tol=1e-1,
-                      options={'maxiter': 999}, args=(fs, rs, bounds))
-    return rebound(result.x, bounds)[0]
-
+def nelder_mead(func, x0, tol=1e-1, maxiter=999):
+    """
+    Minimizes a function of a single parameter with the Nelder-Mead simplex method:
+    the initial simplex, steps and stopping rule (on both the parameter and the function values, within `tol`)
+    of `scipy.optimize.minimize(method='Nelder-Mead')`, held here so that the batch steps (see `_fit_group`)
+    reproduce it exactly, whatever the version of scipy.
+
+    Parameters
+    ----------
+    func : callable
+        The function to minimize, of a parameter array of shape (1,)
+    x0 : float
+        The initial guess (non-zero)
+    tol : float
+        The tolerance of the stopping rule (Default: 0.1)
+    maxiter : int
+        The maximum number of iterations (Default: 999)
+
+    Returns
+    -------
+    float
+        The best vertex of the final simplex
+    """
+    def f(x):
+        return func(np.array([x]))
+
+    sim = [x0, (1 + 0.05) * x0]
+    fsim = [f(x) for x in sim]
+    if _swapped(fsim[0], fsim[1]):
+        sim, fsim = sim[::-1], fsim[::-1]
+
+    iterations = 1
+    while iterations < maxiter:
+        (s0, s1), (f0, f1) = sim, fsim
+        if abs(s1 - s0) <= tol and abs(f0 - f1) <= tol:
+            break
+
+        # reflection (with a single parameter, the centroid is the best vertex), then expansion or contraction
+        xr = 2 * s0 - s1
+        fxr = f(xr)
+        if fxr < f0:
+            xe = 3 * s0 - 2 * s1
+            fxe = f(xe)
+            x, fx = (xe, fxe) if fxe < fxr else (xr, fxr)
+        else:
+            outside = fxr < f1
+            x = 1.5 * s0 - 0.5 * s1 if outside else 0.5 * s0 + 0.5 * s1
+            fx = f(x)
+            if not (fx <= fxr if outside else fx < f1):
+                # shrink
+                x = s0 + 0.5 * (s1 - s0)
+                fx = f(x)
+
+        sim, fsim = [s0, x], [f0, fx]
+        if _swapped(f0, fx):
+            sim, fsim = sim[::-1], fsim[::-1]
+
+        iterations += 1
+
+    return sim[0]
+
+
+def _swapped(f0, f1):
+    # whether the second vertex is the best one (NaN values last, as `np.argsort`, which leaves ties in place)
+    return f1 < f0 or (np.isnan(f0) and not np.isnan(f1))
 
-def mixing(frequency):
-    ws, fs = map(np.array, zip(*frequency.most_common()))
-    rs = np.arange(1, len(ws) + 1)
-    # ranks = {w: ix + 1 for ix, w in enumerate(ws)}
 
-    sizeranks = defaultdict(list)
-    for f, r in zip(fs, rs):
-        sizeranks[f] = max([r, 0 if (f not in sizeranks) else sizeranks[f]])
+def params_simple(fs, rs, x0):
+    bounds = [K1_BOUNDS]
+    k1 = nelder_mead(lambda x: NLL_simple(x, fs, rs, bounds), x0, tol=1e-1, maxiter=999)
+    return rebound([k1], bounds)[0]
+
+
+def frequency_profile(frequency):
+    """
+    Returns the canonical profile of a frequency distribution:
+    the number of types having each frequency, from the highest frequency to the lowest.
+    The mixing law only depends on this profile (not on the types themselves),
+    which repeats across many posts (e.g., all short posts whose tokens are all distinct).
+
+    Parameters
+    ----------
+    frequency : collections.Counter
+        The type frequency distribution
+
+    Returns
+    -------
+    tuple(tuple(int, int))
+        The (frequency, number of types) pairs of the distribution
+    """
+    return tuple(sorted(Counter(frequency.values()).items(), reverse=True))
+
+
+def profile_arrays(profile):
+    """
+    Expands a frequency profile into the ranked frequencies of its types
+    and the size rank (the last rank sharing the same frequency) of each.
+
+    Parameters
+    ----------
+    profile : tuple(tuple(int, int))
+        See `frequency_profile`
+
+    Returns
+    -------
+    np.ndarray
+        The frequencies, by rank
+    np.ndarray
+        The size ranks, by rank
+    """
+    freqs, counts = zip(*profile)
+    fs = np.repeat(np.array(freqs, dtype=np.int64), counts)
+    srs = np.repeat(np.cumsum(counts, dtype=np.int64), counts)
+    return fs, srs
+
+
+def NLL_batch(xs, fs, rs):
+    """
+    Evaluates `NLL_simple` for several profiles with the same number of types at once
+    (with the same floating point operations, so that the values are identical).
+
+    Parameters
+    ----------
+    xs : np.ndarray
+        The k1 parameter for each profile (B)
+    fs : np.ndarray
+        The frequencies (B, N)
+    rs : np.ndarray
+        The size ranks (B, N)
+
+    Returns
+    -------
+    np.ndarray
+        The negative log-likelihood for each profile (B)
+    """
+    low, high = K1_BOUNDS
+    xs = np.where(xs > high, 0.99 * (high - low) + low, np.where(xs < low, 0.01 * (high - low) + low, xs))
+
+    N = fs.shape[1]
+    HN = (1 / np.arange(1, N + 1)).sum()
+    ravg = N / HN
 
+    sum_fs = fs.sum(axis=1)
+    Mavg = sum_fs * xs
+    out = np.zeros(len(xs))
+
+    # profiles with Mavg <= 1 have a null fit (and likelihood)
+    keep = np.flatnonzero(Mavg > 1)
+    if not len(keep):
+        return out
+
+    fs, rs, sum_fs, Mavg = fs[keep], rs[keep], sum_fs[keep], Mavg[keep]
+    with np.errstate(all='ignore'):
+        theta = (np.log10(fs[:, 0] * Mavg / sum_fs) / np.log10(Mavg))[:, None]
+        Navg = (1 - theta) * Mavg[:, None]
+        fhat = ((rs - theta) ** (-theta)) * (1 - (1 + ravg / rs) ** (-Navg / ravg))
+
+        # summed from left to right, as the builtin `sum`
+        M = np.add.accumulate(fhat, axis=1)[:, -1]
+        nll = -(fs * np.log10(fhat / M[:, None])).sum(axis=1)
+
+    out[keep] = np.where(M == 0, 0, nll)
+    return out
+
+
+def _sort_simplices(sim, fsim):
+    # the best vertex first, NaN values last (as `np.argsort`, which leaves ties in place)
+    swap = (fsim[:, 1] < fsim[:, 0]) | (np.isnan(fsim[:, 0]) & ~np.isnan(fsim[:, 1]))
+    sim[swap] = sim[swap][:, ::-1]
+    fsim[swap] = fsim[swap][:, ::-1]
+
+
+def _fit_group(fs, rs, tol=1e-1, maxiter=999):
+    """
+    Fits k1 for profiles with the same number of types,
+    running the steps of `nelder_mead` (see `params_simple`) on all of them at once.
+
+    Returns
+    -------
+    np.ndarray
+        The fitted (rebounded) k1 of each profile
+    """
+    x0 = fs.shape[1] / fs.sum(axis=1)
+    sim = np.stack([x0, (1 + 0.05) * x0], axis=1)
+    fsim = np.stack([NLL_batch(sim[:, 0], fs, rs), NLL_batch(sim[:, 1], fs, rs)], axis=1)
+    _sort_simplices(sim, fsim)
+
+    active = np.arange(len(x0))
+    iterations = 1
+    while len(active) and iterations < maxiter:
+        s0, s1 = sim[active, 0], sim[active, 1]
+        f0, f1 = fsim[active, 0], fsim[active, 1]
+
+        done = (np.abs(s1 - s0) <= tol) & (np.abs(f0 - f1) <= tol)
+        if done.any():
+            active, s0, s1, f0, f1 = active[~done], s0[~done], s1[~done], f0[~done], f1[~done]
+            if not len(active):
+                break
+
+        afs, ars = fs[active], rs[active]
+        new_s, new_f = s1.copy(), f1.copy()
+
+        # reflection (with a single parameter, the centroid is the best vertex)
+        xr = 2 * s0 - s1
+        fxr = NLL_batch(xr, afs, ars)
+
+        # expansion
+        ex = np.flatnonzero(fxr < f0)
+        if len(ex):
+            xe = 3 * s0[ex] - 2 * s1[ex]
+            fxe = NLL_batch(xe, afs[ex], ars[ex])
+            better = fxe < fxr[ex]
+            new_s[ex] = np.where(better, xe, xr[ex])
+            new_f[ex] = np.where(better, fxe, fxr[ex])
+
+        # contraction, outside or inside of the simplex (the reflection is never better than the second-best vertex,
+        # which is the best one)
+        shrink = np.zeros(len(active), dtype=bool)
+        ct = np.flatnonzero(~(fxr < f0))
+        if len(ct):
+            outside = fxr[ct] < f1[ct]
+            xc = np.where(outside, 1.5 * s0[ct] - 0.5 * s1[ct], 0.5 * s0[ct] + 0.5 * s1[ct])
+            fxc = NLL_batch(xc, afs[ct], ars[ct])
+            accept = np.where(outside, fxc <= fxr[ct], fxc < f1[ct])
+            new_s[ct[accept]] = xc[accept]
+            new_f[ct[accept]] = fxc[accept]
+            shrink[ct[~accept]] = True
+
+        sh = np.flatnonzero(shrink)
+        if len(sh):
+            new_s[sh] = s0[sh] + 0.5 * (s1[sh] - s0[sh])
+            new_f[sh] = NLL_batch(new_s[sh], afs[sh], ars[sh])
+
+        sim[active, 1] = new_s
+        fsim[active, 1] = new_f
+        part_sim, part_fsim = sim[active], fsim[active]
+        _sort_simplices(part_sim, part_fsim)
+        sim[active], fsim[active] = part_sim, part_fsim
+
+        iterations += 1
+
+    return np.array([rebound([x], [K1_BOUNDS])[0] for x in sim[:, 0]])
+
+
+def _fit_flat(n, tol=1e-1):
+    """
+    Fits k1 for a profile of `n` types that all occur once.
+    All types share the same size rank, so the likelihood is flat in k1 and the fit stops at its initial simplex:
+    only the two initial vertices need evaluating.
+    """
+    fs = np.ones(n, dtype=np.int64)
+    rs = np.full(n, n, dtype=np.int64)
+    x0 = n / n
+    sim = [x0, (1 + 0.05) * x0]
+    fsim = [NLL_simple(np.array([x]), fs, rs, [K1_BOUNDS]) for x in sim]
+
+    if not (abs(sim[1] - sim[0]) <= tol and abs(fsim[0] - fsim[1]) <= tol):
+        return params_simple(fs, rs, x0)
+
+    best = 1 if (fsim[1] < fsim[0]) or (np.isnan(fsim[0]) and not np.isnan(fsim[1])) else 0
+    return rebound([sim[best]], [K1_BOUNDS])[0]
+
+
+def fit_k1(profiles):
+    """
+    Fits the k1 parameter of the mixing law for several frequency profiles at once
+    (with the same results as `params_simple`).
+    Profiles with the same number of types are fitted together,
+    and profiles whose types all occur once need no search (see `_fit_flat`).
+
+    Parameters
+    ----------
+    profiles : list(tuple(tuple(int, int)))
+        See `frequency_profile`
+
+    Returns
+    -------
+    list(float)
+        The fitted k1 of each profile
+    """
+    out = [None] * len(profiles)
+    groups = defaultdict(list)
+    for ix, profile in enumerate(profiles):
+        if len(profile) == 1 and profile[0][0] == 1:
+            out[ix] = float(_fit_flat(profile[0][1]))
+        else:
+            groups[sum(n for _, n in profile)].append(ix)
+
+    for ixs in groups.values():
+        if len(ixs) == 1:
+            # a lone profile is fitted faster by the scalar steps than by the batch steps
+            fs, rs = profile_arrays(profiles[ixs[0]])
+            out[ixs[0]] = float(params_simple(fs, rs, len(fs) / fs.sum()))
+            continue
+
+        fs, rs = map(np.stack, zip(*[profile_arrays(profiles[ix]) for ix in ixs]))
+        for ix, k1 in zip(ixs, _fit_group(fs, rs)):
+            out[ix] = float(k1)
+
+    return out
+
+
+def _mixing_params(fs, srs, k1):
+    """
+    Returns the parameters of the mixing law for the ranked frequencies `fs` (and size ranks `srs`) and a fitted k1.
+    """
     # regresses the avg doc size and THEN computes theta.
     N = len(fs)
     M = sum(fs)
     HN = (1 / np.arange(1, N + 1)).sum()
     ravg = N / HN
-    srs = np.array([sizeranks[f] for f in fs])
-    k1 = params_simple(fs, srs, N / M)
     Mavg = M * float(k1)
 
     if not ravg:
@@ -110,7 +406,7 @@ def mixing(frequency):
 
     fmodel = _f
 
-    fhat = fmodel(np.array([sizeranks[f] for f in fs]))
+    fhat = fmodel(srs)
     fnorm = sum(fhat)
     phat = fhat / fnorm
     entropy = -(fs / M).dot(np.log10(phat)) / np.log10(N)
@@ -125,28 +421,228 @@ def mixing(frequency):
     }
 
 
-def novelty(frequency):
-    ws, fs = map(np.array, zip(*frequency.most_common()))
-    rs = np.arange(1, len(ws) + 1)
+class MixingCache:
+
+    """
+    A bounded, least-recently-used cache of mixing law parameters, keyed by frequency profile
+    (see `frequency_profile`), so that each distinct profile is only fitted once.
+    """
+
+    def __init__(self, maxsize=CACHE_SIZE):
+        """
+        Parameters
+        ----------
+        maxsize : int
+            The maximum number of cached profiles (Default: CACHE_SIZE)
+        """
+        self._maxsize = maxsize
+        self._cache = OrderedDict()  # profile -> parameters
+
+        self._hits = 0
+        self._misses = 0
+
+    def _store(self, key, res):
+        if not self._maxsize:
+            return
+
+        self._cache[key] = res
+        if len(self._cache) > self._maxsize:
+            self._cache.popitem(last=False)
+
+    def get(self, frequency):
+        """
+        Returns the parameters of the mixing law for a frequency distribution.
+
+        Parameters
+        ----------
+        frequency : collections.Counter
+            The (non-empty) type frequency distribution
+
+        Returns
+        -------
+        dict(str, float)
+        """
+        return self.get_batch([frequency])[0]
+
+    def get_batch(self, frequencies):
+        """
+        Returns the parameters of the mixing law for several frequency distributions.
+        Only the distinct profiles missing from the cache are fitted, together (see `fit_k1`).
+
+        Parameters
+        ----------
+        frequencies : list(collections.Counter)
+            The (non-empty) type frequency distributions
+
+        Returns
+        -------
+        list(dict(str, float))
+            The parameters for each distribution, in order
+        """
+        keys = [frequency_profile(frequency) for frequency in frequencies]
+        if not all(keys):
+            raise ValueError('The mixing law is undefined for empty frequency distributions')
+
+        missing = {}  # key -> None, for the distinct profiles to fit
+        for key in keys:
+            if key in self._cache:
+                self._hits += 1
+                self._cache.move_to_end(key)
+            elif key in missing:
+                self._hits += 1
+            else:
+                self._misses += 1
+                missing[key] = None
+
+        found = {}
+        if missing:
+            profiles = list(missing)
+            for key, k1 in zip(profiles, fit_k1(profiles)):
+                found[key] = _mixing_params(*profile_arrays(key), k1)
+
+        out = [dict(found[key] if key in found else self._cache[key]) for key in keys]
+
+        for key, res in found.items():
+            self._store(key, res)
+
+        return out
+
+    def cache_info(self):
+        """
+        Returns statistics of the cache.
+
+        Returns
+        -------
+        dict(str, int)
+            The number of `hits`, `misses`, the `maxsize` and the current size (`currsize`) of the cache
+        """
+        return {
+            'hits':     self._hits,
+            'misses':   self._misses,
+            'maxsize':  self._maxsize,
+            'currsize': len(self._cache)
+        }
+
+    def cache_clear(self):
+        """
+        Empties the cache and resets its statistics.
+        """
+        self._cache.clear()
+        self._hits = 0
+        self._misses = 0
+
+
+MIXING_CACHE = MixingCache()
+
 
-    nums = Counter(fs)
+def mixing(frequency):
+    """
+    Returns the parameters of the harmonic mixing law measured on a type frequency distribution.
+    Results are cached by frequency profile (see `MixingCache`).
+
+    Parameters
+    ----------
+    frequency : collections.Counter
+        The (non-empty) type frequency distribution
+
+    Returns
+    -------
+    dict(str, float)
+        The `k1`, `theta`, `entropy`, `N_avg` and `M_avg` parameters
+    """
+    return MIXING_CACHE.get(frequency)
+
+
+def mixing_batch(frequencies):
+    """
+    Returns the parameters of the harmonic mixing law for several type frequency distributions,
+    fitting the distinct (uncached) profiles together.
+
+    Parameters
+    ----------
+    frequencies : list(collections.Counter)
+        The (non-empty) type frequency distributions
+
+    Returns
+    -------
+    list(dict(str, float))
+        The parameters for each distribution, in order
+    """
+    return MIXING_CACHE.get_batch(frequencies)
+
+
+def novelty(frequency):
+    """
+    Returns the novelty of each type (by rank) of a frequency distribution.
+
+    Parameters
+    ----------
+    frequency : collections.Counter
+        The (non-empty) type frequency distribution
+
+    Returns
+    -------
+    np.ndarray
+        The novelty of each rank
+    """
+    return novelty_batch([frequency])[0]
+
+
+def novelty_batch(frequencies):
+    """
+    Returns the novelty vectors of several frequency distributions, computed in a single pass.
+
+    The ranked frequencies of all distributions are concatenated and run-length encoded into plateaux
+    (consecutive ranks sharing a frequency), whose endpoints give the quantities of each plateau
+    and of the plateau above it.
+
+    Parameters
+    ----------
+    frequencies : list(collections.Counter)
+        The (non-empty) type frequency distributions
+
+    Returns
+    -------
+    list(np.ndarray)
+        The novelty of each rank, for each distribution
+    """
+    if not frequencies:
+        return []
+
+    ranked = [sorted(frequency.values(), reverse=True) for frequency in frequencies]
+    lengths = np.array([len(fs) for fs in ranked], dtype=np.int64)
+    if not lengths.all():
+        raise ValueError('Novelty is undefined for empty frequency distributions')
+
+    ends = np.cumsum(lengths)
+    starts = ends - lengths
+    fs = np.array([f for fs in ranked for f in fs])
+
+    # cumulative frequencies, restarted for each distribution
     fsum = fs.cumsum()
-    mn = (fsum / fs)
-
-    # this complex object specifies the rank-endpoints for plateaux
-    srs = {s: (min(rs[fs == s]), max(rs[fs == s])) for s in nums}
-    As1 = np.ones(len(fs))
-    As2 = np.ones(len(fs))
-    for f in sorted(nums, reverse=True)[1:]:
-        f_high = fs[srs[f][0] - 2]
-        f_low = fs[srs[f][1] - 1]
-        f_quotient = f_high / f_low
-        mn_pairs = [(mn_high, mn_low)
-                    for mn_high in [np.max(mn[fs == f_high])]
-                    for mn_low in [np.max(mn[fs == f_low])]]
-        As1[fs == f] = 1 + np.mean(np.log10(f_quotient) /
-                                   np.log10([mn_high / mn_low
-                                             for mn_high, mn_low in mn_pairs]))
-        As2[fs == f] = nums[f] / np.array([mn_low - mn_high
-                                           for mn_high, mn_low in mn_pairs])
-    return 2 / (1 / As1 + 1 / As2)
+    fsum[lengths[0]:] -= np.repeat(fsum[ends[:-1] - 1], lengths[1:])
+    mn = fsum / fs
+
+    # plateaux: maximal runs of equal frequencies within a distribution
+    opens = np.zeros(len(fs), dtype=bool)
+    opens[starts] = True
+    first = opens.copy()
+    first[1:] |= fs[1:] != fs[:-1]
+    run_starts = np.flatnonzero(first)
+    run_lengths = np.diff(np.append(run_starts, len(fs)))
+
+    run_f = fs[run_starts]
+    run_mn = np.maximum.reduceat(mn, run_starts)
+
+    # every plateau but the first of its distribution is compared with the plateau above it
+    below = np.flatnonzero(~opens[run_starts])
+    above = below - 1
+
+    As1 = np.ones(len(run_starts))
+    As2 = np.ones(len(run_starts))
+    As1[below] = 1 + np.log10(run_f[above] / run_f[below]) / np.log10(run_mn[above] / run_mn[below])
+    As2[below] = run_lengths[below] / (run_mn[below] - run_mn[above])
+
+    out = 2 / (1 / np.repeat(As1, run_lengths) + 1 / np.repeat(As2, run_lengths))
+
+    return np.split(out, ends[:-1])
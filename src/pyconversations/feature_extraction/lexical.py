@@ -0,0 +1,141 @@
+"""
+A fused scanner of the lexical statistics of post texts:
+character class counts, and the emojis, hashtags, mentions and URLs they contain.
+
+Each post text is scanned once by a single call, with precompiled patterns.
+Counts of single characters use `str.count` (and `str.translate`) rather than regex matches,
+and the patterns of a family are only run when the characters their matches require occur in the text.
+Emojis are matched by a trie of the codes known to `demoji`, with the same (longest-first) matches,
+when the installed `demoji` exposes them (as its private `_CODE_TO_DESC`); otherwise `demoji` finds them itself.
+"""
+import re
+import string
+
+import demoji
+
+from ..redact import trie_pattern
+from .regex import HASHTAG_REGEX
+from .regex import URL_REGEX
+
+PUNCTUATION = ',.;\'"'  # counted with the question and exclamation marks
+UPPERCASE = str.maketrans('', '', string.ascii_uppercase)
+
+HASHTAG_PATTERN = re.compile(HASHTAG_REGEX)
+URL_PATTERN = re.compile(URL_REGEX)
+
+_emoji_pattern = None  # (False once `demoji` is found not to expose its codes)
+
+
+def emoji_pattern():
+    """
+    Returns the (compiled on first use) trie pattern of the emoji codes known to `demoji`.
+
+    Returns
+    -------
+    re.Pattern or None
+        The pattern, or None if the installed `demoji` does not expose its codes
+    """
+    global _emoji_pattern
+
+    if _emoji_pattern is None:
+        codes = getattr(demoji, '_CODE_TO_DESC', None)
+        _emoji_pattern = re.compile(trie_pattern(codes)) if isinstance(codes, dict) and codes else False
+
+    return _emoji_pattern or None
+
+
+def find_emojis(text):
+    """
+    Returns the emojis within `text`, as `demoji.findall_list(text, desc=False)` does.
+
+    Parameters
+    ----------
+    text : str
+
+    Returns
+    -------
+    list(str)
+        The extracted emojis
+    """
+    # every emoji code holds a non-ASCII character
+    if text.isascii():
+        return []
+
+    pattern = emoji_pattern()
+    if pattern is None:
+        return demoji.findall_list(text, desc=False)
+
+    return pattern.findall(text)
+
+
+def _matches(pattern, text):
+    return [x.group() for x in pattern.finditer(text)]
+
+
+def scan_text(text, mention_regex=None):
+    """
+    Returns the lexical statistics of a text.
+
+    Parameters
+    ----------
+    text : str
+        The text to scan
+    mention_regex : str or None
+        The platform-specific user mention pattern (see `UniMessage.MENTION_REGEX`). Default: None (no mentions)
+
+    Returns
+    -------
+    dict(str, object)
+        The counts of characters (`char_count`, `?_count`, `!_count`, `punct_count`, `uppercase_count`),
+        the extracted `emojis`, `hashtags`, `mentions` and `urls`, and their counts
+    """
+    question = text.count('?')
+    exclamation = text.count('!')
+
+    emojis = find_emojis(text)
+    hashtags = _matches(HASHTAG_PATTERN, text) if '#' in text else []
+    mentions = [] if mention_regex is None else _matches(re.compile(mention_regex), text)
+    urls = _matches(URL_PATTERN, text) if '://' in text else []
+
+    return {
+        'char_count':      len(text),
+        '?_count':         question,
+        '!_count':         exclamation,
+        'punct_count':     question + exclamation + sum(map(text.count, PUNCTUATION)),
+        'uppercase_count': len(text) - len(text.translate(UPPERCASE)),
+        'emoji_count':     len(emojis),
+        'hashtag_count':   len(hashtags),
+        'mention_count':   len(mentions),
+        'url_count':       len(urls),
+        'emojis':          emojis,
+        'hashtags':        hashtags,
+        'mentions':        mentions,
+        'urls':            urls,
+    }
+
+
+def scan_texts(texts, mention_regex=None):
+    """
+    Returns the lexical statistics of several texts, scanning each distinct text once
+    (e.g., "[deleted]", "[removed]" and retweeted texts).
+
+    Parameters
+    ----------
+    texts : list(str)
+        The texts to scan
+    mention_regex : str or None
+        The platform-specific user mention pattern. Default: None (no mentions)
+
+    Returns
+    -------
+    list(dict(str, object))
+        The statistics of each text, in order (see `scan_text`). Repeated texts share their statistics.
+    """
+    scanned = {}
+    out = []
+    for text in texts:
+        if text not in scanned:
+            scanned[text] = scan_text(text, mention_regex)
+        out.append(scanned[text])
+
+    return out
@@ -1 +1,2 @@
-CACHE_SIZE = 256
+# maximum number of feature values held by the shared feature cache (see `cache.FeatureCache`)
+CACHE_SIZE = 2 ** 16
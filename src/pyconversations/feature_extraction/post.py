@@ -1,14 +1,10 @@
-from collections import Counter
-from functools import lru_cache
-
-from demoji import findall_list
-
+from .cache import cached_feature
+from .harmonic import MIXING_CACHE
+from .harmonic import MIXING_PARAMS
 from .harmonic import mixing
+from .harmonic import mixing_batch
 from .harmonic import novelty
-from .params import CACHE_SIZE
-from .regex import HASHTAG_REGEX
-from .regex import URL_REGEX
-from .regex import get_all as get_all_regex
+from .lexical import scan_text
 
 
 class PostFeatures:
@@ -39,33 +35,55 @@ class PostFeatures:
 
     @staticmethod
     def floats(post):
-        return mixing_features(post)
+        # (a copy: the cached features are shared, and containers nesting these add their own)
+        return dict(mixing_features(post))
 
     @staticmethod
     def ints(post):
+        stats = lexical_stats(post)
+        type_counts = type_frequency_distribution(post)
         return {
-            '?_count':         len(get_all_regex(post, r'[?]')),
-            '!_count':         len(get_all_regex(post, r'[!]')),
-            'char_count':      len(post.text),
-            'emoji_count':     len(emojis(post)),
-            'hashtag_count':   len(hashtags(post)),
-            'mention_count':   len(mentions(post)),
+            '?_count':         stats['?_count'],
+            '!_count':         stats['!_count'],
+            'char_count':      stats['char_count'],
+            'emoji_count':     stats['emoji_count'],
+            'hashtag_count':   stats['hashtag_count'],
+            'mention_count':   stats['mention_count'],
             'out_degree':      out_degree(post),
-            'punct_count':     len(get_all_regex(post, r'[,.?!;\'"]')),
-            'token_count':     len(post.tokens),
-            'type_count':      len(type_frequency_distribution(post)),
-            'uppercase_count': len(get_all_regex(post, r'[A-Z]')),
-            'url_count':       len(urls(post)),
+            'punct_count':     stats['punct_count'],
+            'token_count':     sum(type_counts.values()),
+            'type_count':      len(type_counts),
+            'uppercase_count': stats['uppercase_count'],
+            'url_count':       stats['url_count'],
         }
 
     @staticmethod
     def strs(post):
+        stats = lexical_stats(post)
         return {
-            'emojis':   emojis(post),
-            'hashtags': hashtags(post),
-            'mentions': mentions(post),
+            'emojis':   stats['emojis'],
+            'hashtags': stats['hashtags'],
+            'mentions': stats['mentions'],
             'tokens':   post.tokens,
-            'urls':     urls(post),
+            'urls':     stats['urls'],
+        }
+
+    @staticmethod
+    def schema():
+        """
+        Returns the names of the boolean, float and integer features, in the order they are computed in.
+
+        Returns
+        -------
+        dict(str, list(str))
+        """
+        return {
+            'bools':  ['is_source'],
+            'floats': list(MIXING_PARAMS),
+            'ints':   [
+                '?_count', '!_count', 'char_count', 'emoji_count', 'hashtag_count', 'mention_count', 'out_degree',
+                'punct_count', 'token_count', 'type_count', 'uppercase_count', 'url_count',
+            ],
         }
 
 
@@ -97,10 +115,27 @@ def out_degree(post):
     int
         The number of posts this post replies to, as indicated by the post object.
     """
-    return len(post.reply_to)
+    return len(post._reply_ids)
+
+
+@cached_feature
+def lexical_stats(post):
+    """
+    Returns the lexical statistics of the post text,
+    gathered in a single scan (see `lexical.scan_text`).
+
+    Parameters
+    ----------
+    post : UniMessage
+
+    Returns
+    -------
+    dict(str, object)
+        Character counts, and the emojis, hashtags, mentions and URLs of the post (and their counts)
+    """
+    return scan_text(post.text, post.MENTION_REGEX)
 
 
-@lru_cache(maxsize=CACHE_SIZE)
 def mentions(post):
     """
     Returns the user mentions within the post
@@ -113,10 +148,9 @@ def mentions(post):
     -------
     list(str)
     """
-    return [] if post.MENTION_REGEX is None else get_all_regex(post, post.MENTION_REGEX)
+    return lexical_stats(post)['mentions']
 
 
-@lru_cache(maxsize=CACHE_SIZE)
 def urls(post):
     """
     Returns the URLs within this post
@@ -129,10 +163,9 @@ def urls(post):
     -------
     list(str)
     """
-    return get_all_regex(post, URL_REGEX)
+    return lexical_stats(post)['urls']
 
 
-@lru_cache(maxsize=CACHE_SIZE)
 def hashtags(post):
     """
     Returns the strings of hashtags mentioned in this post
@@ -145,10 +178,9 @@ def hashtags(post):
     -------
     list(str)
     """
-    return get_all_regex(post, HASHTAG_REGEX)
+    return lexical_stats(post)['hashtags']
 
 
-@lru_cache(maxsize=CACHE_SIZE)
 def emojis(post):
     """
     Returns a list of all extracted emojis.
@@ -162,10 +194,10 @@ def emojis(post):
     list(str)
         The extracted emojis
     """
-    return findall_list(post.text, desc=False)
+    return lexical_stats(post)['emojis']
 
 
-@lru_cache(maxsize=CACHE_SIZE)
+@cached_feature
 def type_frequency_distribution(post):
     """
     Returns the type frequency (unigram) distribution for the post.
@@ -178,10 +210,10 @@ def type_frequency_distribution(post):
     -------
     collections.Counter
     """
-    return Counter(post.tokens)
+    return post.type_counts
 
 
-@lru_cache(maxsize=CACHE_SIZE)
+@cached_feature
 def mixing_features(post):
     """
     Returns the measured parameters using the harmonic mixing law.
@@ -206,7 +238,60 @@ def mixing_features(post):
     return mixing(type_frequency_distribution(post))
 
 
-@lru_cache(maxsize=CACHE_SIZE)
+def prefetch_mixing_features(posts):
+    """
+    Fits the harmonic mixing law for many posts at once (each distinct frequency profile once),
+    so that `mixing_features` finds their parameters cached.
+    The features of the posts should be read before more profiles than the cache holds are fitted:
+    see `prefetch_chunks`.
+
+    Parameters
+    ----------
+    posts : iterable(UniMessage)
+    """
+    mixing_batch([post.type_counts for post in posts if post.text and post.type_counts])
+
+
+def prefetch_chunks(items, posts_of=None):
+    """
+    Splits posts (or containers of posts, such as conversations) into consecutive chunks
+    of at most as many posts as the mixing cache holds profiles,
+    and fits the harmonic mixing law for the posts of each chunk at once (see `prefetch_mixing_features`)
+    before yielding it, so that their parameters are still cached while the features of the chunk are read.
+    A container holding more posts than that is yielded alone, without prefetching.
+
+    Parameters
+    ----------
+    items : iterable(UniMessage) or iterable
+        The posts, or their containers
+    posts_of : callable
+        The posts of a container (Default: None, for posts)
+
+    Yields
+    ------
+    list
+        The consecutive chunks of `items`
+    """
+    limit = MIXING_CACHE.cache_info()['maxsize']
+    chunk, posts = [], []
+    for item in items:
+        held = [item] if posts_of is None else list(posts_of(item))
+        if chunk and len(posts) + len(held) > limit:
+            if len(posts) <= limit:
+                prefetch_mixing_features(posts)
+            yield chunk
+            chunk, posts = [], []
+
+        chunk.append(item)
+        posts.extend(held)
+
+    if chunk:
+        if len(posts) <= limit:
+            prefetch_mixing_features(posts)
+        yield chunk
+
+
+@cached_feature
 def novelty_vector(post):
     """
     Returns the novelty vector measured from the post text.
@@ -1,16 +1,26 @@
 from collections import Counter
-from collections import defaultdict
-from functools import lru_cache
-from functools import reduce
 
 import numpy as np
 
 from ..convo import Conversation
-from .params import CACHE_SIZE
+from .aggregate import group_by
+from .aggregate import grouped_stats
+from .aggregate import stats_dict
+from .cache import cached_feature
+from .entropy import SPLIT_PAIRS
+from .entropy import split_entropies
 from .post import PostFeatures
 from .post import is_source
 from .post import out_degree
+from .post import prefetch_chunks
 from .post import type_frequency_distribution as post_freq
+from .tree import tree_metrics
+
+# integer post features that are not summed over posts
+POST_INTS_SKIPSET = {
+    'type_count',  # must be aggregated in set theoretic way
+    'depth', 'width',  # nonsensical accumulation stats
+}
 
 
 class PostInConvoFeatures:
@@ -54,10 +64,9 @@ class PostInConvoFeatures:
     @staticmethod
     def ints(post, convo):
         out = PostFeatures.ints(post)
-        out['degree'] = post_depth(post, convo)
-        out['in_degree'] = post_in_degree(post, convo)
-        out['depth'] = post_depth(post, convo)
-        out['width'] = post_width(post, convo)
+
+        for k, v in tree_features(post, convo).items():
+            out[k] = v
 
         return out
 
@@ -67,6 +76,22 @@ class PostInConvoFeatures:
 
         return out
 
+    @staticmethod
+    def schema():
+        """
+        Returns the names of the boolean, float and integer features, in the order they are computed in.
+
+        Returns
+        -------
+        dict(str, list(str))
+        """
+        out = PostFeatures.schema()
+        out['bools'] += ['is_leaf', 'is_internal', 'is_author_source_author']
+        out['floats'] += ['relative_age', 'response_time']
+        out['floats'] += [f'avg_token_entropy_{ko}-{ki}' for ko, ki in SPLIT_PAIRS]
+        out['ints'] += ['degree', 'in_degree', 'depth', 'width']
+        return out
+
 
 def is_leaf(post, convo):
     """
@@ -117,15 +142,55 @@ def is_author_source_author(post, convo):
     return post.author in source_authors(convo)
 
 
+def tree_features(post, convo):
+    """
+    Returns the structural features of a post within the conversation,
+    read from the conversation's `tree_metrics` at once.
+
+    Parameters
+    ----------
+    post : UniMessage
+    convo : Conversation
+
+    Returns
+    -------
+    dict(str, int)
+        The `degree`, `in_degree`, `depth` and `width` of the post
+    """
+    metrics = tree_metrics(convo)
+    ix = metrics.row(post)
+    if ix is None:
+        depth = post_depth(post, convo)
+        return {
+            'degree':    depth,
+            'in_degree': post_in_degree(post, convo),
+            'depth':     depth,
+            'width':     post_width(post, convo),
+        }
+
+    depth = int(metrics.depth[ix])
+    return {
+        'degree':    depth,
+        'in_degree': int(metrics.in_degree[ix]),
+        'depth':     depth,
+        'width':     int(metrics.width[ix]),
+    }
+
+
 def post_degree(post, convo):
-    return in_degrees_by_uid(convo)[post.uid] + out_degree(post)
+    return post_in_degree(post, convo) + out_degree(post)
 
 
 def post_in_degree(post, convo):
-    return in_degrees_by_uid(convo)[post.uid]
+    metrics = tree_metrics(convo)
+    ix = metrics.row(post)
+    if ix is None:
+        return in_degrees_by_uid(convo)[post.uid]
 
+    return int(metrics.in_degree[ix])
 
-@lru_cache(maxsize=CACHE_SIZE)
+
+@cached_feature
 def in_degrees_by_uid(conv):
     """
     Returns a Counter of the post IDs mapping to the # of replies that post received in this Conversation
@@ -140,18 +205,11 @@ def in_degrees_by_uid(conv):
     Counter
         A mapping from post IDs to the # of replies they receive in `conv`
     """
-    cnt = Counter()
-    for p in conv.posts.values():
-        if p.uid not in cnt:
-            cnt[p.uid] = 0
+    metrics = tree_metrics(conv)
+    return Counter(dict(zip(metrics.uids, metrics.in_degree.tolist())))
 
-        for r in p.reply_to:
-            if r in conv.posts:
-                cnt[r] += 1
-    return cnt
 
-
-@lru_cache(maxsize=CACHE_SIZE)
+@cached_feature
 def source_authors(conv):
     """
     Returns the set of authors that contributed a source (non-reply) post.
@@ -167,7 +225,7 @@ def source_authors(conv):
     return set([conv.posts[pid].author for pid in conv.get_sources()])
 
 
-@lru_cache(maxsize=CACHE_SIZE)
+@cached_feature
 def post_reply_time(post, conv):
     """
     Returns the time between the post and its parent
@@ -190,7 +248,7 @@ def post_reply_time(post, conv):
 
     diffs = [
         abs((post.created_at - conv.posts[rid].created_at).total_seconds())
-        for rid in post.reply_to if rid in conv.posts and conv.posts[rid].created_at is not None
+        for rid in post._reply_ids if rid in conv.posts and conv.posts[rid].created_at is not None
     ]
 
     if not diffs:
@@ -199,7 +257,7 @@ def post_reply_time(post, conv):
     return min(diffs)
 
 
-@lru_cache(maxsize=CACHE_SIZE)
+@cached_feature
 def post_to_source(post, conv):
     """
     Returns the time between the post and the conversation source
@@ -228,10 +286,10 @@ def post_to_source(post, conv):
     return (post.created_at - conv.posts[timeorder[0]].created_at).total_seconds()
 
 
-@lru_cache(maxsize=CACHE_SIZE)
 def conversation_type_frequency_distribution(convo):
     """
-    Returns the type frequency (unigram) distribution for the convo.
+    Returns the type frequency (unigram) distribution for the convo,
+    kept up to date by the conversation itself (see `Conversation.type_counts`).
 
     Parameters
     ----------
@@ -241,10 +299,10 @@ def conversation_type_frequency_distribution(convo):
     -------
     collections.Counter
     """
-    return reduce(lambda x, y: x + y, map(post_freq, convo.posts.values()))
+    return convo.type_counts
 
 
-@lru_cache(maxsize=CACHE_SIZE)
+@cached_feature
 def avg_token_entropy(post, conv):
     """
     Returns the average per token normed entropy with respect to the conversation.
@@ -263,7 +321,7 @@ def avg_token_entropy(post, conv):
         The entropy
     """
     if post.uid not in conv.posts:
-        cx = Conversation(posts=conv.posts)
+        cx = Conversation(posts=dict(conv.posts))
         cx.add_post(post)
         conv = cx
 
@@ -290,7 +348,7 @@ def avg_token_entropy(post, conv):
     return entropy
 
 
-@lru_cache(maxsize=CACHE_SIZE)
+@cached_feature
 def avg_token_entropy_conv(conv_a, conv_b):
     """
     Returns the average per token normed entropy of `conv_a` (the first conversation)
@@ -342,20 +400,8 @@ def avg_token_entropy_conv(conv_a, conv_b):
     return entropy
 
 
-@lru_cache(maxsize=CACHE_SIZE)
+@cached_feature
 def avg_token_entropy_all_splits(post, conv):
-    splits = {
-        'post':        post,
-        'full':        conv,
-
-        'ancestors':   conv.get_ancestors(post.uid, include_post=True),
-        # 'after':       conv.get_after(post.uid, include_post=True),
-        # 'before':      conv.get_before(post.uid, include_post=True),
-        'children':    conv.get_children(post.uid, include_post=True),
-        'descendants': conv.get_descendants(post.uid, include_post=True),
-        'parents':     conv.get_parents(post.uid, include_post=True),
-        'siblings':    conv.get_siblings(post.uid, include_post=True),
-    }
     """
     Returns a dictionary of average per token normed entropy between
     conversational splits based on `post`.
@@ -373,6 +419,30 @@ def avg_token_entropy_all_splits(post, conv):
     dict(str, float)
         Mapping from a conversation split pair considered to the entropy measured
     """
+    entropy = split_entropies(post, conv)
+    if entropy is not None:
+        return entropy
+
+    return _avg_token_entropy_all_splits(post, conv)
+
+
+def _avg_token_entropy_all_splits(post, conv):
+    """
+    Computes `avg_token_entropy_all_splits` by building each split (and union of splits) as a Conversation,
+    for posts not (or no longer) held by the conversation as they are.
+    """
+    splits = {
+        'post':        post,
+        'full':        conv,
+
+        'ancestors':   conv.get_ancestors(post.uid, include_post=True),
+        # 'after':       conv.get_after(post.uid, include_post=True),
+        # 'before':      conv.get_before(post.uid, include_post=True),
+        'children':    conv.get_children(post.uid, include_post=True),
+        'descendants': conv.get_descendants(post.uid, include_post=True),
+        'parents':     conv.get_parents(post.uid, include_post=True),
+        'siblings':    conv.get_siblings(post.uid, include_post=True),
+    }
     ks = sorted(splits.keys())
     entropy = {}
     for ix, ko in enumerate(ks):
@@ -397,7 +467,6 @@ def avg_token_entropy_all_splits(post, conv):
     return entropy
 
 
-@lru_cache(maxsize=CACHE_SIZE)
 def post_depth(post, conv):
     """
     Returns the depth of this post within the conversation.
@@ -417,9 +486,15 @@ def post_depth(post, conv):
     int
         The depth of the `post` in the conversation DAG
     """
+    metrics = tree_metrics(conv)
+    ix = metrics.row(post)
+    if ix is not None:
+        return int(metrics.depth[ix])
+
+    # a post outside of the conversation (or changed since): placed below its parents within it
     parent_depths = [
-        post_depth(post=conv.posts[rid], conv=conv)
-        for rid in post.reply_to if rid in conv.posts
+        int(metrics.depth[metrics.index[rid]])
+        for rid in post._reply_ids if rid in metrics.index
     ]
 
     if not parent_depths:
@@ -428,7 +503,7 @@ def post_depth(post, conv):
         return 1 + max(parent_depths)
 
 
-@lru_cache(maxsize=CACHE_SIZE)
+@cached_feature
 def depth_dist(conv):
     """
     Returns the depth distribution of posts within the conversation.
@@ -443,10 +518,9 @@ def depth_dist(conv):
     Counter
         The counts of posts at various depths within the conversation
     """
-    return Counter([post_depth(p, conv) for p in conv.posts.values()])
+    return Counter(tree_metrics(conv).depth.tolist())
 
 
-@lru_cache(maxsize=CACHE_SIZE)
 def post_width(post, conv):
     """
     Returns the width of the depth-level that `post` is at
@@ -468,6 +542,181 @@ def post_width(post, conv):
     return depth_dist(conv)[post_depth(post, conv)]
 
 
+def post_subtree_size(post, conv):
+    """
+    Returns the number of distinct posts in the conversation below (and including) `post`:
+    its replies, their replies, etc.
+
+    Parameters
+    ----------
+    post : UniMessage
+        The target message
+
+    conv : Conversation
+        A collection of posts
+
+    Returns
+    -------
+    int
+        The size of the sub-tree rooted at `post` in `conv`
+    """
+    metrics = tree_metrics(conv)
+    ix = metrics.row(post)
+    if ix is None:
+        return 1 + len(conv.get_descendants(post.uid).posts)
+
+    return int(metrics.subtree_size[ix])
+
+
+class PostFeatureMatrix:
+
+    """
+    The float and integer features of every post of a conversation
+    (see `PostInConvoFeatures.floats` and `.ints`), as a dense matrix computed once
+    and shared by the aggregate statistics of posts, users and conversations, and by `PostVectorizer`.
+
+    Rows follow the order of `conv.posts`; `index` maps a post UID to its row,
+    and `keys` names the columns (the float features, then the integer features, see `PostInConvoFeatures.schema`).
+    The matrix is shared: it should not be modified.
+    """
+
+    def __init__(self, conv):
+        """
+        Parameters
+        ----------
+        conv : Conversation
+            A collection of posts
+        """
+        posts = list(conv.posts.values())
+
+        self.uids = list(conv.posts)
+        self.index = {uid: ix for ix, uid in enumerate(self.uids)}
+        self.authors = [post.author for post in posts]
+
+        # the posts (and their versions) the features were computed from (see `current`)
+        self._posts = posts
+        self._versions = [post.version for post in posts]
+
+        rows = [{**PostInConvoFeatures.floats(post, conv), **PostInConvoFeatures.ints(post, conv)}
+                for chunk in prefetch_chunks(posts) for post in chunk]
+
+        schema = PostInConvoFeatures.schema()
+        self.keys = schema['floats'] + schema['ints']
+        self.values = np.array([[row[k] for k in self.keys] for row in rows], dtype=float).reshape(len(rows), len(self.keys))
+
+    def current(self, conv):
+        """
+        Returns whether the features were computed from the posts of `conv` as they currently are.
+
+        Parameters
+        ----------
+        conv : Conversation
+
+        Returns
+        -------
+        bool
+        """
+        return len(conv.posts) == len(self._posts) and all(
+            post is kept and post.version == version
+            for post, kept, version in zip(conv.posts.values(), self._posts, self._versions)
+        )
+
+    def rows(self, filter_by=None):
+        """
+        Returns the rows of the posts selected by `filter_by`.
+
+        Parameters
+        ----------
+        filter_by : function (UniMessage -> bool)
+            Default: None (all rows)
+
+        Returns
+        -------
+        np.array
+        """
+        if filter_by is None:
+            return self.values
+
+        mask = np.fromiter((bool(filter_by(post)) for post in self._posts), dtype=bool, count=len(self._posts))
+        return self.values[mask]
+
+
+@cached_feature
+def _post_feature_matrix(conv):
+    return PostFeatureMatrix(conv)
+
+
+def post_feature_matrix(conv):
+    """
+    Returns the float and integer features of all posts of the conversation,
+    computed once per version of the conversation (and again if any of its posts has been modified since).
+
+    Parameters
+    ----------
+    conv : Conversation
+        A collection of posts
+
+    Returns
+    -------
+    PostFeatureMatrix
+    """
+    matrix = _post_feature_matrix(conv)
+    if not matrix.current(conv):
+        matrix = PostFeatureMatrix(conv)
+
+    return matrix
+
+
+def post_feature_blocks(convs):
+    """
+    Returns the features of every post of each conversation, as matrices whose rows follow the order of its posts:
+    the float and integer features (see `post_feature_matrix`), and the boolean features (as 0 or 1),
+    their columns in the order of `PostInConvoFeatures.schema`.
+    The mixing law is fitted for the posts of many conversations at once (see `prefetch_chunks`).
+    Conversations are independent: chunks of them may be featurized by worker processes (see `parallel.map_chunks`).
+
+    Parameters
+    ----------
+    convs : list(Conversation)
+
+    Returns
+    -------
+    list((np.array, np.array))
+        The numeric and boolean features of the posts of each conversation
+    """
+    keys = PostInConvoFeatures.schema()['bools']
+    out = []
+    for chunk in prefetch_chunks(convs, posts_of=lambda conv: conv.posts.values()):
+        for conv in chunk:
+            bools = [PostInConvoFeatures.bools(post, conv) for post in conv.posts.values()]
+            bools = np.array([[row[k] for k in keys] for row in bools], dtype=np.int64).reshape(len(bools), len(keys))
+            out.append((post_feature_matrix(conv).values, bools))
+
+    return out
+
+
+@cached_feature
+def user_post_stats(conv):
+    """
+    Returns the aggregate statistics of the float and integer features of the posts of each author of the conversation
+    (see `agg_post_stats`), grouping the rows of its post feature matrix by author at once.
+
+    Parameters
+    ----------
+    conv : Conversation
+        A collection of posts
+
+    Returns
+    -------
+    dict(str, dict(str, float))
+        The statistics of the posts of each author
+    """
+    matrix = post_feature_matrix(conv)
+    users, order, starts = group_by(matrix.authors)
+    stats = grouped_stats(matrix.values[order], starts)
+    return {user: stats_dict(stats, row, matrix.keys, 'post') for row, user in enumerate(users)}
+
+
 def agg_post_stats(convo, filter_by=None):
     """
     Computes a set of aggregate post statistical measures.
@@ -495,6 +744,7 @@ def agg_post_stats_(convos, filter_by=None):
     Specifically, the following stats are measured:
     min, max, mean, median, standard deviation
 
+    The post features of each conversation are those of its (shared) post feature matrix.
 
     Parameters
     ----------
@@ -505,27 +755,19 @@ def agg_post_stats_(convos, filter_by=None):
     -------
     dict(str, dict(str, float))
     """
-    agg = defaultdict(list)
+    keys = None
+    blocks = []
     for convo in convos:
-        for p in convo.posts.values():
-            if filter_by is not None and not filter_by(p):
-                continue
+        matrix = post_feature_matrix(convo)
+        rows = matrix.rows(filter_by)
+        if len(rows):
+            keys = matrix.keys
+            blocks.append(rows)
 
-            for k, v in PostInConvoFeatures.floats(p, convo).items():
-                agg[k].append(v)
+    if not blocks:
+        return {}
 
-            for k, v in PostInConvoFeatures.ints(p, convo).items():
-                agg[k].append(v)
-
-    out = {}
-    for k, vs in agg.items():
-        out[f'post_min_{k}'] = float(np.nanmin(vs))
-        out[f'post_max_{k}'] = float(np.nanmax(vs))
-        out[f'post_mean_{k}'] = float(np.nanmean(vs))
-        out[f'post_median_{k}'] = float(np.median(vs))
-        out[f'post_std_{k}'] = float(np.nanstd(vs))
-
-    return out
+    return stats_dict(grouped_stats(np.vstack(blocks), [0]), 0, keys, 'post')
 
 
 def sum_booleans_across_convo(convo):
@@ -561,14 +803,10 @@ def sum_ints_across_convo(convo):
     -------
     dict(str, int)
     """
-    skipset = {
-        'type_count',  # must be aggregated in set theoretic way
-        'depth', 'width',  # nonsensical accumulation stats
-    }
     cnt = Counter()
     for p in convo.posts.values():
         for k, v in PostInConvoFeatures.ints(p, convo).items():
-            if k in skipset:
+            if k in POST_INTS_SKIPSET:
                 continue
 
             cnt[k] += v
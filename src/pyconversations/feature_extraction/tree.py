@@ -0,0 +1,192 @@
+import numpy as np
+
+from .cache import cached_feature
+
+# Number of posts whose ancestors are gathered at once (as bit sets) when computing subtree sizes,
+# bounding their memory to SUBTREE_BLOCK / 8 bytes per post
+SUBTREE_BLOCK = 2 ** 12
+
+
+class TreeMetrics:
+
+    """
+    Structural metrics of every post of a conversation, computed at once over the reply DAG.
+    Posts are visited in topological order, so deep threads need no recursion.
+
+    Rows follow the order of `conv.posts`; `index` maps a post UID to its row.
+    """
+
+    def __init__(self, conv):
+        """
+        Parameters
+        ----------
+        conv : Conversation
+            A collection of posts
+        """
+        posts = list(conv.posts.values())
+        n = len(posts)
+
+        self.uids = list(conv.posts)
+        self.index = {uid: ix for ix, uid in enumerate(self.uids)}
+
+        # the posts (and their versions) the metrics were computed from (see `row`)
+        self._posts = posts
+        self._versions = [post.version for post in posts]
+
+        # reply edges within the conversation: the rows of the parents of each post, and of the replies to it
+        parents = [[] for _ in range(n)]
+        replies = [[] for _ in range(n)]
+        for ix, post in enumerate(posts):
+            for rid in post._reply_ids:
+                jx = self.index.get(rid)
+                if jx is not None:
+                    parents[ix].append(jx)
+                    replies[jx].append(ix)
+
+        # the number of posts replied to (within the conversation or not), and of replies received within it
+        self.out_degree = np.fromiter((len(post._reply_ids) for post in posts), dtype=np.int64, count=n)
+        self.in_degree = np.fromiter(map(len, replies), dtype=np.int64, count=n)
+        self.degree = self.in_degree + self.out_degree
+
+        self.order, depth, self._ordered = self._topological_depths(parents, replies)
+        self.depth = np.array(depth, dtype=np.int64)
+        self.width = np.bincount(self.depth, minlength=1)[self.depth]
+
+        # the rows each post replies to, and the rows replying to it, within the conversation
+        self.parents = parents
+        self.replies = replies
+        self._subtree_size = None
+
+    def _topological_depths(self, parents, replies):
+        """
+        Orders the posts so that every post comes after the posts it replies to
+        and computes their depth (the longest path from a source) along the way.
+
+        Returns
+        -------
+        list(int)
+            The rows of the posts, in topological order
+        list(int)
+            The depth of each post
+        int
+            The number of posts ordered before those on (or below) reply cycles
+        """
+        n = len(parents)
+        depth = [0] * n
+        waiting = [len(ps) for ps in parents]  # number of parents not yet ordered
+
+        order = [ix for ix in range(n) if not waiting[ix]]
+        for ix in order:  # grows as posts are freed of their parents
+            below = depth[ix] + 1
+            for kx in replies[ix]:
+                if depth[kx] < below:
+                    depth[kx] = below
+                waiting[kx] -= 1
+                if not waiting[kx]:
+                    order.append(kx)
+
+        ordered = len(order)
+        if ordered < n:
+            # posts on (or below) reply cycles are never freed of their parents:
+            # they are placed one level below their deepest ordered parent, after all other posts
+            stuck = [ix for ix in range(n) if waiting[ix]]
+            done = set(order)
+            for ix in stuck:
+                depth[ix] = max([depth[jx] + 1 for jx in parents[ix] if jx in done], default=0)
+            order.extend(stuck)
+
+        return order, depth, ordered
+
+    @property
+    def subtree_size(self):
+        """
+        The number of distinct posts below (and including) every post,
+        computed on first use.
+
+        Returns
+        -------
+        np.ndarray
+            The subtree size of each post
+        """
+        if self._subtree_size is None:
+            self._subtree_size = np.array(self._subtree_sizes(self.parents, self.replies), dtype=np.int64)
+
+        return self._subtree_size
+
+    def _subtree_sizes(self, parents, replies):
+        """
+        Computes the number of distinct posts below (and including) every post.
+
+        Returns
+        -------
+        list(int)
+            The subtree size of each post
+        """
+        n = len(parents)
+        if all(len(ps) <= 1 for ps in parents):
+            # a forest: sizes add up from the bottom
+            sizes = [1] * n
+            for ix in reversed(self.order):
+                if parents[ix]:
+                    sizes[parents[ix][0]] += sizes[ix]
+            return sizes
+
+        # posts replying to several others would be counted more than once: gather descendants as bit sets,
+        # restricted to a block of the posts (in topological order) at a time, and count each block's bits
+        sizes = [0] * n
+        for lo in range(0, n, SUBTREE_BLOCK):
+            hi = min(lo + SUBTREE_BLOCK, n)
+
+            # (posts ordered after the block cannot reach it, unless the block holds posts on reply cycles)
+            order = self.order[:hi] if hi <= self._ordered else self.order
+            bit = {ix: 1 << (jx - lo) for jx, ix in enumerate(self.order[lo:hi], lo)}
+
+            below = [0] * n
+            for ix in reversed(order):
+                bits = bit.get(ix, 0)
+                for kx in replies[ix]:
+                    bits |= below[kx]
+                below[ix] = bits
+
+            for ix in order:
+                if below[ix]:
+                    sizes[ix] += bin(below[ix]).count('1')
+
+        return sizes
+
+    def row(self, post):
+        """
+        Returns the row of `post`, if the metrics hold it as it currently is.
+
+        Parameters
+        ----------
+        post : UniMessage
+
+        Returns
+        -------
+        int or None
+            The row of the post, or None if the post is not in the conversation
+            (or has been modified since the metrics were computed)
+        """
+        ix = self.index.get(post.uid)
+        if ix is None or self._posts[ix] is not post or self._versions[ix] != post.version:
+            return None
+
+        return ix
+
+
+@cached_feature
+def tree_metrics(conv):
+    """
+    Returns the structural metrics (depth, width, degrees and subtree size) of all posts of the conversation.
+
+    Parameters
+    ----------
+    conv : Conversation
+        A collection of posts
+
+    Returns
+    -------
+    TreeMetrics
+    """
+    return TreeMetrics(conv)
@@ -1,20 +1,42 @@
 from collections import Counter
-from collections import defaultdict
 
 import numpy as np
 
 from ..convo import Conversation
-from .post_in_conv import agg_post_stats_
+from ..parallel import map_chunks
+from .aggregate import group_starts
+from .aggregate import grouped_stats
+from .aggregate import grouped_sums
+from .aggregate import stats_dict
+from .aggregate import stats_names
+from .aggregate import summarize
+from .corpus import CorpusIndex
+from .harmonic import MIXING_PARAMS
+from .harmonic import mixing_batch
+from .post_in_conv import POST_INTS_SKIPSET
+from .post_in_conv import PostInConvoFeatures as PICF
+from .post_in_conv import post_feature_blocks
 from .user_in_conv import UserInConvoFeatures
 from .user_in_conv import get_user_posts
-from .user_in_conv import mixing_features
+from .user_in_conv import post_sum_names
 from .user_in_conv import type_frequency_distribution
 
+# the mixing parameters of users without any type
+NO_MIXING = {
+    'k1':      float(0),
+    'theta':   float(0),
+    'entropy': float(0),
+    'N_avg':   float(0),
+    'M_avg':   float(0),
+}
+
 
 class UserAcrossConvoFeatures:
 
     """
     Container for feature extraction on users situated within multiple conversations.
+    The conversations may be given as a list or indexed (see `CorpusIndex`);
+    the features of many users are best computed together, by `across_convo_features`.
     """
 
     @staticmethod
@@ -33,27 +55,135 @@ class UserAcrossConvoFeatures:
 
     @staticmethod
     def floats(user, convos):
-        user_conv = gather_all_user_posts_in_convo(user, convos)
-        out = mixing_features(user, user_conv)
-
-        for k, v in agg_post_stats_(convos, filter_by=lambda p: p.author == user).items():
-            out[k] = v
-
-        return out
+        return across_convo_features(_as_index(convos), users=[user])[0][1]
 
     @staticmethod
     def ints(user, convos):
-        out = sum_user_ints_across_convos(user, convos)
-
-        for k, v in sum_user_booleans_across_convos(user, convos).items():
-            out[k] = v
-
-        return out
+        return across_convo_features(_as_index(convos), users=[user])[0][0]
 
     @staticmethod
     def strs(user, convos):
         return {}
 
+    @staticmethod
+    def schema():
+        """
+        Returns the names of the boolean, float and integer features, in the order they are computed in.
+
+        Returns
+        -------
+        dict(str, list(str))
+        """
+        post = PICF.schema()
+        return {
+            'bools':  [],
+            'floats': MIXING_PARAMS + stats_names(post['floats'] + post['ints'], 'post'),
+            'ints':   ['message_count', 'types'] + post_sum_names(post) + ['source_author_count'],
+        }
+
+
+def _as_index(convos):
+    return convos if isinstance(convos, CorpusIndex) else CorpusIndex(convos)
+
+
+def across_convo_features(index, users=None, n_workers=1):
+    """
+    Returns the integer and float features of users across the conversations of a corpus
+    (see `UserAcrossConvoFeatures.ints` and `.floats`).
+    The features of each post of these users are computed once,
+    then summed and summarized by user in a few vectorized passes (see `aggregate`).
+
+    Parameters
+    ----------
+    index : CorpusIndex
+        The index of the corpus
+    users : list(str)
+        The users to describe. Default: None (all the users of the corpus, in the order of `index.users`)
+    n_workers : int
+        The number of processes computing the features of the posts of each conversation
+        (see `post_feature_blocks`). Default: 1 (serially, in this process)
+
+    Returns
+    -------
+    list((dict(str, int), dict(str, float)))
+        The integer and float features of each user
+    """
+    users = index.users if users is None else list(users)
+    convos = index.convos
+
+    # the users with posts, whose posts are grouped (in order) as the rows of the post feature matrices below
+    authors = [user for user in users if index.postings(user)]
+    postings = [posting for user in authors for posting in index.postings(user)]
+    starts = group_starts([len(index.postings(user)) for user in authors])
+
+    schema = PICF.schema()
+    bool_keys = schema['bools']
+    stat_keys = schema['floats'] + schema['ints']
+    sum_keys = [k for k in schema['ints'] if k not in POST_INTS_SKIPSET]
+
+    # the features of the posts, computed for all the posts of their conversations
+    cxs = list(dict.fromkeys(cx for cx, _ in postings))
+    blocks = map_chunks(post_feature_blocks, [convos[cx] for cx in cxs],
+                        sizes=[len(convos[cx].posts) for cx in cxs], n_workers=n_workers)
+    blocks = dict(zip(cxs, blocks))
+    rows = {cx: {uid: row for row, uid in enumerate(convos[cx].posts)} for cx in cxs}
+
+    bools = np.array([blocks[cx][1][rows[cx][uid]] for cx, uid in postings], dtype=np.int64)
+    bool_sums = grouped_sums(bools.reshape(len(postings), len(bool_keys)), starts)
+
+    values = np.array([blocks[cx][0][rows[cx][uid]] for cx, uid in postings], dtype=float)
+    values = values.reshape(len(postings), len(stat_keys))
+    stats = grouped_stats(values, starts)
+    int_sums = grouped_sums(values[:, [stat_keys.index(k) for k in sum_keys]].astype(np.int64), starts)
+
+    # the authors of the source posts of each conversation, and the type frequency distribution of each user
+    source_authors = {}
+    freqs = {}
+    for user in authors:
+        if user is None:
+            continue
+
+        user_conv = Conversation()
+        for cx, uid in index.postings(user):
+            user_conv.add_post(convos[cx].posts[uid])
+        if user_conv.type_counts:
+            freqs[user] = user_conv.type_counts
+
+    mixes = dict(zip(freqs, mixing_batch(list(freqs.values()))))
+
+    out = []
+    rows = {user: row for row, user in enumerate(authors)}
+    for user in users:
+        if user not in rows:
+            out.append(({}, dict(NO_MIXING)))
+            continue
+
+        row = rows[user]
+        cxs = list(dict.fromkeys(cx for cx, _ in index.postings(user)))
+
+        user_ints = {
+            'message_count': len(index.postings(user)),
+            'types':         sum(len(type_frequency_distribution(user, convos[cx])) for cx in cxs),
+        }
+        for col, k in enumerate(bool_keys):
+            user_ints[k.replace('is_', '') + '_count'] = int(bool_sums[row, col])
+        for col, k in enumerate(sum_keys):
+            user_ints[k] = int(int_sums[row, col])
+
+        source_count = 0
+        for cx in cxs:
+            if cx not in source_authors:
+                source_authors[cx] = {convos[cx].posts[pid].author for pid in convos[cx].get_sources()}
+            source_count += user in source_authors[cx]
+        user_ints['source_author_count'] = source_count
+
+        user_floats = mixes.get(user, dict(NO_MIXING))
+        user_floats.update(stats_dict(stats, row, stat_keys, 'post'))
+
+        out.append((user_ints, user_floats))
+
+    return out
+
 
 def gather_all_user_posts_in_convo(user, convos):
     if user is None:
@@ -61,7 +191,7 @@ def gather_all_user_posts_in_convo(user, convos):
 
     x = Conversation(convo_id='all_posts: ' + user)
     for conv in convos:
-        if user not in conv.authors:
+        if user not in conv.posts_by_author:
             continue
 
         for pid in conv.filter(by_author=user):
@@ -87,25 +217,11 @@ def agg_user_stats_across(user, convos):
     -------
     dict(str, dict(str, float))
     """
-    agg = defaultdict(list)
-    fs = [UserInConvoFeatures.floats, UserInConvoFeatures.ints]
-    for convo in convos:
-        if user not in convo.authors:
-            continue
-
-        for f in fs:
-            for k, v in f(user, convo).items():
-                agg[k].append(v)
-
-    out = {}
-    for k, vs in agg.items():
-        out[f'user_min_{k}'] = float(np.nanmin(vs))
-        out[f'user_max_{k}'] = float(np.nanmax(vs))
-        out[f'user_mean_{k}'] = float(np.nanmean(vs))
-        out[f'user_median_{k}'] = float(np.median(vs))
-        out[f'user_std_{k}'] = float(np.nanstd(vs) if len(vs) > 1 else 1)
-
-    return out
+    rows = [
+        {**UserInConvoFeatures.floats(user, convo), **UserInConvoFeatures.ints(user, convo)}
+        for convo in convos if user in convo.posts_by_author
+    ]
+    return summarize(rows, 'user', single_std=1)
 
 
 def sum_user_booleans_across_convos(user, convos):
@@ -123,7 +239,7 @@ def sum_user_booleans_across_convos(user, convos):
     """
     cnt = Counter()
     for convo in convos:
-        if user not in convo.authors:
+        if user not in convo.posts_by_author:
             continue
 
         for k, v in UserInConvoFeatures.bools(user, convo).items():
@@ -151,7 +267,7 @@ def sum_user_ints_across_convos(user, convos):
     }
     cnt = Counter()
     for convo in convos:
-        if user not in convo.authors:
+        if user not in convo.posts_by_author:
             continue
 
         for k, v in UserInConvoFeatures.ints(user, convo).items():
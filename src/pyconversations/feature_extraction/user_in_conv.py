@@ -1,18 +1,16 @@
 from collections import Counter
-from collections import defaultdict
-from functools import lru_cache
-from functools import reduce
-
-import numpy as np
 
 from ..convo import Conversation
+from .aggregate import stats_names
+from .aggregate import summarize
+from .cache import cached_feature
+from .harmonic import MIXING_PARAMS
 from .harmonic import mixing
 from .harmonic import novelty
-from .params import CACHE_SIZE
-from .post import type_frequency_distribution as post_freq
+from .post_in_conv import POST_INTS_SKIPSET
 from .post_in_conv import PostInConvoFeatures as PICF
-from .post_in_conv import agg_post_stats
 from .post_in_conv import avg_token_entropy_conv
+from .post_in_conv import user_post_stats
 
 
 class UserInConvoFeatures:
@@ -40,10 +38,10 @@ class UserInConvoFeatures:
 
     @staticmethod
     def floats(user, convo):
-        out = mixing_features(user, convo)
+        out = dict(mixing_features(user, convo))  # (the cached features are shared)
         out['avg_user_token_entropy'] = avg_user_token_entropy(user, convo)
 
-        for k, v in agg_post_stats(convo, filter_by=lambda p: p.author == user).items():
+        for k, v in user_post_stats(convo).get(user, {}).items():
             out[k] = v
 
         return out
@@ -67,6 +65,40 @@ class UserInConvoFeatures:
     def strs(user, convo):
         return {}
 
+    @staticmethod
+    def schema():
+        """
+        Returns the names of the boolean, float and integer features, in the order they are computed in.
+
+        Returns
+        -------
+        dict(str, list(str))
+        """
+        post = PICF.schema()
+        return {
+            'bools':  ['is_source_author'],
+            'floats': MIXING_PARAMS + ['avg_user_token_entropy'] + stats_names(post['floats'] + post['ints'], 'post'),
+            'ints':   ['message_count', 'types'] + post_sum_names(post),
+        }
+
+
+def post_sum_names(schema):
+    """
+    Returns the names of the sums of the post features of a schema (see `PostInConvoFeatures.schema`),
+    as reported by the aggregations of posts by user or conversation: the counts of true boolean features,
+    then the sums of integer features.
+
+    Parameters
+    ----------
+    schema : dict(str, list(str))
+
+    Returns
+    -------
+    list(str)
+    """
+    bools = [k.replace('is_', '') + '_count' for k in schema['bools']]
+    return bools + [k for k in schema['ints'] if k not in POST_INTS_SKIPSET]
+
 
 def iter_over_users(convo):
     """
@@ -81,19 +113,10 @@ def iter_over_users(convo):
     str
         A user
     """
-    users = set()
-    for pid in convo.posts:
-        user = convo.posts[pid].author
-
-        if user in users:
-            continue
-
-        yield user
-
-        users.add(user)
+    yield from list(convo.posts_by_author)
 
 
-@lru_cache(maxsize=CACHE_SIZE)
+@cached_feature
 def is_source_author(user, convo):
     """
     Returns if this user created a source message
@@ -108,11 +131,16 @@ def is_source_author(user, convo):
     -------
     bool
     """
-    auths = {convo.posts[pid].author for pid in convo.get_sources()}
-    return user in auths
+    # (only the posts of the user are looked at)
+    posts = convo.posts
+    for uid in convo.posts_by_author.get(user, ()):
+        if not any(rid in posts for rid in posts[uid]._reply_ids):
+            return True
 
+    return False
 
-@lru_cache(maxsize=CACHE_SIZE)
+
+@cached_feature
 def messages_per_user(conv):
     """
     Returns the user-distribution of posts written per user
@@ -127,10 +155,10 @@ def messages_per_user(conv):
     Counter
         The counts of messages written per user (keyed by author name)
     """
-    return Counter([p.author for p in conv.posts.values()])
+    return Counter({author: len(uids) for author, uids in conv.posts_by_author.items()})
 
 
-@lru_cache(maxsize=CACHE_SIZE)
+@cached_feature
 def messages_by_user(user, conv):
     """
     Returns number of messages created by this user
@@ -146,7 +174,7 @@ def messages_by_user(user, conv):
     return messages_per_user(conv)[user]
 
 
-@lru_cache(maxsize=CACHE_SIZE)
+@cached_feature
 def get_user_posts(user, conv):
     """
     Filters to just this users messages within the conversation
@@ -162,14 +190,14 @@ def get_user_posts(user, conv):
     """
     if user is None:
         return Conversation()
-    return Conversation(posts={pid: conv.posts[pid] for pid in conv.filter(by_author=user)},
+    return Conversation(posts={pid: conv.posts[pid] for pid in conv.posts_by_author.get(user, ())},
                         convo_id=f'{conv.convo_id}-{user}')
 
 
-@lru_cache(maxsize=CACHE_SIZE)
 def type_frequency_distribution(user, convo):
     """
-    Returns the type frequency (unigram) distribution for the user's posts in the convo.
+    Returns the type frequency (unigram) distribution for the user's posts in the convo
+    (see `Conversation.type_counts`).
 
     Parameters
     ----------
@@ -180,10 +208,10 @@ def type_frequency_distribution(user, convo):
     -------
     collections.Counter
     """
-    return reduce(lambda x, y: x + y, map(post_freq, get_user_posts(user, convo).posts.values()), Counter())
+    return get_user_posts(user, convo).type_counts
 
 
-@lru_cache(maxsize=CACHE_SIZE)
+@cached_feature
 def mixing_features(user, convo):
     """
     Returns the measured parameters using the harmonic mixing law.
@@ -210,7 +238,7 @@ def mixing_features(user, convo):
     return mixing(freq)
 
 
-@lru_cache(maxsize=CACHE_SIZE)
+@cached_feature
 def novelty_vector(user, convo):
     """
     Returns the novelty vector measured from the convo text, filtered to just the user.
@@ -231,7 +259,7 @@ def novelty_vector(user, convo):
     return novelty(freq)
 
 
-@lru_cache(maxsize=CACHE_SIZE)
+@cached_feature
 def avg_user_token_entropy(user, convo):
     """
     Returns the average token entropy when comparing a user
@@ -265,32 +293,18 @@ def agg_user_stats(convo):
     -------
     dict(str, dict(str, float))
     """
-    agg = defaultdict(list)
-    fs = [UserInConvoFeatures.floats, UserInConvoFeatures.ints]
-    for user in iter_over_users(convo):
-        for f in fs:
-            for k, v in f(user, convo).items():
-                agg[k].append(v)
-
-    out = {}
-    for k, vs in agg.items():
-        out[f'user_min_{k}'] = float(np.nanmin(vs))
-        out[f'user_max_{k}'] = float(np.nanmax(vs))
-        out[f'user_mean_{k}'] = float(np.nanmean(vs))
-        out[f'user_median_{k}'] = float(np.median(vs))
-        out[f'user_std_{k}'] = float(np.nanstd(vs) if len(vs) > 1 else 1)
-
-    return out
+    rows = [
+        {**UserInConvoFeatures.floats(user, convo), **UserInConvoFeatures.ints(user, convo)}
+        for user in iter_over_users(convo)
+    ]
+    return summarize(rows, 'user', single_std=1)
 
 
 def sum_post_bools_by_user(user, convo):
     cnt = Counter()
 
-    for p in convo.posts.values():
-        if p.author != user:
-            continue
-
-        for k, v in PICF.bools(p, convo).items():
+    for uid in convo.posts_by_author.get(user, ()):
+        for k, v in PICF.bools(convo.posts[uid], convo).items():
             kx = k.replace('is_', '') + '_count'
             cnt[kx] += 1 if v else 0
 
@@ -298,17 +312,10 @@ def sum_post_bools_by_user(user, convo):
 
 
 def sum_post_ints_by_user(user, convo):
-    skipset = {
-        'type_count',  # must be aggregated in set theoretic way
-        'depth', 'width',  # nonsensical accumulation stats
-    }
     cnt = Counter()
-    for p in convo.posts.values():
-        if p.author != user:
-            continue
-
-        for k, v in PICF.ints(p, convo).items():
-            if k in skipset:
+    for uid in convo.posts_by_author.get(user, ()):
+        for k, v in PICF.ints(convo.posts[uid], convo).items():
+            if k in POST_INTS_SKIPSET:
                 continue
 
             cnt[k] += v
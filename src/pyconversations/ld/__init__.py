@@ -1,7 +1,9 @@
 from .base import BaseLangDetect
+from .cache import CachedLangDetect
 from .lid import LangidLangDetect
 
 __all__ = [
     'BaseLangDetect',
+    'CachedLangDetect',
     'LangidLangDetect',
 ]
@@ -20,3 +20,21 @@ class BaseLangDetect:
             The detected language and confidence of detection
         """
         return 'und', 0.0  # (lang_str, confidence)
+
+    def get_batch(self, texts):
+        """
+        Detects the language of several texts at once.
+        Subclasses may override this to classify texts in bulk;
+        by default, each text is classified with `get`.
+
+        Parameters
+        ----------
+        texts : list(str)
+            The raw texts to detect the language of
+
+        Returns
+        -------
+        list(tuple(str, float))
+            The detected language and confidence of detection for each text, in order
+        """
+        return [self.get(text) for text in texts]
@@ -0,0 +1,123 @@
+from collections import OrderedDict
+from hashlib import blake2b
+
+from .base import BaseLangDetect
+
+
+class CachedLangDetect(BaseLangDetect):
+
+    """
+    A bounded, least-recently-used cache in front of another language detector,
+    so that repeated texts (e.g., "[deleted]", "[removed]", retweets) are only classified once.
+    Texts are keyed by a hash of their contents rather than held on to.
+    """
+
+    def __init__(self, detector, maxsize=2 ** 16):
+        """
+        Parameters
+        ----------
+        detector : BaseLangDetect
+            The language detector to cache the results of
+        maxsize : int
+            The maximum number of cached results (Default: 65536)
+        """
+        self._detector = detector
+        self._maxsize = maxsize
+        self._cache = OrderedDict()  # text digest -> (lang, conf)
+
+        self._hits = 0
+        self._misses = 0
+
+    @staticmethod
+    def _key(text):
+        return blake2b(text.encode('utf-8', 'surrogatepass'), digest_size=16).digest()
+
+    def _store(self, key, res):
+        self._cache[key] = res
+        if len(self._cache) > self._maxsize:
+            self._cache.popitem(last=False)
+
+    def get(self, text):
+        """
+        Detects the language of a text, using the cached result when the text has been seen before
+
+        Parameters
+        ----------
+        text : str
+            The raw text to detect the language of
+
+        Returns
+        -------
+        tuple(str, float)
+            The detected language and confidence of detection
+        """
+        key = self._key(text)
+        if key in self._cache:
+            self._hits += 1
+            self._cache.move_to_end(key)
+            return self._cache[key]
+
+        self._misses += 1
+        res = self._detector.get(text)
+        self._store(key, res)
+        return res
+
+    def get_batch(self, texts):
+        """
+        Detects the language of several texts at once.
+        Only texts missing from the cache (each distinct text once) are handed to the detector's `get_batch`.
+
+        Parameters
+        ----------
+        texts : list(str)
+            The raw texts to detect the language of
+
+        Returns
+        -------
+        list(tuple(str, float))
+            The detected language and confidence of detection for each text, in order
+        """
+        keys = [self._key(text) for text in texts]
+
+        missing = {}  # key -> text, for the distinct texts to classify
+        for key, text in zip(keys, texts):
+            if key in self._cache:
+                self._hits += 1
+                self._cache.move_to_end(key)
+            elif key in missing:
+                self._hits += 1
+            else:
+                self._misses += 1
+                missing[key] = text
+
+        found = dict(zip(missing, self._detector.get_batch(list(missing.values())))) if missing else {}
+        out = [found[key] if key in found else self._cache[key] for key in keys]
+
+        for key, res in found.items():
+            self._store(key, res)
+
+        return out
+
+    def cache_info(self):
+        """
+        Returns statistics of the cache.
+
+        Returns
+        -------
+        dict(str, int)
+            The number of `hits`, `misses`, the `maxsize` and the current size (`currsize`) of the cache
+        """
+        return {
+            'hits':     self._hits,
+            'misses':   self._misses,
+            'maxsize':  self._maxsize,
+            'currsize': len(self._cache)
+        }
+
+    def cache_clear(self):
+        """
+        Empties the cache and resets its statistics.
+        """
+        self._cache.clear()
+        self._hits = 0
+        self._misses = 0
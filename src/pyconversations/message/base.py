@@ -1,9 +1,17 @@
-import re
 from abc import ABC
 from abc import abstractmethod
+from collections import Counter
+from contextlib import contextmanager
 from datetime import datetime
+from os import getpid
+from sys import intern
+from weakref import ref
 
+from ..codec import dumps
+from ..codec import loads
+from ..ld import CachedLangDetect
 from ..ld import LangidLangDetect
+from ..redact import Redactor
 from ..tokenizers import DefaultTokenizer
 from ..tokenizers import LambdaTokenizer
 from ..tokenizers import NLTKTokenizer
@@ -12,21 +20,141 @@ from ..tokenizers import PartitionTokenizer
 # Langauge detection module; do not initialize unless asked for!
 DETECTOR = None
 
+# Maximum number of (distinct) texts whose detected language is remembered
+LD_CACHE_SIZE = 2 ** 16
+
+# Messages awaiting language detection (id -> (message, text)), while detection is deferred (by process DEFERRED_LD_PID)
+DEFERRED_LD = None
+DEFERRED_LD_PID = None
+
+
+class RawTimestamp(float):
+    """
+    A creation time given to a message as a number, which `created_at` returns as given.
+    """
+
+    __slots__ = ()
+
+
+def to_timestamp(dt):
+    """
+    Converts a creation time into the POSIX timestamp that messages hold internally.
+    Datetimes that would not be recovered from their timestamp
+    (timezone-aware datetimes, or local times skipped by a daylight saving change) are kept as they are,
+    and numbers are kept as given (see `RawTimestamp`).
+
+    Parameters
+    ----------
+    dt : datetime.datetime or float or int
+        The creation time (or None)
+
+    Returns
+    -------
+    float or datetime.datetime
+        The timestamp (or, rarely, the datetime itself); None if `dt` is None
+    """
+    if dt is None:
+        return None
+
+    if isinstance(dt, datetime):
+        ts = dt.timestamp()
+        return ts if datetime.fromtimestamp(ts) == dt else dt
+
+    return dt if type(dt) == int else RawTimestamp(dt)
+
+
+def to_datetime(ts):
+    """
+    Converts the creation time held by a message (see `to_timestamp`) back into what it was given as.
+
+    Parameters
+    ----------
+    ts : float or datetime.datetime
+        The timestamp (or datetime) held (or None)
+
+    Returns
+    -------
+    datetime.datetime or float or int
+        The creation time; None if `ts` is None
+    """
+    if type(ts) == float:
+        return datetime.fromtimestamp(ts)
+
+    return float(ts) if type(ts) == RawTimestamp else ts
+
 
 def get_detector():
     global DETECTOR
     if DETECTOR is None:
-        DETECTOR = LangidLangDetect()
+        DETECTOR = CachedLangDetect(LangidLangDetect(), maxsize=LD_CACHE_SIZE)
 
     return DETECTOR
 
 
+@contextmanager
+def defer_language_detection():
+    """
+    Context manager that defers the language detection of messages created (or re-texted) within it.
+    Texts are collected and classified in bulk (with `get_batch`) when the outermost context exits,
+    which yields the same languages as detecting each message as it is created.
+
+    Yields
+    ------
+    None
+    """
+    global DEFERRED_LD, DEFERRED_LD_PID
+    if DEFERRED_LD is not None and DEFERRED_LD_PID == getpid():
+        # nested; the outermost context detects everything
+        yield
+        return
+
+    # (a worker process forked within a deferred context starts its own)
+    DEFERRED_LD, DEFERRED_LD_PID = {}, getpid()
+    try:
+        yield
+        pending = list(DEFERRED_LD.values())
+    finally:
+        DEFERRED_LD, DEFERRED_LD_PID = None, None
+
+    if pending:
+        results = get_detector().get_batch([text for _, text in pending])
+        for (msg, _), (lang, conf) in zip(pending, results):
+            msg.lang = lang if conf >= 0.5 else 'und'
+
+
+# Tokenizer registry; each tokenizer is built once (when first asked for) and shared by all messages
+TOKENIZER_CONSTRUCTORS = {
+    'default':     DefaultTokenizer,
+    'NLTK':        NLTKTokenizer,
+    'partitioner': PartitionTokenizer,
+}
+TOKENIZERS = {}
+
+
 def get_tokenizer(key):
-    return {
-        'default':     DefaultTokenizer(),
-        'NLTK':        NLTKTokenizer(),
-        'partitioner': PartitionTokenizer(),
-    }[key]
+    """
+    Returns the shared tokenizer registered under `key`,
+    constructing it on first use.
+
+    Parameters
+    ----------
+    key : str
+        The name of the tokenizer. One of: 'default', 'NLTK', 'partitioner'
+
+    Returns
+    -------
+    BaseTokenizer
+        The process-wide tokenizer instance
+
+    Raises
+    ------
+    KeyError
+        When `key` is not a registered tokenizer
+    """
+    if key not in TOKENIZERS:
+        TOKENIZERS[key] = TOKENIZER_CONSTRUCTORS[key]()
+
+    return TOKENIZERS[key]
 
 
 class UniMessage(ABC):
@@ -37,11 +165,28 @@ class UniMessage(ABC):
     that all social media posts / conversation turns
     inherit from.
     The only mandatory field is the uid, a unique field.
+
+    Messages are slotted to keep millions of them in memory:
+    the creation time is held as a POSIX timestamp,
+    and the sets `reply_to` and `tags` are only allocated once they are needed (None while empty).
+
+    Each message holds weak references to the conversations it was added to,
+    which are told of its modifications (see `version`) to invalidate what they computed from it.
     """
 
+    __slots__ = (
+        '_uid', '_text', '_author', '_created_at', '_reply_to', '_tags', '_platform',
+        '_lang', '_lang_detect', '_tok', '_tokens', '_type_counts', '_version', '_owners',
+        '__weakref__',
+    )
+
     MENTION_REGEX = None
     CLASS_STR = 'UniMessage'
 
+    # Whether tokens (and their type counts) are memoized on each message.
+    # Set to False (globally, or on a subclass) to trade repeated tokenization for memory.
+    CACHE_TOKENS = True
+
     def __init__(self, uid,
                  text='', author=None,
                  created_at=None, reply_to=None, platform=None, lang=None, tags=None,
@@ -72,6 +217,12 @@ class UniMessage(ABC):
         tokenizer : str or lambda(str -> list(str))
             Which tokenizer to use (Default: partitioner)
         """
+        # modification counter (see `version`)
+        self._version = 0
+
+        # weak references to the conversations holding this message (None while there are none)
+        self._owners = None
+
         # a unique identifier{
         self._uid = uid
 
@@ -81,14 +232,14 @@ class UniMessage(ABC):
         # the username/name of the author
         self._author = author
 
-        # created datetime object
-        self._created_at = created_at
+        # creation time, as a POSIX timestamp
+        self._created_at = to_timestamp(created_at)
 
-        # collection of IDs this post was generated in reply to
-        self._reply_to = set() if not reply_to else set(reply_to)
+        # collection of IDs this post was generated in reply to (None while empty)
+        self._reply_to = set(reply_to) if reply_to else None
 
-        # any special tags or identifiers associated with this message
-        self._tags = set() if not tags else set(tags)
+        # any special tags or identifiers associated with this message (None while empty)
+        self._tags = set(tags) if tags else None
 
         # platform name
         self._platform = platform
@@ -101,6 +252,10 @@ class UniMessage(ABC):
         self._tok = tokenizer
         self._init_tokenizer()
 
+        # memoized tokenization of the text; dropped whenever the text changes
+        self._tokens = None
+        self._type_counts = None
+
     @property
     def uid(self):
         """
@@ -139,8 +294,11 @@ class UniMessage(ABC):
         -------
         None
         """
+        old_text, old_lang = self._text, self._lang
         self._text = t
+        self._clear_token_cache()
         self._lang = None
+        self._modified(text=old_text, lang=old_lang)
         self._detect_language()
 
     @property
@@ -151,9 +309,26 @@ class UniMessage(ABC):
         Returns
         -------
         datetime.datetime
+            Time of creation of post (as given, when given as a number). Could be None if not available/processed.
+        """
+        return to_datetime(self._created_at)
+
+    @property
+    def timestamp(self):
+        """
+        Returns the time of creation of this message as a POSIX timestamp
+        (cheaper than `created_at`, which builds a datetime on every access).
+
+        Returns
+        -------
+        float
             Time of creation of post. Could be None if not available/processed.
         """
-        return self._created_at
+        ts = self._created_at
+        if ts is None or type(ts) == float:
+            return ts
+
+        return ts.timestamp() if isinstance(ts, datetime) else float(ts)
 
     @created_at.setter
     def created_at(self, x):
@@ -174,13 +349,16 @@ class UniMessage(ABC):
         TypeError
             When setting this property with a value that is not a string nor a float.
         """
+        old = self._created_at
         if type(x) == str:
-            self._created_at = self.parse_datestr(x)
+            self._created_at = to_timestamp(self.parse_datestr(x))
         elif type(x) == float:
-            self._created_at = datetime.fromtimestamp(x)
+            self._created_at = x
         else:
             raise TypeError(f'Unrecognized created_at conversion: {type(x)} --> {x}')
 
+        self._modified(created_at=old)
+
     @property
     def author(self):
         """
@@ -207,7 +385,9 @@ class UniMessage(ABC):
         -------
         None
         """
+        old = self._author
         self._author = a
+        self._modified(author=old)
 
     @property
     def reply_to(self):
@@ -217,10 +397,19 @@ class UniMessage(ABC):
         Returns
         -------
         set(UID)
-            The set of UIDs of the posts this message replies to
+            The set of UIDs of the posts this message replies to.
+            Use `add_reply_to` and `remove_reply_to` to modify it.
         """
+        if self._reply_to is None:
+            self._reply_to = set()
+
         return self._reply_to
 
+    @property
+    def _reply_ids(self):
+        # the UIDs replied to, for callers that only iterate over or count them (without allocating an empty set)
+        return self._reply_to or ()
+
     @property
     def tags(self):
         """
@@ -229,10 +418,19 @@ class UniMessage(ABC):
         Returns
         -------
         set(str)
-            Set of string tags associated with this message
+            Set of string tags associated with this message.
+            Use `add_tag` and `remove_tag` to modify it.
         """
+        if self._tags is None:
+            self._tags = set()
+
         return self._tags
 
+    @property
+    def _tag_ids(self):
+        # the tags, for callers that only iterate over or count them (without allocating an empty set)
+        return self._tags or ()
+
     @property
     def platform(self):
         """
@@ -259,7 +457,9 @@ class UniMessage(ABC):
         -------
         None
         """
+        old = self._platform
         self._platform = p
+        self._modified(platform=old)
 
     @property
     def lang(self):
@@ -287,35 +487,122 @@ class UniMessage(ABC):
         -------
         None
         """
+        old = self._lang
         self._lang = lang
+        self._modified(lang=old)
+
+    @property
+    def version(self):
+        """
+        A counter of the modifications made to this message through its setters and methods,
+        used to invalidate features cached for it.
+
+        Returns
+        -------
+        int
+            The number of modifications of this message
+        """
+        return self._version
 
     def __hash__(self):
         return hash(self._uid)
 
     def __repr__(self):
-        return f'{self.CLASS_STR}({self._platform}::{self._author}::{self._created_at}::{self._text[:50]}::tags={",".join(self._tags)})'
+        created_at = self.created_at
+        return f'{self.CLASS_STR}({self._platform}::{self._author}::{created_at}::{self._text[:50]}::tags={",".join(self._tag_ids)})'
+
+    def __getstate__(self):
+        state = {slot: getattr(self, slot) for slot in UniMessage.__slots__ if slot != '__weakref__'}
+
+        # pickle shared tokenizers by their registry key, so they are shared again once unpickled
+        for key, tok in TOKENIZERS.items():
+            if state['_tok'] is tok:
+                state['_tok'] = key
+                break
+
+        # memoized tokens are cheaper to recompute than to ship between processes
+        state['_tokens'] = None
+        state['_type_counts'] = None
+
+        # (conversations register themselves again once unpickled)
+        state['_owners'] = None
+
+        return state
+
+    def __setstate__(self, state):
+        for slot, value in state.items():
+            setattr(self, slot, value)
+
+        if type(self._tok) == str:
+            self._tok = get_tokenizer(self._tok)
 
     def __ior__(self, other):
+        if other is self:
+            return self
+
+        # the previous values of the fields the merge changes
+        old = {}
+
         # Setting this to always take the larger text chunk...
         if len(self._text) < len(other.text):
+            old['text'] = self._text
             self._text = other.text
+            self._clear_token_cache()
 
-        if self._author is None:
+        if self._author is None and other.author is not None:
+            old['author'] = None
             self._author = other.author
 
-        if self._created_at is None:
-            self._created_at = other.created_at
-        elif self._created_at and other.created_at and other.created_at < self._created_at:
-            self._created_at = other.created_at
+        if other._created_at is not None and (self._created_at is None or other.timestamp < self.timestamp):
+            old['created_at'] = self._created_at
+            self._created_at = other._created_at
 
-        if self._lang is None:
+        if self._lang is None and other.lang is not None:
+            old['lang'] = None
             self._lang = other.lang
 
-        self._reply_to |= other.reply_to
-        self._tags |= other.tags
+        if other._reply_to and not self.reply_to.issuperset(other._reply_to):
+            old['reply_to'] = frozenset(self._reply_to)
+            self._reply_to.update(other._reply_to)
+
+        if other._tags and not self.tags.issuperset(other._tags):
+            old['tags'] = frozenset(self._tags)
+            self._tags.update(other._tags)
+
+        # merging a copy of this message changes nothing, and should not invalidate what was computed on it
+        if old:
+            self._modified(**old)
 
         return self
 
+    def _modified(self, **old):
+        """
+        Counts a modification of this message (see `version`) and signals it to the conversations holding it,
+        with the previous values of the fields modified (keyed by their names, e.g. `author` or `reply_to`).
+        """
+        self._version += 1
+        if self._owners:
+            for owner in self._owners:
+                convo = owner()
+                if convo is not None:
+                    convo._post_modified(self._uid, old)
+
+    def _add_owner(self, convo):
+        """
+        Registers a conversation holding this message, dropping those that no longer exist.
+        """
+        owners = [owner for owner in self._owners if owner() is not None] if self._owners else []
+        owners.append(ref(convo))
+        self._owners = owners
+
+    def _remove_owner(self, convo):
+        """
+        Unregisters a conversation that no longer holds this message.
+        """
+        if self._owners:
+            owners = [owner for owner in self._owners if owner() is not None and owner() is not convo]
+            self._owners = owners or None
+
     def _init_tokenizer(self):
         """
         Sub-selects the tokenizer to use in this class.
@@ -323,16 +610,28 @@ class UniMessage(ABC):
         if callable(self._tok):
             self._tok = LambdaTokenizer(self._tok)
         elif type(self._tok) == str:
-            # load from dictionary of available choices
+            # reference the shared instance from the registry of available choices
             self._tok = get_tokenizer(self._tok)
         else:
             raise ValueError(f'UniMessage._init_tokenizer. Unrecognized value: {self._tok}')
 
+    def _clear_token_cache(self):
+        """
+        Drops the memoized tokens and type counts (e.g., after the text has changed).
+        """
+        self._tokens = None
+        self._type_counts = None
+
     def _detect_language(self):
         """
         Classifies the text of the post and updates the language field, if asked for.
         """
         if (not self._lang or self.lang == 'und') and self._lang_detect and self._text:
+            if DEFERRED_LD is not None and DEFERRED_LD_PID == getpid():
+                # detection is deferred; the latest text of a message is the one it would have been detected on
+                DEFERRED_LD[id(self)] = (self, self.text)
+                return
+
             res = get_detector().get(text=self.text)
             self.lang = res[0] if res[1] >= 0.5 else 'und'
 
@@ -344,14 +643,17 @@ class UniMessage(ABC):
 
         Parameters
         ----------
-        data : JSON/dict
-            The raw message JSON
+        data : JSON/dict or str or bytes
+            The raw message JSON, either decoded or as an encoded string
 
         Returns
         -------
         Message class
             Created inherited UniMessage object
         """
+        if isinstance(data, (str, bytes)):
+            data = loads(data)
+
         data['created_at'] = datetime.fromtimestamp(data['created_at']) if data['created_at'] else None
         return cls(**data)
 
@@ -398,7 +700,9 @@ class UniMessage(ABC):
         -------
         None
         """
-        self._reply_to.add(tid)
+        old = frozenset(self._reply_ids)
+        self.reply_to.add(tid)
+        self._modified(reply_to=old)
 
     def remove_reply_to(self, tid):
         """
@@ -408,8 +712,15 @@ class UniMessage(ABC):
         ----------
         tid : UID
             The UID to be removed
+
+        Raises
+        ------
+        KeyError
+            If this message does not reply to `tid`
         """
-        self._reply_to.remove(tid)
+        old = frozenset(self._reply_ids)
+        self.reply_to.remove(tid)
+        self._modified(reply_to=old)
 
     def add_tag(self, tag):
         """
@@ -424,7 +735,9 @@ class UniMessage(ABC):
         -------
         None
         """
-        self._tags.add(tag)
+        old = frozenset(self._tag_ids)
+        self.tags.add(tag)
+        self._modified(tags=old)
 
     def remove_tag(self, tag):
         """
@@ -438,28 +751,41 @@ class UniMessage(ABC):
         Returns
         -------
         None
+
+        Raises
+        ------
+        KeyError
+            If this message is not tagged with `tag`
         """
-        self._tags.remove(tag)
+        old = frozenset(self._tag_ids)
+        self.tags.remove(tag)
+        self._modified(tags=old)
 
-    def to_json(self):
+    def to_json(self, serialize=False):
         """
         Function for exporting a Universal Post into a JSON object for storage and later use
 
+        Parameters
+        ----------
+        serialize : bool
+            Whether to return the encoded JSON string rather than the dictionary. (Default: False)
+
         Returns
         -------
-        JSON/dict
+        JSON/dict or str
             The JSON formatted UniMessage for disk storage
         """
-        return {
+        out = {
             'uid':        self._uid,
             'text':       self.text,
             'author':     self.author,
-            'created_at': self.created_at.timestamp() if self.created_at else None,
-            'reply_to':   list(self.reply_to),
+            'created_at': self.timestamp,
+            'reply_to':   list(self._reply_ids),
             'platform':   self.platform,
-            'tags':       list(self._tags),
+            'tags':       list(self._tag_ids),
             'lang':       self._lang
         }
+        return dumps(out) if serialize else out
 
     def get_mentions(self):
         """
@@ -482,33 +808,71 @@ class UniMessage(ABC):
         all instances of those terms.
         This function is mainly to use for redacting usernames
         or user mentions, so as to protect user privacy.
+        Terms are matched literally (see `Redactor`), and the text is rewritten in a single pass.
 
         Parameters
         ----------
-        redact_map : dict(str, str)
-            The map of terms and what they should be replaced with
+        redact_map : dict(str, str) or Redactor
+            The map of terms and what they should be replaced with.
+            Redacting many messages with the same map is faster with a `Redactor`, compiled once.
 
         Returns
         -------
         None
         """
+        redactor = redact_map if isinstance(redact_map, Redactor) else Redactor(redact_map)
+
         if self.text:
-            for term, replacement in redact_map.items():
-                if term in self.text:
-                    self.text = re.sub(term, replacement, self.text)
+            text = redactor.redact_text(self.text)
+            if text != self.text:
+                self.text = text
 
         # Change the author's name if they're in our redaction map
-        if self.author in redact_map:
-            self.author = redact_map[self.author]
+        if self.author in redactor:
+            self.author = redactor[self.author]
 
     @property
     def tokens(self):
         """
-        Tokenizes the text of this message
+        Tokenizes the text of this message.
+        Unless `CACHE_TOKENS` is disabled, the text is only tokenized once.
 
         Returns
         -------
         list(str)
             The tokenized text
         """
-        return self._tok.tokenize(self.text)
+        if self._tokens is not None:
+            return list(self._tokens)
+
+        tokens = self._tok.tokenize(self._text)
+        if self.CACHE_TOKENS:
+            # interned, immutable storage lets posts share the memory of repeated tokens
+            self._tokens = tuple(map(intern, tokens))
+
+        return tokens
+
+    @property
+    def type_counts(self):
+        """
+        The type frequency (unigram) distribution of the tokens of this message.
+        Unless `CACHE_TOKENS` is disabled, this is only counted once;
+        the returned Counter is shared and should not be modified.
+
+        Returns
+        -------
+        collections.Counter
+            The count of each token type
+        """
+        if self._type_counts is not None:
+            return self._type_counts
+
+        if self._tokens is not None:
+            counts = Counter(self._tokens)
+        else:
+            counts = Counter(self.tokens)
+
+        if self.CACHE_TOKENS:
+            self._type_counts = counts
+
+        return counts
@@ -11,6 +11,8 @@ class ChanPost(UniMessage):
     4chan post object with additional 4chan-specific features
     """
 
+    __slots__ = ()
+
     CLASS_STR = '4chanPost'
     MENTION_REGEX = r'>>(\d+)'
 
@@ -9,6 +9,8 @@ class RedditPost(UniMessage):
     Reddit post object with additional Reddit-specific features
     """
 
+    __slots__ = ()
+
     MENTION_REGEX = r'(^|[^\w])/?u/([A-Za-z0-9_-]+)\b'
     CLASS_STR = 'RedditPost'
 
@@ -10,6 +10,8 @@ class Tweet(UniMessage):
     Twitter post object with additional Twitter-specific features
     """
 
+    __slots__ = ()
+
     MENTION_REGEX = r'(^|[^@\w])@(\w{1,15})\b'
     CLASS_STR = 'Tweet'
 
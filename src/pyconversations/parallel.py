@@ -0,0 +1,160 @@
+"""
+Process-pool helpers for parsing independent files, or featurizing independent conversations, in parallel.
+"""
+import heapq
+from collections import deque
+from functools import partial
+from itertools import islice
+from multiprocessing import Pool
+
+from tqdm import tqdm
+
+
+def _map_list(func, items):
+    return list(map(func, items))
+
+
+def parallel_map(func, items, n_workers=1, chunksize=1, max_pending=None):
+    """
+    Applies `func` to every item, yielding results in the order of `items`.
+    With more than one worker, items are dispatched to a pool of processes,
+    so `func`, the items, and the results must be picklable
+    (i.e., `func` must be defined at module level).
+    Items are only read, and dispatched, a few chunks ahead of the results consumed,
+    so that neither the items nor the results (e.g., whole parsed files) pile up in memory.
+
+    Parameters
+    ----------
+    func : callable
+        The function to apply
+    items : iterable
+        The inputs to `func`
+    n_workers : int
+        The number of worker processes. With 1 (or fewer), items are processed serially in this process. (Default: 1)
+    chunksize : int
+        The number of items sent to a worker at a time. (Default: 1)
+    max_pending : int
+        The maximum number of chunks dispatched but not yet consumed. (Default: None, twice the number of workers)
+
+    Yields
+    ------
+    object
+        The result of `func` on each item, in order
+    """
+    if n_workers is None or n_workers <= 1:
+        yield from map(func, items)
+        return
+
+    if max_pending is None:
+        max_pending = 2 * n_workers
+
+    items = iter(items)
+    pending = deque()
+    with Pool(n_workers) as pool:
+        while True:
+            chunk = list(islice(items, chunksize))
+            if not chunk:
+                break
+
+            if len(pending) >= max_pending:
+                yield from pending.popleft().get()
+            pending.append(pool.apply_async(_map_list, (func, chunk)))
+
+        while pending:
+            yield from pending.popleft().get()
+
+
+def balanced_chunks(sizes, n_chunks):
+    """
+    Splits items into chunks of similar total size:
+    from the largest, each item is assigned to the chunk holding the least so far,
+    so that a few large items (e.g., long threads) are spread out rather than gathered with many small ones.
+
+    Parameters
+    ----------
+    sizes : list(int)
+        The size (i.e., expected cost) of each item
+    n_chunks : int
+        The maximum number of chunks
+
+    Returns
+    -------
+    list(list(int))
+        The indices of the items of each (non-empty) chunk, in order,
+        the chunks sorted from the largest total size to the smallest
+    """
+    n_chunks = max(1, min(n_chunks, len(sizes)))
+    loads = [(0, cx) for cx in range(n_chunks)]
+    chunks = [[] for _ in range(n_chunks)]
+    for ix in sorted(range(len(sizes)), key=lambda ix: -sizes[ix]):
+        load, cx = heapq.heappop(loads)
+        chunks[cx].append(ix)
+        heapq.heappush(loads, (load + sizes[ix], cx))
+
+    totals = {cx: load for load, cx in loads}
+    return [sorted(chunks[cx]) for cx in sorted(totals, key=lambda cx: -totals[cx]) if chunks[cx]]
+
+
+def _map_chunk(func, task):
+    cx, items = task
+    return cx, func(items)
+
+
+def map_chunks(func, items, sizes=None, n_workers=1, chunks_per_worker=4, desc=None):
+    """
+    Applies `func` to chunks of the items, returning the results in the order of `items`.
+    With more than one worker, the items are split into chunks of similar total size (see `balanced_chunks`)
+    that a pool of processes takes on from the largest, so that large items do not straggle behind;
+    `func`, the items, and the results must then be picklable (i.e., `func` must be defined at module level).
+
+    Parameters
+    ----------
+    func : callable
+        Maps a list of items to the list of their results (e.g., computing what they share at once)
+    items : list
+        The inputs of `func`
+    sizes : list(int)
+        The size (i.e., expected cost) of each item. (Default: None, all items are of the same size)
+    n_workers : int
+        The number of worker processes. With 1 (or fewer), items are processed serially in this process. (Default: 1)
+    chunks_per_worker : int
+        The number of chunks to split the items into, per worker. (Default: 4)
+    desc : str
+        If set, the description of a progress bar over items. (Default: None)
+
+    Returns
+    -------
+    list
+        The result of `func` for each item, in order
+    """
+    items = list(items)
+    if not items:
+        return []
+
+    sizes = [1] * len(items) if sizes is None else list(sizes)
+
+    n_workers = 1 if n_workers is None else max(1, n_workers)
+    n_chunks = n_workers * chunks_per_worker
+    if n_workers == 1:
+        # consecutive chunks, only to report progress
+        bounds = [len(items) * cx // n_chunks for cx in range(n_chunks + 1)]
+        chunks = [list(range(lo, hi)) for lo, hi in zip(bounds, bounds[1:]) if hi > lo]
+    else:
+        chunks = balanced_chunks(sizes, n_chunks)
+
+    tasks = [(cx, [items[ix] for ix in chunk]) for cx, chunk in enumerate(chunks)]
+    out = [None] * len(items)
+    with tqdm(total=len(items), desc=desc, disable=desc is None) as progress:
+        def collect(done):
+            for cx, results in done:
+                for ix, result in zip(chunks[cx], results):
+                    out[ix] = result
+                progress.update(len(chunks[cx]))
+
+        if n_workers == 1:
+            collect(map(partial(_map_chunk, func), tasks))
+        else:
+            with Pool(min(n_workers, len(tasks))) as pool:
+                collect(pool.imap_unordered(partial(_map_chunk, func), tasks))
+
+    return out
@@ -1,5 +1,6 @@
 from .base import BaseReader
 from .base import ConvoReader
+from .base import redact_file
 from .chan import ChanReader
 from .facebook import RawFBReader
 from .reddit import BNCReader
@@ -8,7 +9,7 @@ from .twitter import QuoteReader
 from .twitter import ThreadsReader
 
 __all__ = [
-    'BaseReader', 'ConvoReader',
+    'BaseReader', 'ConvoReader', 'redact_file',
     'ChanReader',
     'RawFBReader',
     'RedditReader', 'BNCReader',
@@ -1,10 +1,138 @@
-import json
+import bz2
+import gzip
+import io
+import lzma
 from abc import ABC
 from abc import abstractmethod
 from glob import glob
 
+from ..codec import loads
 from ..convo import Conversation
 
+# Compressed file extensions that are transparently (and lazily) decompressed when reading
+COMPRESSED_EXTENSIONS = ('.gz', '.bz2', '.xz', '.zst')
+
+
+def open_file(path):
+    """
+    Opens a text file for streaming reads,
+    transparently decompressing `.gz`, `.bz2`, `.xz` and `.zst` files as they are read.
+
+    Parameters
+    ----------
+    path : str
+        The path to the (possibly compressed) file
+
+    Returns
+    -------
+    io.TextIOBase
+        A text file handle; iterating over it yields one line at a time
+
+    Raises
+    ------
+    ImportError
+        When reading a `.zst` file without the `zstandard` package installed
+    """
+    if path.endswith('.gz'):
+        return gzip.open(path, 'rt', encoding='utf-8')
+    elif path.endswith('.bz2'):
+        return bz2.open(path, 'rt', encoding='utf-8')
+    elif path.endswith('.xz'):
+        return lzma.open(path, 'rt', encoding='utf-8')
+    elif path.endswith('.zst'):
+        try:
+            import zstandard
+        except ImportError:
+            raise ImportError('Reading .zst files requires the `zstandard` package.')
+
+        # Pushshift dumps are compressed with long-distance matching, which needs a large window
+        dctx = zstandard.ZstdDecompressor(max_window_size=2 ** 31)
+        return io.TextIOWrapper(dctx.stream_reader(open(path, 'rb')), encoding='utf-8')
+
+    return open(path, encoding='utf-8')
+
+
+def write_file(path):
+    """
+    Opens a text file for streaming writes,
+    compressing `.gz`, `.bz2`, `.xz` and `.zst` files as they are written.
+
+    Parameters
+    ----------
+    path : str
+        The path to the (possibly compressed) file
+
+    Returns
+    -------
+    io.TextIOBase
+        A text file handle
+
+    Raises
+    ------
+    ImportError
+        When writing a `.zst` file without the `zstandard` package installed
+    """
+    if path.endswith('.gz'):
+        return gzip.open(path, 'wt', encoding='utf-8')
+    elif path.endswith('.bz2'):
+        return bz2.open(path, 'wt', encoding='utf-8')
+    elif path.endswith('.xz'):
+        return lzma.open(path, 'wt', encoding='utf-8')
+    elif path.endswith('.zst'):
+        try:
+            import zstandard
+        except ImportError:
+            raise ImportError('Writing .zst files requires the `zstandard` package.')
+
+        return io.TextIOWrapper(zstandard.ZstdCompressor().stream_writer(open(path, 'wb')), encoding='utf-8')
+
+    return open(path, 'w', encoding='utf-8')
+
+
+def load_json(path):
+    """
+    Reads and decodes a (possibly compressed) file holding a single JSON document.
+
+    Parameters
+    ----------
+    path : str
+        The path to the file
+
+    Returns
+    -------
+    object
+        The decoded JSON
+
+    Raises
+    ------
+    json.JSONDecodeError
+        If the file is not valid JSON
+    """
+    with open_file(path) as fp:
+        return loads(fp.read())
+
+
+def glob_files(path_pattern):
+    """
+    Returns the files matching `path_pattern`,
+    as well as their compressed counterparts (e.g., `path_pattern.gz`).
+
+    Parameters
+    ----------
+    path_pattern : str
+        A glob pattern
+
+    Returns
+    -------
+    list(str)
+        The matching paths
+    """
+    paths = glob(path_pattern)
+    for ext in COMPRESSED_EXTENSIONS:
+        paths.extend(glob(path_pattern + ext))
+
+    return list(dict.fromkeys(paths))
+
 
 class BaseReader(ABC):
 
@@ -82,14 +210,48 @@ class ConvoReader(BaseReader):
         ----------
         path_pattern : str
             The path to a directory containing Conversation data.
-            This path will be appended with the pattern `*.json`.
+            This path will be appended with the pattern `*.json`
+            (compressed `*.json.gz`, `*.json.bz2`, `*.json.xz` and `*.json.zst` files are read as well).
 
         Yields
         ------
         Conversation
             A conversation, read from disk.
         """
-        for f in glob(path_pattern + '*.json'):
-            with open(f) as fp:
-                for line in fp.readlines():
-                    yield Conversation.from_json(json.loads(line))
+        for f in glob_files(path_pattern + '*.json'):
+            with open_file(f) as fp:
+                for line in fp:
+                    yield Conversation.from_json(line)
+
+
+def redact_file(path, out_path, assign_ints=True):
+    """
+    Redacts user information from a shard of conversations (one JSON conversation per line, as read by `ConvoReader`),
+    as a stream: conversations are read, redacted (see `Conversation.redact`) and written one at a time.
+
+    Parameters
+    ----------
+    path : str
+        The path to the (possibly compressed) shard to redact
+    out_path : str
+        The path of the redacted shard (compressed according to its extension)
+    assign_ints : bool
+        If True, the users of each conversation are numbered (`USER<d+>`); otherwise, all become `USER`
+
+    Returns
+    -------
+    int
+        The number of conversations redacted
+    """
+    count = 0
+    with open_file(path) as fp, write_file(out_path) as out:
+        for line in fp:
+            if not line.strip():
+                continue
+
+            convo = Conversation.from_json(line)
+            convo.redact(assign_ints=assign_ints)
+            out.write(convo.to_json(serialize=True) + '\n')
+            count += 1
+
+    return count
@@ -1,11 +1,28 @@
-import json
+from functools import partial
 from glob import glob
 
-from tqdm import tqdm
-
 from ..convo import Conversation
+from ..convo import Segmenter
 from ..message import ChanPost
+from ..message.base import defer_language_detection
+from ..parallel import parallel_map
 from .base import BaseReader
+from .base import load_json
+
+
+def _read_chunk(paths, ld=True):
+    """
+    Parses the posts of one chunk of raw 4chan data into a (not yet segmented) Conversation fragment.
+    """
+    fragment = Conversation()
+    with defer_language_detection():
+        for f in paths:
+            for post in load_json(f).values():
+                px = ChanPost.parse_raw(post, lang_detect=ld)
+                if px:
+                    fragment.add_post(px)
+
+    return fragment
 
 
 class ChanReader(BaseReader):
@@ -33,7 +50,7 @@ class ChanReader(BaseReader):
         raise NotImplementedError
 
     @staticmethod
-    def iter_read(path_pattern, ld=True):
+    def iter_read(path_pattern, ld=True, n_workers=1, chunksize=1):
         """
         Function for iteratively reading an entire file/directory of conversations.
         Currently expects a `path_pattern` that points to a directory of JSON files
@@ -45,20 +62,19 @@ class ChanReader(BaseReader):
             The path to file or directory containing Conversation data
         ld : bool
             Whether or not language detection should be activated. (Default: True)
+        n_workers : int
+            The number of processes parsing chunks in parallel. Output is identical to the serial reading. (Default: 1)
+        chunksize : int
+            The number of chunks sent to a worker process at a time (Default: 1)
 
         Yields
         ------
         2-tuple(int, Conversation)
             A tuple containing which chunk (in 0..99) this Conversation originated from as well as a Conversation segment.
         """
-        for chunk in range(100):
-            print(f'Parsing chunk {chunk+1}/100...')
-
-            convo = Conversation()
-            for f in glob(path_pattern + f'{chunk:02d}.json'):
-                for post in tqdm(json.load(open(f)).values()):
-                    px = ChanPost.parse_raw(post, lang_detect=ld)
-                    if px:
-                        convo.add_post(px)
+        chunks = [glob(path_pattern + f'{chunk:02d}.json') for chunk in range(100)]
+        fragments = parallel_map(partial(_read_chunk, ld=ld), chunks, n_workers=n_workers, chunksize=chunksize)
+        for chunk, fragment in enumerate(fragments):
+            print(f'Parsed chunk {chunk+1}/100...')
 
-            yield chunk, convo.segment()
+            yield chunk, Segmenter(fragment.posts.values()).segments()
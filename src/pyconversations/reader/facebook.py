@@ -1,11 +1,76 @@
 import json
+from functools import partial
 from glob import glob
+from itertools import islice
 
 from tqdm import tqdm
 
 from ..convo import Conversation
+from ..convo import Segmenter
 from ..message import FBPost
+from ..message.base import defer_language_detection
+from ..parallel import parallel_map
 from .base import BaseReader
+from .base import load_json
+
+
+def _read_post_dir(task, ld=True):
+    """
+    Parses a post directory (`path_pattern/PAGE/POST/`), containing the post and its comments and replies,
+    into a (not yet segmented) Conversation fragment.
+    """
+    pagename, post_path = task
+    fragment = Conversation()
+
+    with defer_language_detection():
+        pid = post_path.split('/')[-1]
+
+        post_del = True
+        for f in glob(f'{post_path}/post*.json'):
+            try:
+                post = FBPost.parse_raw(load_json(f), post_type='post', in_reply_to=pagename, lang_detect=ld)
+
+                if not post:
+                    continue
+
+                pid = post.uid
+                fragment.add_post(post)
+                post_del = False
+            except json.JSONDecodeError:
+                continue
+
+        # if a post is deleted, let's just create a top-level mock post
+        # to keep comments centrally grouped...
+        if post_del:
+            post = FBPost(uid=pid, text='[deleted]', author=pagename, platform='Facebook', lang='en')
+            fragment.add_post(post)
+
+        for f in glob(f'{post_path}/*.json'):
+            if 'post' in f:
+                continue
+            elif 'comments' in f:
+                try:
+                    for x in FBPost.parse_raw(load_json(f), post_type='comments', in_reply_to=pid, lang_detect=ld):
+                        fragment.add_post(x)
+                except json.JSONDecodeError:
+                    continue
+            elif 'replies' in f:
+                try:
+                    for x in FBPost.parse_raw(load_json(f), post_type='replies', in_reply_to=pid, lang_detect=ld):
+                        fragment.add_post(x)
+                except json.JSONDecodeError:
+                    # File is corrupt, skip
+                    pass
+            elif 'attach' in f:
+                pass
+            elif 'react' in f:
+                pass
+            elif 'scrape' in f:
+                pass
+            else:
+                raise ValueError(f'RawFB::iter_read - Unrecognized file: {f}')
+
+    return fragment
 
 
 class RawFBReader(BaseReader):
@@ -31,7 +96,7 @@ class RawFBReader(BaseReader):
         raise NotImplementedError
 
     @staticmethod
-    def iter_read(path_pattern, ld=True):
+    def iter_read(path_pattern, ld=True, n_workers=1, chunksize=1):
         """
         Given a `path_pattern` that points to a directory containing raw FB data
         in the form of `path_pattern/PAGES/RAW_DATA.json`,
@@ -43,6 +108,11 @@ class RawFBReader(BaseReader):
             The path to file or directory containing Conversation data
         ld : bool
             Whether or not language detection should be activated. (Default: True)
+        n_workers : int
+            The number of processes parsing post directories in parallel.
+            Output is identical to the serial reading. (Default: 1)
+        chunksize : int
+            The number of post directories sent to a worker process at a time (Default: 1)
 
         Yields
         ------
@@ -60,54 +130,14 @@ class RawFBReader(BaseReader):
             pgname = f.split('/')[-2]
             pagenames.add(pgname)
 
-        for pagename in pagenames:
-            page = Conversation()
-            for post_path in tqdm(glob(path_pattern + f'{pagename}/*')):
-                pid = post_path.split('/')[-1]
-
-                post_del = True
-                for f in glob(f'{post_path}/post*.json'):
-                    try:
-                        post = FBPost.parse_raw(json.load(open(f)), post_type='post', in_reply_to=pagename, lang_detect=ld)
-
-                        if not post:
-                            continue
-
-                        pid = post.uid
-                        page.add_post(post)
-                        post_del = False
-                    except json.JSONDecodeError:
-                        continue
-
-                # if a post is deleted, let's just create a top-level mock post
-                # to keep comments centrally grouped...
-                if post_del:
-                    post = FBPost(uid=pid, text='[deleted]', author=pagename, platform='Facebook', lang='en')
-                    page.add_post(post)
-
-                for f in glob(f'{post_path}/*.json'):
-                    if 'post' in f:
-                        continue
-                    elif 'comments' in f:
-                        try:
-                            for x in FBPost.parse_raw(json.load(open(f)), post_type='comments', in_reply_to=pid, lang_detect=ld):
-                                page.add_post(x)
-                        except json.JSONDecodeError:
-                            continue
-                    elif 'replies' in f:
-                        try:
-                            for x in FBPost.parse_raw(json.load(open(f)), post_type='replies', in_reply_to=pid, lang_detect=ld):
-                                page.add_post(x)
-                        except json.JSONDecodeError:
-                            # File is corrupt, skip
-                            pass
-                    elif 'attach' in f:
-                        pass
-                    elif 'react' in f:
-                        pass
-                    elif 'scrape' in f:
-                        pass
-                    else:
-                        raise ValueError(f'RawFB::iter_read - Unrecognized file: {f}')
-
-            yield pagename, page.segment()
+        pages = [(pagename, glob(path_pattern + f'{pagename}/*')) for pagename in pagenames]
+        tasks = [(pagename, post_path) for pagename, post_paths in pages for post_path in post_paths]
+
+        # one pool serves every page; fragments come back in task order, so each page consumes its own
+        fragments = parallel_map(partial(_read_post_dir, ld=ld), tasks, n_workers=n_workers, chunksize=chunksize)
+        for pagename, post_paths in pages:
+            page = Segmenter()
+            for fragment in tqdm(islice(fragments, len(post_paths)), total=len(post_paths)):
+                page.update(fragment.posts.values())
+
+            yield pagename, page.segments()
@@ -1,12 +1,53 @@
 import json
 from datetime import datetime
-from glob import glob
+from functools import partial
 
 from tqdm import tqdm
 
+from ..codec import loads
 from ..convo import Conversation
+from ..convo import Segmenter
 from ..message import RedditPost
+from ..message.base import defer_language_detection
+from ..parallel import parallel_map
 from .base import BaseReader
+from .base import glob_files
+from .base import open_file
+
+
+def _read_file(f, ld=True, rd=False):
+    """
+    Parses a file of raw Reddit comments and submissions into a (not yet segmented) Conversation fragment.
+
+    Raises
+    ------
+    ValueError
+        If a line of a pre-processed (`rd`) file is not JSON, nor a run of concatenated JSON objects
+    """
+    fragment = Conversation()
+    with open_file(f) as fp, defer_language_detection():
+        for lx_ix, line in enumerate(fp):
+            if not rd:
+                for post in RedditPost.parse_raw(loads(line), lang_detect=ld):
+                    fragment.add_post(post)
+                continue
+
+            try:
+                data = loads(line)
+                fragment.add_post(RedditPost.parse_rd(data, lang_detect=ld))
+            except json.decoder.JSONDecodeError as err:
+                if '}{' in line:
+                    lxs = line.split('}{')
+                    lx0, lxs = lxs[0], lxs[1:]
+                    lx0 += '}'
+                    lxs = [lx0] + ['{' + lx for lx in lxs]
+
+                    for lx in lxs:
+                        fragment.add_post(RedditPost.parse_rd(loads(lx), lang_detect=ld))
+                else:
+                    raise ValueError(f'Unreadable line {lx_ix + 1} of {f}: {line[:100]!r}') from err
+
+    return fragment
 
 
 class RedditReader(BaseReader):
@@ -32,7 +73,7 @@ class RedditReader(BaseReader):
         raise NotImplementedError
 
     @staticmethod
-    def iter_read(path_pattern, ld=True, rd=False):
+    def iter_read(path_pattern, ld=True, rd=False, n_workers=1, chunksize=1):
         """
         This iterative reading function assumes that the path it will be pointed towards
         contains raw Reddit comments and submissions, sorted/chunked by the month they were created.
@@ -45,33 +86,23 @@ class RedditReader(BaseReader):
             Whether or not activate language detection (Default: True)
         rd : bool
             Whether to use the secondary Reddit parser (`RedditPost.parse_rd`) or not (`RedditPost.parse_raw`) (Default: False)
+        n_workers : int
+            The number of processes parsing monthly files in parallel. Output is identical to the serial reading. (Default: 1)
+        chunksize : int
+            The number of files sent to a worker process at a time (Default: 1)
 
         Yields
         ------
         list(Conversation)
             A chunk of Conversations, as parsed
         """
+        files = sorted(glob_files(f'{path_pattern}*.json'))
+        fragments = parallel_map(partial(_read_file, ld=ld, rd=rd), files, n_workers=n_workers, chunksize=chunksize)
+
         convo = Conversation()
-        for f in tqdm(sorted(glob(f'{path_pattern}*.json'))):
+        for f, fragment in tqdm(zip(files, fragments), total=len(files)):
             if rd:
-                with open(f) as fp:
-                    for line in fp.readlines():
-                        try:
-                            data = json.loads(line)
-                            convo.add_post(RedditPost.parse_rd(data, lang_detect=ld))
-                        except json.decoder.JSONDecodeError:
-                            if '}{' in line:
-                                lxs = line.split('}{')
-                                lx0, lxs = lxs[0], lxs[1:]
-                                lx0 += '}'
-                                lxs = [lx0] + ['{' + lx for lx in lxs]
-
-                                for lx in lxs:
-                                    convo.add_post(RedditPost.parse_rd(json.loads(lx), lang_detect=ld))
-                            else:
-                                print(line)
-                                import pdb
-                                pdb.set_trace()
+                convo |= fragment
 
                 date_str = f.split('/')[-1][:7]
                 dt = datetime.strptime(date_str, '%Y-%m')
@@ -89,15 +120,9 @@ class RedditReader(BaseReader):
                     out = out.segment()
                     yield out
             else:
-                convo = Conversation()
-                with open(f) as fp:
-                    for line in fp.readlines():
-                        convo.add_post(RedditPost.parse_raw(json.loads(line), lang_detect=ld))
+                yield Segmenter(fragment.posts.values()).segments()
 
-                segs = convo.segment()
-                yield segs
-
-        if rd and convo.messages:
+        if rd and convo.posts:
             segs = convo.segment()
             yield segs
 
@@ -132,17 +157,16 @@ class BNCReader(BaseReader):
         list(Conversation)
             A list of all parsed and segmented disjoint Conversations within this dataset
         """
-        convo = Conversation()
-        for f in tqdm(glob(path_pattern)):
-            with open(f) as fp:
-                for line in fp.readlines():
-                    raw = json.loads(line)
+        segmenter = Segmenter()
+        for f in tqdm(glob_files(path_pattern)):
+            with open_file(f) as fp, defer_language_detection():
+                for line in fp:
+                    raw = loads(line)
                     post = RedditPost.parse_raw(raw, lang_detect=ld)
                     post.add_tag('AH=1' if raw["violated_rule"] == 2 else 'AH=0')
-                    convo.add_post(post)
+                    segmenter.add_post(post)
 
-        segs = convo.segment()
-        return segs
+        return segmenter.segments()
 
     @staticmethod
     def iter_read(path_pattern, ld=True, rd=False):
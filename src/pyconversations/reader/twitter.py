@@ -1,11 +1,15 @@
-import json
 from glob import glob
 
 from tqdm import tqdm
 
-from ..convo import Conversation
+from ..codec import loads
+from ..convo import Segmenter
 from ..message import Tweet
+from ..message.base import defer_language_detection
 from .base import BaseReader
+from .base import glob_files
+from .base import load_json
+from .base import open_file
 
 
 class QuoteReader(BaseReader):
@@ -33,16 +37,16 @@ class QuoteReader(BaseReader):
         list(Conversation)
             A list of disjoint conversations
         """
-        convo = Conversation()
-        for f in sorted(glob(f'{path_pattern}*.json')):
+        segmenter = Segmenter()
+        for f in sorted(glob_files(f'{path_pattern}*.json')):
             print(f'Ingesting: {f}')
-            with open(f) as fp:
-                for line in tqdm(fp.readlines()):
-                    for x in Tweet.parse_raw(json.loads(line), lang_detect=ld):
-                        convo.add_post(x)
-            print(f'In-memory posts: {len(convo.posts)}')
+            with open_file(f) as fp, defer_language_detection():
+                for line in tqdm(fp):
+                    for x in Tweet.parse_raw(loads(line), lang_detect=ld):
+                        segmenter.add_post(x)
+            print(f'In-memory posts: {len(segmenter)}')
 
-        return convo.segment()
+        return segmenter.segments()
 
     @staticmethod
     def iter_read(path_pattern, ld=True):
@@ -106,12 +110,12 @@ class ThreadsReader(BaseReader):
             The string ID of the threaded discussion and a list of the disjoint Conversations identified within it
         """
         for f in sorted(glob(f'{path_pattern}*tweets.json')):
-            convo = Conversation()
+            segmenter = Segmenter()
             src = f.split('_')[-1].replace('-tweets.json', '')
-            tweets = json.load(open(f))
+            tweets = load_json(f)
             for tid, tweet in tweets.items():
                 xs = Tweet.parse_raw(tweet)
                 for x in xs:
-                    convo.add_post(x)
+                    segmenter.add_post(x)
 
-            yield src, convo.segment()
+            yield src, segmenter.segments()
@@ -0,0 +1,147 @@
+"""
+Redaction of terms (e.g., user names and mentions) from texts.
+
+All the terms of a redaction map are compiled into a single pattern, structured as a trie,
+so that each text is searched and rewritten once, whatever the number of terms.
+"""
+import math
+import re
+
+# the number of branches of a trie node above which they are grouped (see `trie_pattern`)
+TRIE_BUCKET = 16
+
+
+def trie_pattern(strings):
+    """
+    Returns a regex pattern matching any of `strings`, structured as a trie
+    (alternatives sharing a prefix are grouped under it).
+    At any position, the longest of the strings found there is matched,
+    as with an alternation of the strings sorted longest-first, without trying each string in turn.
+    Patterns of thousands of strings (e.g., emoji codes, redaction lists) search much faster this way.
+
+    Parameters
+    ----------
+    strings : iterable(str)
+        The (non-empty) strings to match
+
+    Returns
+    -------
+    str
+        The regex pattern
+    """
+    trie = {}
+    for string in strings:
+        node = trie
+        for ch in string:
+            node = node.setdefault(ch, {})
+        node[''] = None  # marks the end of a string
+
+    # positions that cannot start a match are skipped by a quick look at their character:
+    # a class of the first characters, with the astral planes as a separate range
+    # (classes holding astral characters are searched one item at a time)
+    firsts = [ch for ch in sorted(trie) if ch]
+    classes = []
+    if any(ord(ch) <= 0xFFFF for ch in firsts):
+        classes.append('[' + ''.join(re.escape(ch) for ch in firsts if ord(ch) <= 0xFFFF) + ']')
+    if any(ord(ch) > 0xFFFF for ch in firsts):
+        classes.append('[\\U00010000-\\U0010ffff]')
+
+    return '(?=' + '|'.join(classes) + ')' + _trie_node_pattern(trie)
+
+
+def _trie_node_pattern(node):
+    items = sorted((ch, child) for ch, child in node.items() if ch)
+    if not items:
+        return ''
+
+    if len(items) > TRIE_BUCKET:
+        # many branches are tried one after the other: they are split into buckets of consecutive characters,
+        # each guarded by the range of its characters
+        size = math.isqrt(len(items) - 1) + 1
+        buckets = [items[ix:ix + size] for ix in range(0, len(items), size)]
+        pattern = '(?:' + '|'.join(
+            '(?=[' + re.escape(bucket[0][0]) + '-' + re.escape(bucket[-1][0]) + '])' + _branches_pattern(bucket)
+            for bucket in buckets
+        ) + ')'
+    else:
+        pattern = _branches_pattern(items)
+
+    if '' in node:
+        # greedy: the longer strings through this node are tried first
+        return '(?:' + pattern + ')?'
+
+    return pattern
+
+
+def _branches_pattern(items):
+    # strings ending with one of these characters are matched by a class (of ranges of consecutive characters)
+    leaves = [ch for ch, child in items if list(child) == ['']]
+    branches = [re.escape(ch) + _trie_node_pattern(child) for ch, child in items if list(child) != ['']]
+
+    if len(leaves) > 1:
+        ranges = []
+        for ch in leaves:
+            if ranges and ord(ranges[-1][1]) + 1 == ord(ch):
+                ranges[-1][1] = ch
+            else:
+                ranges.append([ch, ch])
+        branches.append('[' + ''.join(
+            re.escape(lo) if lo == hi else re.escape(lo) + '-' + re.escape(hi) for lo, hi in ranges
+        ) + ']')
+    elif leaves:
+        branches.append(re.escape(leaves[0]))
+
+    return branches[0] if len(branches) == 1 else '(?:' + '|'.join(branches) + ')'
+
+
+class Redactor:
+
+    """
+    Replaces every occurrence of the terms of a redaction map with their replacement, in a single pass.
+    Terms are matched literally, the longest term found at a position first;
+    replacements are never searched for terms again.
+    """
+
+    def __init__(self, redact_map):
+        """
+        Compiles the pattern of the terms of `redact_map`.
+
+        Parameters
+        ----------
+        redact_map : dict(str, str)
+            The map of terms and what they should be replaced with (empty terms are ignored)
+        """
+        self._map = dict(redact_map)
+
+        terms = [term for term in self._map if term]
+        self._pattern = re.compile(trie_pattern(terms)) if terms else None
+
+    def __contains__(self, term):
+        return term in self._map
+
+    def __getitem__(self, term):
+        return self._map[term]
+
+    def __len__(self):
+        return len(self._map)
+
+    def _replace(self, match):
+        return self._map[match.group()]
+
+    def redact_text(self, text):
+        """
+        Redacts all the terms within `text`.
+
+        Parameters
+        ----------
+        text : str
+
+        Returns
+        -------
+        str
+            The redacted text (`text` itself, if it holds none of the terms)
+        """
+        if not text or self._pattern is None:
+            return text
+
+        return self._pattern.sub(self._replace, text)
@@ -34,3 +34,20 @@ class BaseTokenizer:
             Must be implemented in extensions
         """
         raise NotImplementedError
+
+    def tokenize_many(self, strs):
+        """
+        Splits a collection of strings into tokens.
+
+        Parameters
+        ----------
+        strs : iterable(str)
+            The strings to tokenize
+
+        Returns
+        -------
+        list(list(str))
+            A list of tokens for each string
+        """
+        tokenize = self.tokenize
+        return [tokenize(s) for s in strs]
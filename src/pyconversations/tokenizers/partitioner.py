@@ -1,9 +1,41 @@
 import pkgutil
 import re
+from functools import lru_cache
 
 from .base import BaseTokenizer
 
 
+@lru_cache(maxsize=None)
+def default_charset():
+    """
+    Loads the default Partitioner character set from `chars.txt` (once per process).
+
+    Returns
+    -------
+    str
+        The characters that may form a contiguous token
+    """
+    return pkgutil.get_data(__package__, 'chars.txt').decode('utf-8').strip().replace(" ", "")
+
+
+@lru_cache(maxsize=None)
+def compile_charset(charset):
+    """
+    Compiles the splitting pattern for a character set (once per distinct character set).
+
+    Parameters
+    ----------
+    charset : str
+        The characters that may form a contiguous token
+
+    Returns
+    -------
+    re.Pattern
+        The compiled pattern that captures maximal runs of token characters
+    """
+    return re.compile("([0-9" + charset + "'-]+)")
+
+
 class PartitionTokenizer(BaseTokenizer):
 
     """
@@ -21,7 +53,9 @@ class PartitionTokenizer(BaseTokenizer):
         self._charset = charset
 
         if self._charset is None:
-            self._charset = pkgutil.get_data(__package__, 'chars.txt').decode('utf-8').strip().replace(" ", "")
+            self._charset = default_charset()
+
+        self._pattern = compile_charset(self._charset)
 
     def tokenize(self, s):
         """
@@ -37,15 +71,19 @@ class PartitionTokenizer(BaseTokenizer):
         list(str)
             A list of tokens
         """
+        # Splitting on a capturing group alternates between text without any token characters (even positions)
+        # and maximal runs of token characters (odd positions),
+        # so the parity of a fragment tells us whether it is a token or a run of single-character tokens.
         tokens = []
-        for token in re.split("([0-9" + self._charset + "'-]+)", s):
-            if not self._space:
-                token = re.sub("[ ]+", "", token)
+        space = self._space
+        for ix, token in enumerate(self._pattern.split(s)):
+            if not space:
+                token = token.replace(' ', '')
 
             if not token:
                 continue
 
-            if re.search("[0-9" + self._charset + "'-]", token):
+            if ix & 1:
                 tokens.append(token)
             else:
                 tokens.extend(token)
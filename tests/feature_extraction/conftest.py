@@ -0,0 +1,27 @@
+import random
+
+import pytest
+
+from pyconversations.convo import Conversation
+from pyconversations.message import ChanPost
+
+
+@pytest.fixture
+def random_thread():
+    """
+    Returns a builder of random threads: conversations of `n` posts whose replies form a DAG,
+    each post replying to up to `max_parents` earlier posts (and sometimes to a post outside of the conversation),
+    with random texts drawn from `words`, if given.
+    """
+    def build(n, max_parents, seed, words=None):
+        rng = random.Random(seed)
+        convo = Conversation()
+        for ix in range(n):
+            parents = set(rng.sample(range(ix), min(ix, rng.randint(0, max_parents)))) if ix else set()
+            if rng.random() < 0.1:
+                parents.add(-1)  # replies to a post outside of the conversation
+            text = ' '.join(rng.choices(words[:rng.randint(1, len(words))], k=rng.randint(0, 8))) if words else ''
+            convo.add_post(ChanPost(uid=ix, text=text, reply_to=parents))
+        return convo
+
+    return build
@@ -0,0 +1,73 @@
+import warnings
+
+import numpy as np
+
+from pyconversations.feature_extraction.aggregate import STATS
+from pyconversations.feature_extraction.aggregate import group_by
+from pyconversations.feature_extraction.aggregate import group_starts
+from pyconversations.feature_extraction.aggregate import grouped_stats
+from pyconversations.feature_extraction.aggregate import grouped_sums
+from pyconversations.feature_extraction.aggregate import stats_dict
+from pyconversations.feature_extraction.aggregate import summarize
+
+NUMPY_STATS = {'min': np.nanmin, 'max': np.nanmax, 'mean': np.nanmean, 'median': np.median, 'std': np.nanstd}
+
+
+def test_grouped_stats_match_numpy():
+    rng = np.random.default_rng(0)
+    sizes = rng.integers(1, 8, size=200)
+    values = rng.normal(size=(sizes.sum(), 4))
+    values[rng.random(values.shape) < 0.1] = np.nan
+    values[:3, 0] = np.nan
+    values[:, 3] = rng.integers(0, 5, size=len(values))
+
+    starts = group_starts(sizes)
+    stats = grouped_stats(values, starts)
+
+    with warnings.catch_warnings():
+        warnings.simplefilter('ignore', RuntimeWarning)
+        for row, (start, size) in enumerate(zip(starts, sizes)):
+            for col in range(values.shape[1]):
+                for stat in STATS:
+                    expected = NUMPY_STATS[stat](values[start:start + size, col])
+                    np.testing.assert_allclose(stats[stat][row, col], expected, rtol=1e-12)
+
+    assert grouped_sums(values[:, 3:].astype(int), starts)[:, 0].tolist() == \
+        [int(values[s:s + n, 3].sum()) for s, n in zip(starts, sizes)]
+
+
+def test_stats_dict():
+    stats = grouped_stats(np.array([[1., 2.], [3., 4.], [5., 6.]]), group_starts([2, 1]))
+
+    out = stats_dict(stats, 0, ['a', 'b'], 'post')
+    assert list(out)[:5] == [f'post_{stat}_a' for stat in STATS]
+    assert out['post_mean_b'] == 3. and out['post_median_a'] == 2. and out['post_std_a'] == 1.
+
+    assert grouped_stats(np.zeros((0, 2)), group_starts([]))['min'].shape == (0, 2)
+
+
+def test_group_by():
+    keys, order, starts = group_by(['b', 'a', 'b', None, 'a', 'b'])
+    assert keys == ['b', 'a', None]
+    assert order.tolist() == [0, 2, 5, 1, 4, 3]
+    assert starts.tolist() == [0, 3, 5]
+
+    keys, order, starts = group_by([])
+    assert keys == [] and not len(order) and not len(starts)
+
+
+def test_summarize_matches_lists():
+    rows = [{'a': 1, 'b': 2.5}, {'a': 4, 'b': np.nan}, {'a': 0, 'b': 1.}]
+
+    out = summarize(rows, 'user', single_std=1)
+    assert list(out) == [f'user_{stat}_{k}' for k in 'ab' for stat in STATS]
+    with warnings.catch_warnings():
+        warnings.simplefilter('ignore', RuntimeWarning)
+        for k in 'ab':
+            vs = [row[k] for row in rows]
+            for stat in STATS:
+                np.testing.assert_allclose(out[f'user_{stat}_{k}'], NUMPY_STATS[stat](vs), rtol=1e-12)
+
+    assert summarize([{'a': 3}], 'user', single_std=1)['user_std_a'] == 1
+    assert summarize([{'a': 3}], 'user')['user_std_a'] == 0
+    assert summarize([], 'user') == {}
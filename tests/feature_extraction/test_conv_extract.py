@@ -1,9 +1,12 @@
+import warnings
 from datetime import datetime as dt
 
+import numpy as np
 import pytest
 
 from pyconversations.convo import Conversation
 from pyconversations.feature_extraction.conv import ConvoFeatures as CF
+from pyconversations.feature_extraction.conv import agg_convo_stats
 from pyconversations.feature_extraction.conv import duration
 from pyconversations.feature_extraction.conv import mixing_features
 from pyconversations.feature_extraction.conv import novelty_vector
@@ -12,6 +15,8 @@ from pyconversations.feature_extraction.conv import tree_degree
 from pyconversations.feature_extraction.conv import tree_depth
 from pyconversations.feature_extraction.conv import tree_width
 from pyconversations.feature_extraction.conv import type_frequency_distribution
+from pyconversations.feature_extraction.user_in_conv import UserInConvoFeatures as UiCF
+from pyconversations.feature_extraction.user_in_conv import agg_user_stats
 from pyconversations.message import Tweet
 
 
@@ -71,3 +76,42 @@ def test_tree_metrics(mock_convo):
     assert tree_degree(mock_convo) == 1
     assert tree_depth(mock_convo) == 1
     assert tree_width(mock_convo) == 1
+
+
+def listed_stats(rows, prefix):
+    # the per-feature lists of the previous implementation
+    agg = {}
+    for row in rows:
+        for k, v in row.items():
+            agg.setdefault(k, []).append(v)
+
+    out = {}
+    with warnings.catch_warnings():
+        warnings.simplefilter('ignore', RuntimeWarning)
+        for k, vs in agg.items():
+            out[f'{prefix}_min_{k}'] = float(np.nanmin(vs))
+            out[f'{prefix}_max_{k}'] = float(np.nanmax(vs))
+            out[f'{prefix}_mean_{k}'] = float(np.nanmean(vs))
+            out[f'{prefix}_median_{k}'] = float(np.median(vs))
+            out[f'{prefix}_std_{k}'] = float(np.nanstd(vs) if len(vs) > 1 else 1)
+
+    return out
+
+
+def test_agg_stats_match_lists(mock_convo):
+    other = Conversation(convo_id='OTHER')
+    for ix, author in enumerate(['a', 'b', 'a', 'c']):
+        other.add_post(Tweet(uid=ix, text=f'hello there number {ix}', author=author,
+                             reply_to={ix - 1} if ix else None, created_at=dt(2020, 1, 1, 0, ix)))
+
+    for convo in [mock_convo, other]:
+        out = agg_user_stats(convo)
+        expected = listed_stats([{**UiCF.floats(u, convo), **UiCF.ints(u, convo)} for u in convo.authors], 'user')
+        assert list(out) == list(expected)
+        np.testing.assert_allclose(list(out.values()), list(expected.values()), rtol=1e-9)
+
+    for convos in [[mock_convo], [mock_convo, other]]:
+        out = agg_convo_stats(convos)
+        expected = listed_stats([{**CF.floats(c), **CF.ints(c)} for c in convos], 'convo')
+        assert list(out) == list(expected)
+        np.testing.assert_allclose(list(out.values()), list(expected.values()), rtol=1e-9)
@@ -0,0 +1,54 @@
+import pytest
+
+from pyconversations.convo import Conversation
+from pyconversations.feature_extraction.entropy import EntropyEngine
+from pyconversations.feature_extraction.post_in_conv import _avg_token_entropy_all_splits
+from pyconversations.feature_extraction.post_in_conv import avg_token_entropy_all_splits
+from pyconversations.message import ChanPost
+
+WORDS = 'a b c d e f g h i j k l m n o p'.split()
+
+
+@pytest.mark.parametrize('max_parents', [1, 3])
+def test_all_splits_match_conversation_splits(random_thread, max_parents):
+    convo = random_thread(60, max_parents, seed=max_parents, words=WORDS)
+
+    for post in convo.posts.values():
+        expected = _avg_token_entropy_all_splits(post, convo)
+        out = avg_token_entropy_all_splits(post, convo)
+
+        assert list(out) == list(expected)
+        assert out == pytest.approx(expected)
+
+
+def test_splits_covering_the_conversation():
+    convo = Conversation()
+    for ix, text in enumerate(['a b', 'b c c', 'a d', 'e']):
+        convo.add_post(ChanPost(uid=ix, text=text, reply_to={ix - 1} if ix else None))
+
+    for post in convo.posts.values():
+        assert avg_token_entropy_all_splits(post, convo) == pytest.approx(_avg_token_entropy_all_splits(post, convo))
+
+    assert avg_token_entropy_all_splits(convo.posts[0], convo)['avg_token_entropy_descendants-full'] == 0
+
+
+def test_engine_counts(random_thread):
+    convo = random_thread(30, 2, seed=0, words=WORDS)
+    engine = EntropyEngine(convo)
+    names = {ix: tok for tok, ix in engine.vocab.items()}
+
+    def as_counter(counts):
+        return {names[ix]: c for ix, c in zip(*counts)}
+
+    assert as_counter(engine.full) == convo.type_counts
+    for uid, post in convo.posts.items():
+        assert as_counter(engine.counts([uid])) == post.type_counts
+
+
+def test_modified_post_falls_back(random_thread):
+    convo = random_thread(20, 2, seed=1, words=WORDS)
+    post = convo.posts[10]
+    avg_token_entropy_all_splits(post, convo)
+
+    post.text = 'z y x w'
+    assert avg_token_entropy_all_splits(post, convo) == pytest.approx(_avg_token_entropy_all_splits(post, convo))
@@ -8,6 +8,11 @@ from pyconversations.convo import Conversation
 from pyconversations.feature_extraction import ConversationVectorizer
 from pyconversations.feature_extraction import PostVectorizer
 from pyconversations.feature_extraction import UserVectorizer
+from pyconversations.feature_extraction.conv import ConvoFeatures
+from pyconversations.feature_extraction.post import PostFeatures
+from pyconversations.feature_extraction.post_in_conv import PostInConvoFeatures
+from pyconversations.feature_extraction.user_across_conv import UserAcrossConvoFeatures
+from pyconversations.feature_extraction.user_in_conv import UserInConvoFeatures
 from pyconversations.message import Tweet
 
 
@@ -181,3 +186,80 @@ def test_user_vec_fail():
 
     with pytest.raises(ValueError):
         UserVectorizer().transform(None)
+
+
+def test_schemas_match_features(mock_tweet, mock_convo):
+    computed = [
+        (PostFeatures, lambda f: f(mock_tweet)),
+        (PostInConvoFeatures, lambda f: f(mock_tweet, mock_convo)),
+        (UserInConvoFeatures, lambda f: f('apnews', mock_convo)),
+        (ConvoFeatures, lambda f: f(mock_convo)),
+        (UserAcrossConvoFeatures, lambda f: f('apnews', [mock_convo])),
+    ]
+    for features, of in computed:
+        schema = features.schema()
+        for kind in ['bools', 'floats', 'ints']:
+            assert list(of(getattr(features, kind))) == schema[kind]
+
+
+def test_fit_transform_matches_fit_then_transform(mock_tweet, mock_convo):
+    inputs = [
+        (PostVectorizer, [mock_tweet]), (PostVectorizer, [mock_convo]),
+        (ConversationVectorizer, [mock_convo]),
+        (UserVectorizer, mock_convo), (UserVectorizer, [mock_convo]),
+    ]
+    for cls, xs in inputs:
+        for norm in [None, 'minmax', 'mean', 'standard']:
+            v = cls(normalization=norm).fit(xs)
+            expected, expected_ids = v.transform(xs, include_ids=True)
+
+            out, ids = cls(normalization=norm).fit_transform(xs, include_ids=True)
+            np.testing.assert_array_equal(out, expected)
+            assert ids == expected_ids
+
+
+def test_cached_features_are_not_extended(mock_tweet, mock_convo):
+    from pyconversations.feature_extraction.cache import cache_clear
+
+    cache_clear()
+    posts = list(mock_convo.posts.values())
+    expected = PostVectorizer().fit_transform(posts)
+
+    # conversation passes nest (and extend) the features of posts, users and conversations in isolation
+    PostVectorizer().fit_transform([mock_convo])
+    ConversationVectorizer().fit_transform([mock_convo])
+    UserVectorizer().fit_transform([mock_convo])
+
+    out = PostVectorizer().fit_transform(posts)
+    assert out.shape == (2, len(PostFeatures.schema()['floats']) + len(PostFeatures.schema()['ints']) + 1)
+    np.testing.assert_array_equal(out, expected)
+    assert list(PostFeatures.floats(mock_tweet)) == PostFeatures.schema()['floats']
+
+
+def test_post_vec_bools_with_convs(mock_tweet, mock_convo):
+    v = PostVectorizer()
+    out, ids = v.fit_transform(mock_convo, include_ids=True)
+
+    row = out[ids[(mock_convo.convo_id, mock_tweet.uid)]]
+    bools = PostInConvoFeatures.bools(mock_tweet, mock_convo)
+    assert row[-len(bools):].tolist() == [1 if b else 0 for b in bools.values()]
+
+    floats = PostInConvoFeatures.floats(mock_tweet, mock_convo)
+    np.testing.assert_allclose(row[:len(floats)], list(floats.values()))
+
+
+def test_parallel_vectors_match_serial(mock_tweet, mock_convo):
+    other = Conversation(convo_id='OTHER')
+    for ix, author in enumerate(['a', 'b', 'a', 'apnews']):
+        other.add_post(Tweet(uid=ix, text=f'hello there number {ix}', author=author,
+                             reply_to={ix - 1} if ix else None, created_at=dt(2020, 1, 1, 0, ix)))
+
+    inputs = [
+        (PostVectorizer, list(other.posts.values())), (PostVectorizer, [mock_convo, other]),
+        (ConversationVectorizer, [mock_convo, other]), (UserVectorizer, [mock_convo, other]),
+    ]
+    for cls, xs in inputs:
+        expected, expected_ids = cls(normalization='standard').fit_transform(xs, include_ids=True)
+        out, ids = cls(normalization='standard', n_workers=2).fit_transform(xs, include_ids=True)
+        np.testing.assert_allclose(out, expected, rtol=1e-12)
+        assert ids == expected_ids
@@ -0,0 +1,192 @@
+import gc
+
+import pytest
+
+from pyconversations.convo import Conversation
+from pyconversations.feature_extraction import ConversationVectorizer
+from pyconversations.feature_extraction.cache import FEATURE_CACHE
+from pyconversations.feature_extraction.cache import FeatureCache
+from pyconversations.feature_extraction.cache import cached_feature
+from pyconversations.feature_extraction.conv import mixing_features
+from pyconversations.feature_extraction.conv import tree_depth
+from pyconversations.feature_extraction.post_in_conv import post_depth
+from pyconversations.feature_extraction.user_in_conv import get_user_posts
+from pyconversations.feature_extraction.user_in_conv import messages_per_user
+from pyconversations.message import Tweet
+
+CALLS = []
+
+
+@cached_feature
+def n_posts(conv, offset=0):
+    CALLS.append(conv)
+    return len(conv.posts) + offset
+
+
+@pytest.fixture(autouse=True)
+def clean_cache():
+    size = FEATURE_CACHE.cache_info()['maxsize']
+    FEATURE_CACHE.cache_clear()
+    CALLS.clear()
+    yield
+    FEATURE_CACHE.resize(size)
+    FEATURE_CACHE.cache_clear()
+
+
+@pytest.fixture
+def convo():
+    cx = Conversation(convo_id='TEST')
+    cx.add_post(Tweet(uid=0, text='root', author='a'))
+    cx.add_post(Tweet(uid=1, text='reply', author='b', reply_to={0}))
+    return cx
+
+
+def test_hits_and_argument_binding(convo):
+    assert n_posts(convo) == 2
+    assert n_posts(convo, 0) == 2
+    assert n_posts(conv=convo, offset=0) == 2
+    assert n_posts(convo, offset=1) == 3
+
+    assert len(CALLS) == 2
+    info = FEATURE_CACHE.cache_info()
+    assert info['hits'] == 2
+    assert info['misses'] == 2
+    assert info['currsize'] == 2
+    assert info['owners'] == 1
+
+
+def test_conversation_mutation_invalidates(convo):
+    assert tree_depth(convo) == 1
+    assert messages_per_user(convo) == {'a': 1, 'b': 1}
+
+    convo.add_post(Tweet(uid=2, text='reply to reply', author='b', reply_to={1}))
+    assert tree_depth(convo) == 2
+    assert messages_per_user(convo) == {'a': 1, 'b': 2}
+
+    convo.remove_post(2)
+    assert tree_depth(convo) == 1
+    assert FEATURE_CACHE.cache_info()['invalidations'] > 0
+
+
+def test_post_mutation_invalidates(convo):
+    post = convo.posts[1]
+    assert post_depth(post, convo) == 1
+
+    post.remove_reply_to(0)
+    assert post_depth(post, convo) == 0
+
+    version = post.version
+    post.text = 'edited'
+    post.add_tag('edited')
+    assert post.version == version + 2
+
+
+def test_post_edit_invalidates_conversation_features(convo):
+    before = mixing_features(convo)
+    n_posts(convo)
+
+    version = convo.version
+    convo.posts[0].text = 'the root post , now much longer than it was'
+    assert convo.version > version
+    assert mixing_features(convo) != before
+
+    n_posts(convo)
+    assert len(CALLS) == 2
+
+    # posts removed from a conversation no longer signal it
+    post = convo.posts[1]
+    convo.remove_post(1)
+    version = convo.version
+    post.text = 'detached'
+    assert convo.version == version
+
+
+def test_redaction_invalidates():
+    convo = Conversation(convo_id='TEST')
+    convo.add_post(Tweet(uid=0, text='hi @bob', author='alice'))
+    convo.add_post(Tweet(uid=1, text='@alice hello', author='bob', reply_to={0}))
+
+    assert messages_per_user(convo) == {'alice': 1, 'bob': 1}
+    assert list(get_user_posts('alice', convo).posts) == [0]
+    n_posts(convo)
+
+    convo.redact()
+    assert messages_per_user(convo) == {'USER0': 1, 'USER1': 1}
+    assert list(get_user_posts('alice', convo).posts) == []
+
+    # every pass counts, even one that changes nothing
+    version = convo.version
+    convo.redact()
+    assert convo.version > version
+    n_posts(convo)
+    assert len(CALLS) == 2
+
+
+def test_owners_are_not_kept_alive(convo):
+    n_posts(convo)
+    n_posts(Conversation(posts={0: Tweet(uid=0)}))
+    CALLS.clear()
+    gc.collect()
+
+    info = FEATURE_CACHE.cache_info()
+    assert info['owners'] == 1
+    assert info['currsize'] == 1
+
+
+def test_eviction():
+    cache = FeatureCache(maxsize=2)
+    convs = [Conversation(posts={ix: Tweet(uid=ix)}) for ix in range(3)]
+
+    def f(c):
+        return c.convo_id
+
+    for conv in convs:
+        cache.call(f, 'f', (conv,))
+    assert cache.cache_info()['evictions'] == 1
+    assert cache.cache_info()['currsize'] == 2
+    assert cache.cache_info()['owners'] == 2
+
+    cache.resize(0)
+    assert cache.cache_info()['currsize'] == 0
+    assert cache.cache_info()['owners'] == 0
+
+    # disabled caching passes calls through
+    assert cache.call(f, 'f', (convs[0],)) == convs[0].convo_id
+    assert cache.cache_info()['currsize'] == 0
+
+
+def test_values_and_unhashable_arguments():
+    cache = FeatureCache()
+    assert cache.call(len, 'len', ('keyed by value',)) == 14
+    assert cache.call(len, 'len', ('keyed by value',)) == 14
+    assert cache.cache_info()['hits'] == 1
+    assert cache.cache_info()['owners'] == 0
+
+    # passed through
+    assert cache.call(len, 'len', ([1, 2],)) == 2
+    assert cache.cache_info()['currsize'] == 1
+
+
+def test_values_are_dropped_with_any_owner(convo):
+    split = Conversation(posts=dict(convo.posts))
+    cache = FeatureCache()
+    cache.call(lambda a, b: len(a.posts) + len(b.posts), 'f', (convo, split))
+    assert cache.cache_info()['owners'] == 2
+
+    del split
+    gc.collect()
+    assert cache.cache_info()['currsize'] == 0
+    assert cache.cache_info()['owners'] == 0
+
+
+def test_vectorizer_cache_control(convo):
+    vec = ConversationVectorizer(cache_size=10)
+    vec.fit_transform([convo])
+
+    info = vec.cache_info()
+    assert info['maxsize'] == 10
+    assert info['currsize'] <= 10
+    assert info['hits'] > 0
+
+    vec.cache_clear()
+    assert vec.cache_info()['currsize'] == 0
@@ -0,0 +1,137 @@
+import random
+from collections import Counter
+
+import numpy as np
+import pytest
+
+from pyconversations.feature_extraction.harmonic import K1_BOUNDS
+from pyconversations.feature_extraction.harmonic import MixingCache
+from pyconversations.feature_extraction.harmonic import NLL_simple
+from pyconversations.feature_extraction.harmonic import _fit_group
+from pyconversations.feature_extraction.harmonic import _mixing_params
+from pyconversations.feature_extraction.harmonic import fit_k1
+from pyconversations.feature_extraction.harmonic import frequency_profile
+from pyconversations.feature_extraction.harmonic import mixing_batch
+from pyconversations.feature_extraction.harmonic import novelty
+from pyconversations.feature_extraction.harmonic import novelty_batch
+from pyconversations.feature_extraction.harmonic import params_simple
+from pyconversations.feature_extraction.harmonic import profile_arrays
+from pyconversations.feature_extraction.harmonic import rebound
+
+
+def random_frequencies(n, seed):
+    rng = random.Random(seed)
+    out = []
+    for _ in range(n):
+        size = rng.choice([1, 2, 3, 5, 8, 20, 75])
+        skew = rng.random()
+        out.append(Counter({f'w{ix}': max(1, int(rng.paretovariate(1.2))) if rng.random() < skew else 1
+                            for ix in range(size)}))
+    return out
+
+
+def single_k1(profile):
+    # the profile fitted alone (see `params_simple`)
+    fs, srs = profile_arrays(profile)
+    return float(params_simple(fs, srs, len(fs) / sum(fs)))
+
+
+def test_profile():
+    freq = Counter({'a': 3, 'b': 1, 'c': 3, 'd': 2, 'e': 1})
+    assert frequency_profile(freq) == ((3, 2), (2, 1), (1, 2))
+
+    fs, srs = profile_arrays(frequency_profile(freq))
+    assert fs.tolist() == [3, 3, 2, 1, 1]
+    assert srs.tolist() == [2, 2, 3, 5, 5]
+
+
+def test_batch_fit_matches_single_fits():
+    profiles = list(dict.fromkeys(frequency_profile(f) for f in random_frequencies(400, seed=0)))
+    profiles += [((1, n),) for n in range(1, 300, 3)]
+
+    assert fit_k1(profiles) == [single_k1(p) for p in profiles]
+
+
+def test_fit_agrees_with_scipy():
+    from scipy.optimize import minimize
+
+    # the Nelder-Mead steps are those of scipy: fits agree within the tolerance of their stopping rule
+    profiles = list(dict.fromkeys(frequency_profile(f) for f in random_frequencies(100, seed=3)))
+    for profile in profiles:
+        fs, srs = profile_arrays(profile)
+        res = minimize(NLL_simple, x0=len(fs) / sum(fs), method='Nelder-Mead', tol=1e-1,
+                       options={'maxiter': 999}, args=(fs, srs, [K1_BOUNDS]))
+        assert single_k1(profile) == pytest.approx(rebound(res.x, [K1_BOUNDS])[0], abs=1e-1)
+
+
+@pytest.mark.parametrize('n', [2, 5, 13, 40])
+def test_group_fit_matches_nelder_mead(n):
+    # random profiles of `n` types, fitted together, and each alone (see `params_simple`)
+    rng = random.Random(n)
+    profiles = []
+    for _ in range(60):
+        freqs = sorted((max(1, int(rng.paretovariate(rng.uniform(0.5, 3)))) for _ in range(n)), reverse=True)
+        profiles.append(frequency_profile(Counter(dict(enumerate(freqs)))))
+
+    fs, srs = map(np.array, zip(*map(profile_arrays, profiles)))
+    assert _fit_group(fs, srs).tolist() == [single_k1(p) for p in profiles]
+
+
+def test_mixing_batch_matches_fit():
+    frequencies = random_frequencies(200, seed=1)
+    expected = [_mixing_params(*profile_arrays(frequency_profile(f)), single_k1(frequency_profile(f)))
+                for f in frequencies]
+
+    assert mixing_batch(frequencies) == expected
+
+
+def test_cache():
+    cache = MixingCache(maxsize=2)
+    a, b = Counter({'x': 2, 'y': 1}), Counter({'u': 1, 'v': 2})
+
+    res = cache.get(a)
+    res['k1'] = None  # results are copies
+    assert cache.get(b) == cache.get(a) != res
+    assert cache.cache_info() == {'hits': 2, 'misses': 1, 'maxsize': 2, 'currsize': 1}
+
+    cache.get_batch([Counter('abc'), Counter('aab'), Counter('abcd')])
+    assert cache.cache_info()['currsize'] == 2
+
+    with pytest.raises(ValueError):
+        cache.get(Counter())
+
+
+def reference_novelty(frequency):
+    # the previous implementation, looping over distinct frequencies
+    ws, fs = map(np.array, zip(*frequency.most_common()))
+    rs = np.arange(1, len(ws) + 1)
+
+    nums = Counter(fs)
+    fsum = fs.cumsum()
+    mn = (fsum / fs)
+
+    srs = {s: (min(rs[fs == s]), max(rs[fs == s])) for s in nums}
+    As1 = np.ones(len(fs))
+    As2 = np.ones(len(fs))
+    for f in sorted(nums, reverse=True)[1:]:
+        f_high = fs[srs[f][0] - 2]
+        f_low = fs[srs[f][1] - 1]
+        mn_high = np.max(mn[fs == f_high])
+        mn_low = np.max(mn[fs == f_low])
+        As1[fs == f] = 1 + np.mean(np.log10(f_high / f_low) / np.log10([mn_high / mn_low]))
+        As2[fs == f] = nums[f] / np.array([mn_low - mn_high])
+    return 2 / (1 / As1 + 1 / As2)
+
+
+def test_novelty_matches_reference():
+    frequencies = random_frequencies(300, seed=2) + [Counter('a'), Counter('aab'), Counter('abc')]
+    expected = [reference_novelty(f) for f in frequencies]
+
+    for frequency, exp in zip(frequencies, expected):
+        assert np.array_equal(novelty(frequency), exp)
+
+    assert all(np.array_equal(out, exp) for out, exp in zip(novelty_batch(frequencies), expected))
+    assert novelty_batch([]) == []
+
+    with pytest.raises(ValueError):
+        novelty(Counter())
@@ -0,0 +1,94 @@
+import random
+import re
+
+import demoji
+import pytest
+
+from pyconversations.feature_extraction.lexical import find_emojis
+from pyconversations.feature_extraction.lexical import scan_text
+from pyconversations.feature_extraction.lexical import scan_texts
+from pyconversations.feature_extraction.post import PostFeatures
+from pyconversations.feature_extraction.regex import HASHTAG_REGEX
+from pyconversations.feature_extraction.regex import URL_REGEX
+from pyconversations.message import ChanPost
+from pyconversations.message import RedditPost
+from pyconversations.message import Tweet
+
+PIECES = [
+    'word', 'Word', 'WORD', ' ', ' ', ' ', '?', '!', ',', '.', ';', "'", '"', '#', '@', '/u/', 'u/', '>>', '123', '_',
+    '#tag', '#Tag2', '@user_1', 'x@y', 'u/someone', '>>4567', 'https://t.co/AbC?x=1#frag', 'ftp://a.b/c!', '://',
+    '😂', '👍🏽', '🇺🇸', '🇺', '👨‍👩‍👧', '‍', '❤️', '❤', '1️⃣', '#️⃣', '️', '©', 'é', '—',
+]
+
+
+def random_texts(n, seed):
+    rng = random.Random(seed)
+    return [''.join(rng.choices(PIECES, k=rng.randint(0, 30))) for _ in range(n)]
+
+
+def previous_stats(text, mention_regex):
+    def get_all(pattern):
+        return [x.group() for x in re.finditer(pattern, text)]
+
+    emojis = demoji.findall_list(text, desc=False)
+    hashtags = get_all(HASHTAG_REGEX)
+    mentions = [] if mention_regex is None else get_all(mention_regex)
+    urls = get_all(URL_REGEX)
+    return {
+        'char_count':      len(text),
+        '?_count':         len(get_all(r'[?]')),
+        '!_count':         len(get_all(r'[!]')),
+        'punct_count':     len(get_all(r'[,.?!;\'"]')),
+        'uppercase_count': len(get_all(r'[A-Z]')),
+        'emoji_count':     len(emojis),
+        'hashtag_count':   len(hashtags),
+        'mention_count':   len(mentions),
+        'url_count':       len(urls),
+        'emojis':          emojis,
+        'hashtags':        hashtags,
+        'mentions':        mentions,
+        'urls':            urls,
+    }
+
+
+def test_emojis_match_demoji():
+    for text in random_texts(300, seed=0):
+        assert find_emojis(text) == demoji.findall_list(text, desc=False)
+
+
+def test_emojis_without_demoji_codes(monkeypatch):
+    from pyconversations.feature_extraction import lexical
+
+    # (a version of demoji that does not expose its codes)
+    monkeypatch.delattr(demoji, '_CODE_TO_DESC')
+    monkeypatch.setattr(lexical, '_emoji_pattern', None)
+    for text in random_texts(50, seed=3):
+        assert find_emojis(text) == demoji.findall_list(text, desc=False)
+    assert lexical.emoji_pattern() is None
+
+
+@pytest.mark.parametrize('cls', [Tweet, RedditPost, ChanPost])
+def test_scan_matches_previous_passes(cls):
+    for text in random_texts(300, seed=1):
+        assert scan_text(text, cls.MENTION_REGEX) == previous_stats(text, cls.MENTION_REGEX)
+
+
+def test_batch():
+    texts = random_texts(50, seed=2)
+    texts += texts[:10]
+
+    out = scan_texts(texts, Tweet.MENTION_REGEX)
+    assert out == [scan_text(text, Tweet.MENTION_REGEX) for text in texts]
+    assert out[0] is out[50]
+
+
+def test_post_features():
+    post = Tweet(uid=0, text='Hey @you, see https://t.co/X?a=1 #News! 😂 Why?')
+    ints = PostFeatures.ints(post)
+    strs = PostFeatures.strs(post)
+
+    assert ints['token_count'] == len(post.tokens)
+    assert ints['type_count'] == len(post.type_counts)
+    assert (ints['?_count'], ints['!_count'], ints['punct_count'], ints['uppercase_count']) == (2, 1, 5, 4)
+    assert strs['emojis'] == ['😂'] and strs['hashtags'] == ['#News'] and strs['urls'] == ['https://t.co/X?a=1']
+    assert ints['mention_count'] == len(strs['mentions']) == 1
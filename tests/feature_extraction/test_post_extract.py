@@ -7,6 +7,7 @@ from pyconversations.feature_extraction.post import mentions
 from pyconversations.feature_extraction.post import mixing_features
 from pyconversations.feature_extraction.post import novelty_vector
 from pyconversations.feature_extraction.post import out_degree
+from pyconversations.feature_extraction.post import prefetch_chunks
 from pyconversations.feature_extraction.post import type_frequency_distribution
 from pyconversations.feature_extraction.post import urls
 from pyconversations.message import Tweet
@@ -83,3 +84,28 @@ def test_type_check_extractors(mock_tweet):
         assert type(v) == list
         for x in v:
             assert type(x) == str
+
+
+def test_prefetch_chunks(monkeypatch):
+    from pyconversations.feature_extraction.cache import cache_clear
+    from pyconversations.feature_extraction.harmonic import MIXING_CACHE
+    from pyconversations.feature_extraction.harmonic import frequency_profile
+
+    posts = [Tweet(uid=ix, text=' '.join(f'w{jx % (ix + 1)}' for jx in range(2 * ix + 2))) for ix in range(10)]
+    profiles = {frequency_profile(post.type_counts) for post in posts}
+    assert len(profiles) > 4
+
+    cache_clear()
+    MIXING_CACHE.cache_clear()
+    monkeypatch.setattr(MIXING_CACHE, '_maxsize', 4)
+
+    # the features of each chunk are read before the next one is fitted: no profile is evicted before it is read
+    for chunk in prefetch_chunks(posts):
+        assert len(chunk) <= 4
+        for post in chunk:
+            mixing_features(post)
+    assert MIXING_CACHE.cache_info()['misses'] == len(profiles)
+
+    # containers are not split: those holding more posts than the cache holds profiles come alone
+    groups = [posts[:1], posts[1:3], posts[3:5], posts[5:]]
+    assert list(prefetch_chunks(groups, posts_of=list)) == [groups[:2], groups[2:3], groups[3:]]
@@ -1,14 +1,21 @@
+import random
+import warnings
 from datetime import datetime as dt
 
+import numpy as np
 import pytest
 
 from pyconversations.convo import Conversation
 from pyconversations.feature_extraction.post_in_conv import PostInConvoFeatures as PiCF
+from pyconversations.feature_extraction.post_in_conv import agg_post_stats
+from pyconversations.feature_extraction.post_in_conv import agg_post_stats_
 from pyconversations.feature_extraction.post_in_conv import avg_token_entropy_all_splits
 from pyconversations.feature_extraction.post_in_conv import post_depth
+from pyconversations.feature_extraction.post_in_conv import post_feature_matrix
 from pyconversations.feature_extraction.post_in_conv import post_reply_time
 from pyconversations.feature_extraction.post_in_conv import post_to_source
 from pyconversations.feature_extraction.post_in_conv import post_width
+from pyconversations.feature_extraction.post_in_conv import user_post_stats
 from pyconversations.message import Tweet
 
 
@@ -63,3 +70,71 @@ def test_time(mock_tweet, mock_convo):
 def test_entropy_existence(mock_tweet, mock_convo):
     for v in avg_token_entropy_all_splits(mock_tweet, mock_convo).values():
         assert type(v) == float
+
+
+def listed_post_stats(convos, filter_by=None):
+    # the per-feature lists of the previous implementation
+    agg = {}
+    for convo in convos:
+        for p in convo.posts.values():
+            if filter_by is None or filter_by(p):
+                for k, v in {**PiCF.floats(p, convo), **PiCF.ints(p, convo)}.items():
+                    agg.setdefault(k, []).append(v)
+
+    out = {}
+    with warnings.catch_warnings():
+        warnings.simplefilter('ignore', RuntimeWarning)
+        for k, vs in agg.items():
+            for stat, f in [('min', np.nanmin), ('max', np.nanmax), ('mean', np.nanmean),
+                            ('median', np.median), ('std', np.nanstd)]:
+                out[f'post_{stat}_{k}'] = float(f(vs))
+
+    return out
+
+
+def assert_stats_equal(out, expected):
+    assert list(out) == list(expected)
+    np.testing.assert_allclose(list(out.values()), list(expected.values()), rtol=1e-9)
+
+
+def test_post_feature_matrix(mock_tweet, mock_convo):
+    matrix = post_feature_matrix(mock_convo)
+    assert matrix.uids == list(mock_convo.posts)
+    assert post_feature_matrix(mock_convo) is matrix
+
+    row = matrix.values[matrix.index[mock_tweet.uid]]
+    expected = {**PiCF.floats(mock_tweet, mock_convo), **PiCF.ints(mock_tweet, mock_convo)}
+    assert matrix.keys == list(expected)
+    np.testing.assert_allclose(row, list(expected.values()))
+
+    # posts modified in place are featurized again
+    mock_tweet.text = 'hello'
+    assert post_feature_matrix(mock_convo) is not matrix
+    assert post_feature_matrix(mock_convo).values[0, matrix.keys.index('char_count')] == 5
+
+
+def test_agg_post_stats_match_lists():
+    rng = random.Random(0)
+    words = [f'w{ix}' for ix in range(30)]
+    convos = []
+    for cx in range(5):
+        convo = Conversation(convo_id=cx)
+        for ix in range(rng.randint(1, 12)):
+            convo.add_post(Tweet(uid=(cx, ix), text=' '.join(rng.choices(words, k=rng.randint(1, 8))),
+                                 author=f'user{rng.randrange(4)}', reply_to={(cx, rng.randrange(ix))} if ix else None,
+                                 created_at=dt(2020, 1, 1, cx, ix)))
+        convos.append(convo)
+
+    assert_stats_equal(agg_post_stats_(convos), listed_post_stats(convos))
+    assert_stats_equal(agg_post_stats(convos[0]), listed_post_stats(convos[:1]))
+
+    def by_user0(p):
+        return p.author == 'user0'
+    assert_stats_equal(agg_post_stats_(convos, filter_by=by_user0), listed_post_stats(convos, filter_by=by_user0))
+    assert agg_post_stats_(convos, filter_by=lambda p: False) == {}
+
+    for convo in convos:
+        stats = user_post_stats(convo)
+        assert list(stats) == list(convo.posts_by_author) and set(stats) == convo.authors
+        for user in convo.authors:
+            assert_stats_equal(stats[user], listed_post_stats([convo], filter_by=lambda p: p.author == user))
@@ -0,0 +1,101 @@
+from collections import Counter
+
+import pytest
+
+from pyconversations.convo import Conversation
+from pyconversations.feature_extraction.conv import degree_in_size_distribution
+from pyconversations.feature_extraction.conv import degree_out_size_distribution
+from pyconversations.feature_extraction.conv import degree_size_distribution
+from pyconversations.feature_extraction.conv import tree_depth
+from pyconversations.feature_extraction.post_in_conv import depth_dist
+from pyconversations.feature_extraction.post_in_conv import in_degrees_by_uid
+from pyconversations.feature_extraction.post_in_conv import post_depth
+from pyconversations.feature_extraction.post_in_conv import post_in_degree
+from pyconversations.feature_extraction.post_in_conv import post_subtree_size
+from pyconversations.feature_extraction.post_in_conv import post_width
+from pyconversations.feature_extraction.post_in_conv import tree_features
+from pyconversations.feature_extraction.tree import TreeMetrics
+from pyconversations.message import ChanPost
+
+
+def reference_depth(uid, convo, memo):
+    if uid not in memo:
+        depths = [reference_depth(rid, convo, memo) for rid in convo.posts[uid].reply_to if rid in convo.posts]
+        memo[uid] = 1 + max(depths) if depths else 0
+    return memo[uid]
+
+
+@pytest.mark.parametrize('max_parents', [1, 3])
+def test_metrics_match_definitions(random_thread, max_parents):
+    convo = random_thread(300, max_parents, seed=max_parents)
+    metrics = TreeMetrics(convo)
+
+    memo = {}
+    depths = {uid: reference_depth(uid, convo, memo) for uid in convo.posts}
+    assert depth_dist(convo) == Counter(depths.values())
+
+    for uid, post in convo.posts.items():
+        ix = metrics.index[uid]
+        replies = [p for p in convo.posts.values() if uid in p.reply_to]
+
+        assert post_depth(post, convo) == depths[uid]
+        assert post_width(post, convo) == Counter(depths.values())[depths[uid]]
+        assert post_in_degree(post, convo) == len(replies) == in_degrees_by_uid(convo)[uid]
+        assert metrics.out_degree[ix] == len(post.reply_to)
+        assert post_subtree_size(post, convo) == 1 + len(convo.get_descendants(uid).posts)
+        assert tree_features(post, convo) == {
+            'degree': depths[uid], 'in_degree': len(replies), 'depth': depths[uid], 'width': post_width(post, convo)
+        }
+
+    assert degree_size_distribution(convo) == Counter((metrics.in_degree + metrics.out_degree).tolist())
+    assert degree_in_size_distribution(convo) == Counter(metrics.in_degree.tolist())
+    assert degree_out_size_distribution(convo) == Counter(len(p.reply_to) for p in convo.posts.values())
+
+
+def test_subtree_sizes_by_blocks(random_thread, monkeypatch):
+    from pyconversations.feature_extraction import tree
+
+    convo = random_thread(200, 3, seed=0)
+    convo.add_post(ChanPost(uid=200, reply_to={199, 201}))
+    convo.add_post(ChanPost(uid=201, reply_to={200}))  # (a reply cycle)
+    expected = TreeMetrics(convo).subtree_size.tolist()
+    assert expected[0] > 1
+
+    monkeypatch.setattr(tree, 'SUBTREE_BLOCK', 7)
+    assert TreeMetrics(convo).subtree_size.tolist() == expected
+
+
+def test_deep_thread():
+    convo = Conversation()
+    for ix in range(20_000):
+        convo.add_post(ChanPost(uid=ix, reply_to={ix - 1} if ix else None))
+
+    assert tree_depth(convo) == 19_999
+    assert post_subtree_size(convo.posts[0], convo) == 20_000
+
+
+def test_posts_outside_of_the_conversation(random_thread):
+    convo = random_thread(20, 1, seed=0)
+    outsider = ChanPost(uid='x', reply_to={3, 5})
+    depth = 1 + max(post_depth(convo.posts[3], convo), post_depth(convo.posts[5], convo))
+    assert post_depth(outsider, convo) == depth
+    assert post_in_degree(outsider, convo) == 0
+    assert tree_features(outsider, convo) == {
+        'degree': depth, 'in_degree': 0, 'depth': depth, 'width': depth_dist(convo)[depth]
+    }
+
+
+def test_reply_cycles():
+    convo = Conversation()
+    convo.add_post(ChanPost(uid=0))
+    convo.add_post(ChanPost(uid=1, reply_to={0, 2}))
+    convo.add_post(ChanPost(uid=2, reply_to={1}))
+
+    metrics = TreeMetrics(convo)
+    assert metrics.depth.tolist() == [0, 1, 0]
+    assert metrics.in_degree.tolist() == [1, 1, 1]
+
+
+def test_empty_conversation():
+    metrics = TreeMetrics(Conversation())
+    assert len(metrics.depth) == len(metrics.width) == len(metrics.subtree_size) == 0
@@ -0,0 +1,76 @@
+import random
+from datetime import datetime
+from datetime import timedelta
+
+import numpy as np
+import pytest
+
+from pyconversations.convo import Conversation
+from pyconversations.feature_extraction.corpus import CorpusIndex
+from pyconversations.feature_extraction.post_in_conv import agg_post_stats_
+from pyconversations.feature_extraction.user_across_conv import UserAcrossConvoFeatures as UaCF
+from pyconversations.feature_extraction.user_across_conv import across_convo_features
+from pyconversations.feature_extraction.user_across_conv import gather_all_user_posts_in_convo
+from pyconversations.feature_extraction.user_across_conv import sum_user_booleans_across_convos
+from pyconversations.feature_extraction.user_across_conv import sum_user_ints_across_convos
+from pyconversations.feature_extraction.user_in_conv import mixing_features
+from pyconversations.message import Tweet
+
+
+def random_corpus(n, seed):
+    rng = random.Random(seed)
+    words = 'the a cat dog runs fast #tag @bob ! ? Why'.split()
+    users = [f'u{ix}' for ix in range(12)]
+    convos = []
+    uid = 0
+    for cx in range(n):
+        convo = Conversation(convo_id=f'c{cx}')
+        start = datetime(2020, 1, 1) + timedelta(days=cx)
+        for ix in range(rng.randint(1, 12)):
+            convo.add_post(Tweet(uid=uid, text=' '.join(rng.choices(words, k=rng.randint(0, 8))), author=rng.choice(users),
+                                 reply_to={uid - rng.randint(1, ix)} if ix else None,
+                                 created_at=start + timedelta(minutes=ix)))
+            uid += 1
+        convos.append(convo)
+
+    return convos
+
+
+def scanned_features(user, convos):
+    # the features of a user, by scans of the whole corpus
+    ints = sum_user_ints_across_convos(user, convos)
+    ints.update(sum_user_booleans_across_convos(user, convos))
+    floats = mixing_features(user, gather_all_user_posts_in_convo(user, convos))
+    floats.update(agg_post_stats_(convos, filter_by=lambda p: p.author == user))
+    return ints, floats
+
+
+def test_index():
+    convos = random_corpus(10, seed=0)
+    index = CorpusIndex(convos)
+
+    assert len(index) == len(index.users) == len({p.author for c in convos for p in c.posts.values()})
+    for user in index.users:
+        posts = [(p, c) for c in convos for p in c.posts.values() if p.author == user]
+        assert index.posts(user) == posts
+
+    assert 'nobody' not in index and index.postings('nobody') == []
+
+
+def test_features_match_scans():
+    convos = random_corpus(40, seed=1)
+    index = CorpusIndex(convos)
+
+    for user, (ints, floats) in zip(index.users, across_convo_features(index)):
+        exp_ints, exp_floats = scanned_features(user, convos)
+        assert ints == exp_ints and list(ints) == list(exp_ints)
+        assert list(floats) == list(exp_floats)
+        assert floats == pytest.approx(exp_floats, rel=1e-9, nan_ok=True)
+
+    user = index.users[3]
+    assert UaCF.ints(user, convos) == across_convo_features(index, users=[user])[0][0]
+    assert UaCF.floats(user, index) == pytest.approx(scanned_features(user, convos)[1], rel=1e-9, nan_ok=True)
+
+    # users without posts
+    assert across_convo_features(index, users=['nobody']) == [({}, mixing_features('nobody', Conversation()))]
+    assert np.all(np.array(list(UaCF.floats('nobody', convos).values())) == 0)
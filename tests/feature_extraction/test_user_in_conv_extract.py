@@ -4,9 +4,16 @@ from datetime import datetime as dt
 import pytest
 
 from pyconversations.convo import Conversation
+from pyconversations.feature_extraction.post_in_conv import PostInConvoFeatures as PiCF
 from pyconversations.feature_extraction.user_in_conv import UserInConvoFeatures as UiCF
+from pyconversations.feature_extraction.user_in_conv import get_user_posts
+from pyconversations.feature_extraction.user_in_conv import is_source_author
+from pyconversations.feature_extraction.user_in_conv import iter_over_users
+from pyconversations.feature_extraction.user_in_conv import messages_per_user
 from pyconversations.feature_extraction.user_in_conv import mixing_features
 from pyconversations.feature_extraction.user_in_conv import novelty_vector
+from pyconversations.feature_extraction.user_in_conv import sum_post_bools_by_user
+from pyconversations.feature_extraction.user_in_conv import sum_post_ints_by_user
 from pyconversations.feature_extraction.user_in_conv import type_frequency_distribution
 from pyconversations.message import Tweet
 
@@ -59,3 +66,34 @@ def test_harmonic_feature_existence(mock_tweet, mock_convo):
 def test_none_user(mock_convo):
     freq = type_frequency_distribution(None, mock_convo)
     assert freq == Counter()
+
+
+def test_user_features_match_scans():
+    import random
+
+    rng = random.Random(0)
+    convo = Conversation(convo_id='users')
+    for uid in range(60):
+        convo.add_post(Tweet(uid=uid, text='@a words #b ' * rng.randint(0, 2), author=rng.choice('abcde'),
+                             reply_to={rng.randrange(uid)} if uid and rng.random() < 0.8 else None,
+                             created_at=dt(2020, 1, 1, 0, uid)))
+    convo.remove_post(5)
+
+    authors = [p.author for p in convo.posts.values()]
+    sources = {convo.posts[uid].author for uid in convo.get_sources()}
+    assert list(iter_over_users(convo)) == list(dict.fromkeys(authors))
+    assert messages_per_user(convo) == Counter(authors)
+
+    for user in 'abcdez':
+        posts = [p for p in convo.posts.values() if p.author == user]
+        assert is_source_author(user, convo) == (user in sources)
+        assert list(get_user_posts(user, convo).posts.values()) == posts
+
+        ints = Counter()
+        for p in posts:
+            ints.update({k: v for k, v in PiCF.ints(p, convo).items() if k not in {'type_count', 'depth', 'width'}})
+        assert sum_post_ints_by_user(user, convo) == ints
+        bools = Counter()
+        for p in posts:
+            bools.update({k.replace('is_', '') + '_count': int(v) for k, v in PiCF.bools(p, convo).items()})
+        assert sum_post_bools_by_user(user, convo) == bools
@@ -9,3 +9,9 @@ def test_base_lang_detection():
     assert type(conf) == float
     assert pred == 'und'
     assert conf == 0.0
+
+
+def test_base_lang_detection_batch():
+    det = BaseLangDetect()
+    assert det.get_batch(['test text', 'more text']) == [('und', 0.0), ('und', 0.0)]
+    assert det.get_batch([]) == []
@@ -0,0 +1,61 @@
+from pyconversations.ld import BaseLangDetect
+from pyconversations.ld import CachedLangDetect
+
+
+class CountingLangDetect(BaseLangDetect):
+
+    def __init__(self):
+        self.calls = []
+
+    def get(self, text):
+        self.calls.append([text])
+        return ('en', 0.9) if 'english' in text else ('und', 0.1)
+
+    def get_batch(self, texts):
+        self.calls.append(list(texts))
+        return [('en', 0.9) if 'english' in text else ('und', 0.1) for text in texts]
+
+
+def test_cache_get():
+    inner = CountingLangDetect()
+    det = CachedLangDetect(inner)
+
+    assert det.get('some english') == ('en', 0.9)
+    assert det.get('some english') == ('en', 0.9)
+    assert det.get('[deleted]') == ('und', 0.1)
+    assert inner.calls == [['some english'], ['[deleted]']]
+    assert det.cache_info() == {'hits': 1, 'misses': 2, 'maxsize': 2 ** 16, 'currsize': 2}
+
+
+def test_cache_batch_dedupes():
+    inner = CountingLangDetect()
+    det = CachedLangDetect(inner)
+    det.get('[removed]')
+
+    texts = ['[deleted]', 'english one', '[deleted]', '[removed]', 'english one']
+    assert det.get_batch(texts) == [inner.get_batch([t])[0] for t in texts]
+    assert inner.calls[1] == ['[deleted]', 'english one']
+    assert det.cache_info()['hits'] == 3
+
+    # everything is cached now
+    det.get_batch(texts)
+    assert len(inner.calls) == 2 + len(texts)
+
+
+def test_cache_eviction():
+    inner = CountingLangDetect()
+    det = CachedLangDetect(inner, maxsize=2)
+
+    det.get('a')
+    det.get('b')
+    det.get('a')  # `b` is now the least recently used
+    det.get('c')
+    assert det.cache_info()['currsize'] == 2
+
+    inner.calls.clear()
+    det.get('a')
+    det.get('b')
+    assert inner.calls == [['b']]
+
+    det.cache_clear()
+    assert det.cache_info() == {'hits': 0, 'misses': 0, 'maxsize': 2, 'currsize': 0}
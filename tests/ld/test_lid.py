@@ -0,0 +1,40 @@
+import pytest
+
+from pyconversations.ld import LangidLangDetect
+
+
+@pytest.fixture(scope='module')
+def detector():
+    return LangidLangDetect()
+
+
+def test_get(detector):
+    lang, conf = detector.get('This is a sentence written in plain English.')
+    assert lang == 'en'
+    assert 0.5 < conf <= 1.0
+
+
+def test_get_batch_matches_get(detector):
+    texts = [
+        'This is a sentence written in plain English.',
+        'Der schnelle braune Fuchs springt über den faulen Hund.',
+        'Le renard brun rapide saute par-dessus le chien paresseux.',
+        'こんにちは世界',
+        'Привет, мир!',
+        '[deleted]',
+        'lol',
+        '',
+    ]
+    batch = detector.get_batch(texts)
+    assert len(batch) == len(texts)
+    for text, (lang, conf) in zip(texts, batch):
+        exp_lang, exp_conf = detector.get(text)
+        assert lang == exp_lang
+        assert conf == pytest.approx(exp_conf)
+
+
+def test_get_batch_chunks(detector, monkeypatch):
+    monkeypatch.setattr(LangidLangDetect, 'BATCH_SIZE', 3)
+    texts = [f'message number {ix} of the thread' for ix in range(10)]
+    assert detector.get_batch(texts) == [detector.get(text) for text in texts]
+    assert detector.get_batch([]) == []
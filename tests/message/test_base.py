@@ -24,3 +24,162 @@ def test_init_tokenizer():
 
     t = Tweet(uid=0, tokenizer=lambda s: [s])
     assert type(t._tok) == LambdaTokenizer
+
+
+def test_shared_tokenizer():
+    from pyconversations.message import Tweet
+    from pyconversations.message.base import get_tokenizer
+
+    a = Tweet(uid=0)
+    b = Tweet(uid=1)
+    assert a._tok is b._tok
+    assert a._tok is get_tokenizer('partitioner')
+
+    c = Tweet(uid=2, tokenizer='default')
+    assert c._tok is get_tokenizer('default')
+    assert c._tok is not a._tok
+
+
+def test_token_cache():
+    from pyconversations.message import Tweet
+
+    t = Tweet(uid=0, text='a b a')
+    assert t.tokens == ['a', ' ', 'b', ' ', 'a']
+    assert t.type_counts == {'a': 2, ' ': 2, 'b': 1}
+    assert t.type_counts is t.type_counts
+
+    # modifying the returned list does not corrupt the cache
+    t.tokens.append('c')
+    assert t.tokens == ['a', ' ', 'b', ' ', 'a']
+
+    t.text = 'c'
+    assert t.tokens == ['c']
+    assert t.type_counts == {'c': 1}
+
+    t.redact({'c': 'USER0'})
+    assert t.tokens == ['USER0']
+
+    t |= Tweet(uid=0, text='much longer')
+    assert t.type_counts == {'much': 1, ' ': 1, 'longer': 1}
+
+
+def test_token_cache_opt_out():
+    from pyconversations.message import Tweet
+
+    Tweet.CACHE_TOKENS = False
+    try:
+        t = Tweet(uid=0, text='a b')
+        assert t.tokens == ['a', ' ', 'b']
+        assert t.type_counts == {'a': 1, ' ': 1, 'b': 1}
+        assert t._tokens is None
+        assert t._type_counts is None
+    finally:
+        del Tweet.CACHE_TOKENS
+
+
+def test_deferred_language_detection(monkeypatch):
+    from pyconversations.ld import BaseLangDetect
+    from pyconversations.message import Tweet
+    from pyconversations.message import base
+    from pyconversations.message.base import defer_language_detection
+
+    class FakeLangDetect(BaseLangDetect):
+        def __init__(self):
+            self.batches = []
+
+        def get(self, text):
+            return ('en', 0.9) if 'english' in text else ('und', 0.1)
+
+        def get_batch(self, texts):
+            self.batches.append(list(texts))
+            return super().get_batch(texts)
+
+    det = FakeLangDetect()
+    monkeypatch.setattr(base, 'DETECTOR', det)
+
+    def build():
+        a = Tweet(uid=0, text='some english', lang_detect=True)
+        b = Tweet(uid=1, text='???', lang_detect=True)
+        c = Tweet(uid=2, text='???', lang_detect=True)
+        c.text = 'now english'
+        d = Tweet(uid=3, text='given', lang='fr', lang_detect=True)
+        a |= Tweet(uid=0, text='merged, but not english either', lang='de')
+        return a, b, c, d
+
+    eager = [x.lang for x in build()]
+    assert eager == ['en', 'und', 'en', 'fr']
+    assert det.batches == []
+
+    with defer_language_detection():
+        with defer_language_detection():
+            a = Tweet(uid=0, text='some english', lang_detect=True)
+        assert a.lang is None
+
+        deferred = build()
+        assert [x.lang for x in deferred] == ['de', None, None, 'fr']
+
+    assert a.lang == 'en'
+    assert [x.lang for x in deferred] == eager
+    assert det.batches == [['some english', 'some english', '???', 'now english']]
+
+
+def test_compact_representation():
+    from datetime import datetime
+    from datetime import timezone
+
+    from pyconversations.message import RedditPost
+    from pyconversations.message import Tweet
+
+    post = Tweet(uid=0, text='text', created_at=datetime(2020, 12, 1, 10, 5, 5))
+    assert not hasattr(post, '__dict__')
+    assert not hasattr(RedditPost(uid=0), '__dict__')
+
+    # creation times are held as timestamps
+    assert post.timestamp == datetime(2020, 12, 1, 10, 5, 5).timestamp()
+    assert post.created_at == datetime(2020, 12, 1, 10, 5, 5)
+    assert Tweet(uid=0).timestamp is None
+
+    # ... and given back as they were given
+    assert type(Tweet(uid=0, created_at=9999999.0).created_at) == float
+    assert Tweet(uid=0, created_at=9999999.0).created_at == Tweet(uid=0, created_at=9999999.0).timestamp == 9999999.0
+    assert Tweet(uid=0, created_at=9999999).created_at == 9999999
+
+    # ... unless the datetime would not survive the round trip
+    aware = datetime(2020, 12, 1, 10, 5, 5, tzinfo=timezone.utc)
+    assert Tweet(uid=0, created_at=aware).created_at == aware
+    assert Tweet(uid=0, created_at=aware).timestamp == aware.timestamp()
+
+    # empty collections are only allocated when asked for
+    assert post._reply_to is None and post._tags is None and post._reply_ids == ()
+    assert post.reply_to == set() and post.tags == set()
+    assert post.reply_to is post.reply_to
+
+    post = Tweet(uid=2, reply_to={0, 1}, tags={'a'})
+    assert post._reply_ids is post.reply_to == {0, 1}
+    assert post._tag_ids is post.tags == {'a'}
+
+
+def test_reply_to_and_tags_updates():
+    from pyconversations.message import Tweet
+
+    post = Tweet(uid=0, reply_to=[1, 1, 2])
+    assert post.reply_to == {1, 2}
+
+    post.add_reply_to(3)
+    post.add_reply_to(3)
+    post.remove_reply_to(1)
+    assert post.reply_to == {2, 3}
+
+    with pytest.raises(KeyError):
+        post.remove_reply_to(1)
+
+    post.add_tag('a')
+    post |= Tweet(uid=0, reply_to={4}, tags={'a', 'b'})
+    assert post.reply_to == {2, 3, 4}
+    assert post.tags == {'a', 'b'}
+
+    post.remove_tag('a')
+    post.remove_tag('b')
+    assert post.tags == set()
+    with pytest.raises(KeyError):
+        post.remove_tag('b')
@@ -9,3 +9,61 @@ def test_abstract():
 
     with pytest.raises(NotImplementedError):
         BaseReader.iter_read('')
+
+
+@pytest.mark.parametrize('ext', ['', '.gz', '.bz2', '.xz'])
+def test_convo_reader_streams_compressed(tmp_path, ext):
+    import bz2
+    import gzip
+    import json
+    import lzma
+
+    from pyconversations.convo import Conversation
+    from pyconversations.message import Tweet
+    from pyconversations.reader import ConvoReader
+
+    lines = []
+    for ix in range(5):
+        convo = Conversation()
+        convo.add_post(Tweet(uid=2 * ix, text=f'source {ix}'))
+        convo.add_post(Tweet(uid=2 * ix + 1, text=f'reply {ix}', reply_to={2 * ix}))
+        lines.append(json.dumps(convo.to_json()))
+
+    opener = {'': open, '.gz': gzip.open, '.bz2': bz2.open, '.xz': lzma.open}[ext]
+    with opener(str(tmp_path / f'convos.json{ext}'), 'wt') as fp:
+        fp.write('\n'.join(lines))
+
+    convos = list(ConvoReader.iter_read(str(tmp_path) + '/'))
+    assert len(convos) == 5
+    assert all(len(c.posts) == 2 for c in convos)
+    assert {c.posts[1].text for c in convos if 1 in c.posts} == {'reply 0'}
+
+
+@pytest.mark.parametrize('ext', ['', '.gz'])
+def test_redact_file(tmp_path, ext):
+    from pyconversations.convo import Conversation
+    from pyconversations.message import Tweet
+    from pyconversations.reader import ConvoReader
+    from pyconversations.reader import redact_file
+
+    convos = []
+    for ix in range(3):
+        convo = Conversation()
+        convo.add_post(Tweet(uid=2 * ix, text=f'hi @bob{ix}', author=f'al.ce{ix}'))
+        convo.add_post(Tweet(uid=2 * ix + 1, text=f'@al.ce{ix} hello', author=f'bob{ix}', reply_to={2 * ix}))
+        convos.append(convo)
+
+    with open(tmp_path / 'convos.json', 'w') as fp:
+        fp.write('\n'.join(c.to_json(serialize=True) for c in convos) + '\n\n')
+
+    assert redact_file(str(tmp_path / 'convos.json'), str(tmp_path / f'redacted.json{ext}')) == 3
+
+    for convo in convos:
+        convo.redact()
+
+    redacted = list(ConvoReader.iter_read(str(tmp_path / 'redacted')))
+    assert [c.to_json() for c in redacted] == [c.to_json() for c in convos]
+    # (users are numbered in the order their mentions are found in)
+    source, reply = redacted[0].posts[0], redacted[0].posts[1]
+    assert reply.text == f'@{source.author} hello' and source.text == f'hi @{reply.author}'
+    assert {source.author, reply.author} == {'USER0', 'USER1'}
@@ -0,0 +1,84 @@
+import json
+
+import pytest
+
+from pyconversations.reader import ChanReader
+from pyconversations.reader import RawFBReader
+from pyconversations.reader import RedditReader
+
+
+def as_json(chunks):
+    return [[convo.to_json() for convo in segments] for segments in chunks]
+
+
+@pytest.fixture
+def chan_dir(tmp_path):
+    for chunk in range(3):
+        posts = {}
+        for ix in range(20):
+            no = chunk * 100 + ix + 1
+            resto = no - ix % 5 if ix % 5 else 0
+            posts[str(no)] = {'no': no, 'resto': resto, 'com': f'post {no}', 'time': 1_600_000_000 + no, 'name': 'Anon'}
+        (tmp_path / f'{chunk:02d}.json').write_text(json.dumps(posts))
+    return str(tmp_path) + '/'
+
+
+@pytest.fixture(params=[False, True])
+def rd(request):
+    return request.param
+
+
+@pytest.fixture
+def reddit_dir(tmp_path, rd):
+    # the same comment appears in two monthly files, so fragments must be merged in order
+    for month in range(1, 5):
+        lines = [{'id': f's{month}', 'title': f'submission {month}', 'selftext': '', 'author': 'op',
+                  'created_utc': 1_500_000_000 + month, 'subreddit': 'test', 'type': 'submission'}]
+        for ix in range(6):
+            lines.append({'id': f'c{month}_{ix}', 'parent_id': f't1_c{month}_{ix - 1}' if ix else f't3_s{month}',
+                          'body': f'comment {ix}' + '!' * (month % 2), 'author': f'u{ix}',
+                          'created_utc': 1_500_000_100 + ix, 'subreddit': 'test', 'type': 'comment'})
+        lines.append({'id': 'c1_0', 'parent_id': 't3_s1', 'body': f'edited in month {month}', 'author': 'u0',
+                      'created_utc': 1_500_000_000, 'subreddit': 'test', 'type': 'comment'})
+        if not rd:
+            # the default parser does not expect the `type` key of the secondary format
+            for line in lines:
+                del line['type']
+        (tmp_path / f'2020-{month:02d}_test.json').write_text('\n'.join(map(json.dumps, lines)))
+    return str(tmp_path) + '/'
+
+
+@pytest.fixture
+def fb_dir(tmp_path):
+    for page in ['pageA', 'pageB']:
+        for ix in range(4):
+            pdir = tmp_path / page / f'{page}_{ix}'
+            pdir.mkdir(parents=True)
+            if ix != 3:
+                (pdir / 'post.json').write_text(json.dumps({'id': f'{page}_{ix}', 'message': f'Post {ix} of {page}'}))
+            comments = [{'id': f'{page}_{ix}_c{jx}', 'message': f'comment {jx}', 'userID': f'u{jx}'} for jx in range(3)]
+            (pdir / 'comments.json').write_text(json.dumps({'data': comments}))
+            replies = [{'id': f'{page}_{ix}_r', 'message': 'reply', 'userID': 'u9'}]
+            (pdir / 'replies.json').write_text(json.dumps(replies))
+    return str(tmp_path) + '/'
+
+
+def test_chan_parallel(chan_dir):
+    serial = as_json(segs for _, segs in ChanReader.iter_read(chan_dir, ld=False))
+    assert sum(len(segs) for segs in serial) == 12
+    assert serial == as_json(segs for _, segs in ChanReader.iter_read(chan_dir, ld=False, n_workers=2, chunksize=5))
+
+
+def test_reddit_parallel(reddit_dir, rd):
+    serial = as_json(RedditReader.iter_read(reddit_dir, ld=False, rd=rd))
+    assert serial
+    assert serial == as_json(RedditReader.iter_read(reddit_dir, ld=False, rd=rd, n_workers=3))
+
+
+def test_facebook_parallel(fb_dir):
+    serial = {page: as_json([segs])[0] for page, segs in RawFBReader.iter_read(fb_dir, ld=False)}
+    assert set(serial) == {'pageA', 'pageB'}
+    assert all(len(segs) == 4 for segs in serial.values())
+
+    parallel = {page: as_json([segs])[0] for page, segs in RawFBReader.iter_read(fb_dir, ld=False, n_workers=2)}
+    assert serial == parallel
@@ -0,0 +1,11 @@
+import pytest
+
+
+def test_unreadable_line_raises(tmp_path):
+    from pyconversations.reader.reddit import _read_file
+
+    path = tmp_path / 'RC_2020-01.json'
+    path.write_text('{"id": "a", "type": "comment"\n')
+
+    with pytest.raises(ValueError, match='line 1'):
+        _read_file(str(path), ld=False, rd=True)
@@ -0,0 +1,72 @@
+import json
+import math
+from datetime import datetime
+
+import pytest
+
+from pyconversations import codec
+from pyconversations.convo import Conversation
+from pyconversations.message import Tweet
+
+
+@pytest.fixture(params=codec.available_backends())
+def backend(request):
+    prev = codec.get_backend()
+    codec.set_backend(request.param)
+    yield request.param
+    codec.set_backend(prev)
+
+
+@pytest.fixture
+def mock_convo():
+    convo = Conversation()
+    convo.add_post(Tweet(uid=123456789101112131415, text='Root tweet text 😀', author='a', created_at=datetime(2020, 1, 1, 12, 30)))
+    convo.add_post(Tweet(uid=2, text='reply', author='b', reply_to={123456789101112131415}, tags={'t'}, lang='en'))
+    return convo
+
+
+def test_default_backend():
+    assert codec.get_backend() == codec.available_backends()[0]
+
+
+def test_unknown_backend():
+    with pytest.raises(KeyError):
+        codec.set_backend('pickle')
+
+
+def test_roundtrip_matches_stdlib(backend):
+    obj = [{'uid': 2 ** 70, 'text': 'é "quoted"\n', 'created_at': 1.5, 'reply_to': [], 'lang': None}, -2 ** 65]
+    assert codec.loads(codec.dumps(obj)) == obj
+    assert codec.loads(json.dumps(obj)) == obj
+    assert json.loads(codec.dumps(obj)) == obj
+
+
+def test_non_finite_and_sets_match_stdlib(backend):
+    obj = {'nan': float('nan'), 'inf': [float('inf'), -float('inf')], 'x': (1.5, None)}
+    assert codec.dumps(obj) == json.dumps(obj)
+
+    out = codec.loads(codec.dumps(obj))
+    assert math.isnan(out['nan']) and out['inf'] == [math.inf, -math.inf] and out['x'] == [1.5, None]
+
+    with pytest.raises(TypeError):
+        codec.dumps({'tags': {'a', 'b'}})
+
+
+def test_invalid_json_raises_stdlib_error(backend):
+    with pytest.raises(json.JSONDecodeError):
+        codec.loads('{"uid": ')
+
+
+def test_convo_serialize_roundtrip(backend, mock_convo):
+    line = mock_convo.to_json(serialize=True)
+    assert '\n' not in line
+    assert json.loads(line) == mock_convo.to_json()
+
+    convo = Conversation.from_json(line)
+    assert convo.to_json() == mock_convo.to_json()
+    assert convo.posts[123456789101112131415].text == 'Root tweet text 😀'
+
+
+def test_message_serialize_roundtrip(backend, mock_convo):
+    post = mock_convo.posts[2]
+    assert Tweet.from_json(post.to_json(serialize=True)).to_json() == post.to_json()
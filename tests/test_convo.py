@@ -1,3 +1,5 @@
+from collections import Counter
+
 import pytest
 
 from pyconversations.convo import Conversation
@@ -307,3 +309,359 @@ def test_get_descendants(mock_temporal_convo):
             assert ids == set()
         else:
             assert ids == set()
+
+
+def test_relations_after_mutation(mock_temporal_convo):
+    # build the indices, then mutate the conversation
+    assert set(mock_temporal_convo.get_children(0).posts) == {1, 2}
+    assert set(mock_temporal_convo.get_descendants(0).posts) == {1, 2, 3}
+
+    mock_temporal_convo.add_post(Tweet(uid=4, text='@tweet 4', reply_to={3}))
+    assert set(mock_temporal_convo.get_children(3).posts) == {4}
+    assert set(mock_temporal_convo.get_descendants(0).posts) == {1, 2, 3, 4}
+    assert set(mock_temporal_convo.get_ancestors(4).posts) == {0, 1, 3}
+
+    mock_temporal_convo.remove_post(2)
+    assert set(mock_temporal_convo.get_children(0).posts) == {1}
+    assert set(mock_temporal_convo.get_siblings(1, include_post=True).posts) == {1}
+
+    # merging a post with new reply edges updates the index
+    mock_temporal_convo.add_post(Tweet(uid=4, reply_to={0}))
+    assert set(mock_temporal_convo.get_children(0).posts) == {1, 4}
+    assert set(mock_temporal_convo.get_parents(4).posts) == {0, 3}
+
+    # as does a post replying to another in place
+    mock_temporal_convo.posts[3].add_reply_to(0)
+    assert set(mock_temporal_convo.get_children(0).posts) == {1, 3, 4}
+
+
+def test_deep_relations():
+    convo = Conversation()
+    for ix in range(5000):
+        convo.add_post(Tweet(uid=ix, reply_to={ix - 1} if ix else None))
+
+    assert len(convo.get_ancestors(4999).posts) == 4999
+    assert len(convo.get_descendants(0).posts) == 4999
+
+
+def test_segmenter_matches_graph_components():
+    import random
+
+    import networkx as nx
+
+    from pyconversations.convo import Segmenter
+
+    rng = random.Random(0)
+    posts = []
+    for ix in range(300):
+        # replies to earlier posts, later posts, and posts that never arrive
+        reps = {rng.randint(-20, 320) for _ in range(rng.randint(0, 2))}
+        posts.append(Tweet(uid=ix, reply_to=reps))
+
+    convo = Conversation()
+    for p in posts:
+        convo.add_post(p)
+    expected = {frozenset(c) for c in nx.connected_components(convo.as_graph())}
+
+    assert {frozenset(s.posts) for s in convo.segment()} == expected
+
+    # streaming arrival order does not matter
+    rng.shuffle(posts)
+    segmenter = Segmenter()
+    for p in posts:
+        segmenter.add_post(p)
+    assert len(segmenter) == 300
+    assert {frozenset(s.posts) for s in segmenter.segments()} == expected
+
+
+def test_segmenter_incremental():
+    from pyconversations.convo import Segmenter
+
+    segmenter = Segmenter([Tweet(uid=1, reply_to={0}), Tweet(uid=2, reply_to={0})])
+    assert len(segmenter.segments()) == 2
+
+    # the shared parent arrives later, joining both replies
+    segmenter.add_post(Tweet(uid=0))
+    segs = segmenter.segments()
+    assert len(segs) == 1
+    assert set(segs[0].posts) == {0, 1, 2}
+
+    # duplicate UIDs merge into the existing post
+    segmenter.add_post(Tweet(uid=3))
+    segmenter.add_post(Tweet(uid=3, reply_to={2}))
+    assert len(segmenter) == 4
+    assert len(segmenter.segments()) == 1
+
+
+def recount(convo):
+    cnt = Counter()
+    for post in convo.posts.values():
+        cnt.update(post.type_counts)
+    return cnt
+
+
+def test_type_counts_are_kept_up_to_date(mock_temporal_convo):
+    convo = mock_temporal_convo
+    assert convo.type_counts == recount(convo)
+
+    convo.add_post(Tweet(uid='new', text='a brand new post', reply_to={0}))
+    assert convo.type_counts == recount(convo)
+
+    # merging a longer text into an existing post
+    convo.add_post(Tweet(uid='new', text='a brand new post with more words'))
+    assert convo.type_counts == recount(convo)
+
+    convo.remove_post('new')
+    assert convo.type_counts == recount(convo)
+    assert all(cnt > 0 for cnt in convo.type_counts.values())
+
+    # posts edited in place (only those are recounted)
+    convo.redact()
+    convo.posts[0].text = 'edited'
+    assert convo._dirty == set(convo.posts)
+    assert convo.type_counts == recount(convo)
+    assert not convo._dirty
+
+    # (tagging a post does not change its text)
+    convo.posts[1].add_tag('x')
+    convo.posts[2].text = 'edited again'
+    assert convo._dirty == {2}
+    assert convo.type_counts == recount(convo)
+
+
+def test_type_counts_of_sub_views(mock_temporal_convo):
+    convo = mock_temporal_convo
+    convo.type_counts  # built on the source first, so that views derive theirs
+
+    for uid in convo.posts:
+        for view in [convo.get_ancestors(uid, include_post=True), convo.get_descendants(uid, include_post=True),
+                     convo.get_siblings(uid), convo.get_before(uid), convo.get_after(uid, include_post=True)]:
+            assert view.type_counts == recount(view)
+
+        joint = convo.get_descendants(uid) + convo
+        assert joint.type_counts == recount(joint) == convo.type_counts
+
+
+def test_indexed_queries_match_scans():
+    import random
+    from datetime import datetime
+    from datetime import timedelta
+
+    def scan(convo, by_langs=None, min_chars=0, before=None, after=None, by_tags=None, by_author=None):
+        # the filtering rules, applied post by post
+        return {
+            uid for uid, post in convo.posts.items()
+            if (by_author is None or post.author == by_author) and len(post.text) >= min_chars and
+            (not by_langs or post.lang in by_langs) and (not by_tags or by_tags <= post.tags) and
+            (not before or (post.created_at is not None and post.created_at < before)) and
+            (not after or (post.created_at is not None and post.created_at > after))
+        }
+
+    rng = random.Random(0)
+    start = datetime(2020, 1, 1)
+    times = [start + timedelta(minutes=rng.randint(0, 50)) for _ in range(200)]
+    convo = Conversation()
+    for ix, created_at in enumerate(times):
+        convo.add_post(Tweet(uid=ix, text='x' * rng.randint(0, 9), author=rng.choice('abc'), lang=rng.choice(['en', 'es']),
+                             tags=set(rng.sample(['t1', 't2', 't3'], rng.randint(0, 2))), created_at=created_at))
+
+    assert convo.time_order() == sorted(convo.posts, key=lambda uid: times[uid])
+    for _ in range(100):
+        kwargs = {
+            'by_author': rng.choice([None, 'a', 'z']), 'by_langs': rng.choice([None, {'en'}, {'en', 'es'}]),
+            'by_tags': rng.choice([None, {'t1'}, {'t1', 't2'}, {'t4'}]), 'min_chars': rng.randint(0, 5),
+            'before': rng.choice([None] + times), 'after': rng.choice([None] + times)
+        }
+        assert convo.filter(**kwargs) == scan(convo, **kwargs)
+
+    for uid in rng.sample(range(200), 20):
+        assert set(convo.get_before(uid).posts) == scan(convo, before=times[uid])
+        assert set(convo.get_after(uid).posts) == scan(convo, after=times[uid])
+
+    # additions and removals are applied to the indexes
+    convo.add_post(Tweet(uid=200, author='a', created_at=start - timedelta(days=1)))
+    assert convo.time_order()[0] == 200 and 200 in convo.filter(by_author='a')
+    convo.remove_post(200)
+    assert 200 not in convo.filter(by_author='a') and 200 not in convo.time_order()
+
+    # posts modified in place are indexed again
+    post = convo.posts[min(convo.filter(by_author='b', by_langs={'en'}, by_tags={'t1'}))]
+    post.author, post.lang = 'z', 'fr'
+    post.remove_tag('t1')
+    post.add_tag('t4')
+    post.created_at = (start - timedelta(days=2)).timestamp()
+    assert convo.filter(by_author='z') == convo.filter(by_langs={'fr'}) == convo.filter(by_tags={'t4'}) == {post.uid}
+    assert post.uid not in convo.filter(by_author='b') | convo.filter(by_langs={'en'}) | convo.filter(by_tags={'t1'})
+    assert convo.time_order()[0] == post.uid and convo.filter(before=start) == {post.uid}
+    for _ in range(20):
+        kwargs = {'by_author': rng.choice([None, 'b', 'z']), 'by_langs': rng.choice([None, {'en'}, {'fr'}]),
+                  'by_tags': rng.choice([None, {'t1'}, {'t4'}]), 'before': rng.choice([None] + times)}
+        assert convo.filter(**kwargs) == scan(convo, **kwargs)
+
+    # posts without a creation time are not ordered
+    convo.add_post(Tweet(uid=201))
+    assert convo.time_order() == [] and set(convo.get_before(201).posts) == set(convo.posts)
+
+
+def test_indexes_are_updated_in_place():
+    import random
+
+    def indexes(convo):
+        # the indexes and reply structure, as built from scratch
+        convo._index('lang'), convo._index('tag'), convo._index('time'), convo._child_ids(None)
+        return ({a: set(uids) for a, uids in convo.posts_by_author.items()}, convo._indexes['lang'],
+                convo._indexes['tag'], convo._indexes['time'], {rid: cs for rid, cs in convo._children.items() if cs})
+
+    rng = random.Random(0)
+    convo = Conversation()
+    for ix in range(30):
+        convo.add_post(Tweet(uid=ix, text='x', author=rng.choice('ab'), lang=rng.choice(['en', 'es']),
+                             tags=set(rng.sample(['t1', 't2'], rng.randint(0, 2))), created_at=float(ix),
+                             reply_to={rng.randrange(ix)} if ix else None))
+    indexes(convo)
+    built = dict(convo._indexes), convo._by_author, convo._children
+
+    for step in range(300):
+        uid = rng.randrange(35)
+        post = convo.posts.get(uid)
+        op = rng.randrange(9) if post is not None else 0
+        if op == 0:
+            convo.add_post(Tweet(uid=uid, text='y' * rng.randint(0, 3), author=rng.choice(['a', 'c', None]),
+                                 tags={rng.choice(['t2', 't3'])}, reply_to={rng.randrange(35)},
+                                 created_at=float(rng.randrange(40)) if rng.random() < 0.9 else None))
+        elif op == 1:
+            convo.remove_post(uid)
+        elif op == 2:
+            post.author = rng.choice('abc')
+        elif op == 3:
+            post.lang = rng.choice(['en', 'fr', None])
+        elif op == 4:
+            post.text = 'edited'
+        elif op == 5:
+            post.add_tag(rng.choice(['t1', 't4']))
+        elif op == 6:
+            post.add_reply_to(rng.randrange(35))
+        elif op == 7 and post.reply_to:
+            post.remove_reply_to(min(post.reply_to))
+        elif op == 8 and rng.random() < 0.2:
+            post.created_at = float(rng.randrange(40))
+
+        assert indexes(convo) == indexes(Conversation(posts=dict(convo.posts)))
+
+    # (the indexes were kept, rather than built again)
+    assert convo._by_author is built[1] and convo._children is built[2]
+    assert all(convo._indexes[name] is index for name, index in built[0].items() if name != 'time')
+
+
+def test_views(mock_temporal_convo):
+    from pyconversations.convo import ConversationView
+
+    view = mock_temporal_convo.get_descendants(0, include_post=True)
+    assert isinstance(view, ConversationView)
+    assert list(view.posts) == [1, 2, 3, 0] and view.posts[1] is mock_temporal_convo.posts[1]
+    assert 4 not in view.posts and len(view.posts) == 4
+    assert view.convo_id == mock_temporal_convo.convo_id + '-0-descendant'
+    assert view.time_order() == [0, 1, 2, 3] and view.type_counts == mock_temporal_convo.type_counts
+
+    # views of views
+    sub = view.get_children(1)
+    assert set(sub.posts) == {3} and sub.convo_id == view.convo_id + '-1-children'
+
+    with pytest.raises(TypeError):
+        view.add_post(Tweet(uid=5))
+    with pytest.raises(TypeError):
+        view.redact()
+
+    copy = view.materialize()
+    assert type(copy) is Conversation and copy.posts == dict(view.posts) and copy.convo_id == view.convo_id
+    assert copy.type_counts == view.type_counts
+    copy.remove_post(0)
+
+    # empty subsets are views too
+    empty = mock_temporal_convo.get_children(3)
+    assert isinstance(empty, ConversationView) and isinstance(empty.posts, type(view.posts)) and not empty.posts
+
+    # views are invalidated by modifications of their conversation
+    items = view.posts.items()
+    mock_temporal_convo.remove_post(3)
+    with pytest.raises(RuntimeError):
+        list(view.posts)
+    with pytest.raises(RuntimeError):
+        list(items)
+    with pytest.raises(RuntimeError):
+        sub.posts[3]
+    with pytest.raises(RuntimeError):
+        len(empty.posts)
+    assert set(copy.posts) == {1, 2, 3}
+
+
+def test_views_follow_edits_of_their_posts(mock_temporal_convo):
+    from pyconversations.convo import ConversationView
+
+    convo = mock_temporal_convo
+    for uid, author in enumerate('abcd'):
+        convo.posts[uid].author = author
+        convo.posts[uid].lang = 'en'
+
+    view = convo.get_ancestors(3)
+    assert set(view.authors) == {'a', 'b'} and view.filter(by_langs={'en'}) == {0, 1}
+    assert view.time_order() == [0, 1] and set(view.get_children(0).posts) == {1}
+    type_counts = dict(view.type_counts)
+
+    # edits of the posts (in the view or not) that leave its posts as they were are followed
+    convo.posts[1].author = 'z'
+    convo.posts[0].lang = 'fr'
+    convo.posts[2].text = 'edited'
+    assert set(view.authors) == {'a', 'z'} and view.posts_by_author['z'] == {1: None}
+    assert view.filter(by_langs={'en'}) == {1} and view.filter(by_author='z') == {1}
+    assert view.type_counts == type_counts
+    convo.posts[0].text = 'edited'
+    assert view.type_counts == recount(view) != type_counts
+    assert set(view.get_children(0).posts) == {1}
+
+    # ... while edits of the replies or creation times, which decide them, invalidate it
+    convo.posts[2].add_reply_to(1)
+    for read in [lambda: view.authors, lambda: view.type_counts, lambda: view.filter(by_langs={'en'}),
+                 lambda: view.time_order(), lambda: view.get_children(0)]:
+        with pytest.raises(RuntimeError):
+            read()
+
+    view = convo.get_before(3)
+    convo.posts[0].created_at = 0.0
+    with pytest.raises(RuntimeError):
+        view.posts[0]
+    assert isinstance(convo.get_before(3), ConversationView)
+
+
+def test_posts_by_author_are_kept_up_to_date():
+    import random
+
+    def rebuilt(convo):
+        out = {}
+        for uid, post in convo.posts.items():
+            out.setdefault(post.author, set()).add(uid)
+        return out
+
+    rng = random.Random(0)
+    convo = Conversation()
+    convo.add_post(Tweet(uid=0, author='a'))
+    assert convo.authors == {'a'}
+
+    for _ in range(300):
+        uid = rng.randrange(40)
+        if uid in convo.posts and rng.random() < 0.3:
+            convo.remove_post(uid)
+        else:
+            # merges may name the author of a post
+            convo.add_post(Tweet(uid=uid, author=rng.choice(['a', 'b', 'c', None])))
+
+        assert {a: set(uids) for a, uids in convo.posts_by_author.items()} == rebuilt(convo)
+        assert set(convo.authors) == set(rebuilt(convo))
+
+    other = Conversation()
+    other.add_post(Tweet(uid=100, author='d'))
+    convo |= other
+    assert convo.posts_by_author['d'] == {100: None}
+
+    convo.redact()
+    assert set(convo.authors) == {post.author for post in convo.posts.values()}
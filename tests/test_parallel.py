@@ -0,0 +1,102 @@
+import pickle
+
+from pyconversations.convo import Conversation
+from pyconversations.message import Tweet
+from pyconversations.message.base import get_tokenizer
+from pyconversations.parallel import balanced_chunks
+from pyconversations.parallel import map_chunks
+from pyconversations.parallel import parallel_map
+
+
+def _square(x):
+    return x * x
+
+
+def test_parallel_map_serial():
+    assert list(parallel_map(_square, range(10))) == [x * x for x in range(10)]
+
+
+def test_parallel_map_ordered():
+    assert list(parallel_map(_square, range(100), n_workers=2, chunksize=7)) == [x * x for x in range(100)]
+
+
+def test_parallel_map_bounded():
+    read = []
+
+    def items():
+        for x in range(100):
+            read.append(x)
+            yield x
+
+    out = parallel_map(_square, items(), n_workers=2, chunksize=3, max_pending=2)
+    assert next(out) == 0
+    # (the chunks pending, and the one awaiting a slot)
+    assert len(read) <= 3 * 3
+    assert list(out) == [x * x for x in range(1, 100)]
+
+
+def _squares(xs):
+    return [x * x for x in xs]
+
+
+def test_balanced_chunks():
+    sizes = [1] * 100 + [50, 60]
+    chunks = balanced_chunks(sizes, 4)
+
+    assert sorted(ix for chunk in chunks for ix in chunk) == list(range(len(sizes)))
+    assert all(chunk == sorted(chunk) for chunk in chunks)
+
+    # the two large items are apart, with the small ones filling the other chunks
+    totals = [sum(sizes[ix] for ix in chunk) for chunk in chunks]
+    assert totals == sorted(totals, reverse=True)
+    assert not any(100 in chunk and 101 in chunk for chunk in chunks)
+    assert max(totals) - min(totals) <= 1 + max(totals) // 2
+
+    assert balanced_chunks([3, 1], 8) == [[0], [1]]
+    assert balanced_chunks([], 4) == []
+
+
+def test_map_chunks_ordered():
+    sizes = [x % 7 for x in range(100)]
+    assert map_chunks(_squares, range(100)) == [x * x for x in range(100)]
+    assert map_chunks(_squares, range(100), sizes=sizes, n_workers=2) == [x * x for x in range(100)]
+    assert map_chunks(_squares, [], n_workers=2) == []
+
+
+def test_post_pickle_shares_tokenizer():
+    post = Tweet(uid=1, text='Some text to tokenize')
+    tokens = post.tokens
+
+    copy = pickle.loads(pickle.dumps(post))
+    assert copy._tok is get_tokenizer('partitioner')
+    assert copy.tokens == tokens
+    assert copy.to_json() == post.to_json()
+
+
+def test_convo_pickle_signalled_by_posts():
+    convo = Conversation()
+    convo.add_post(Tweet(uid=0, text='root'))
+
+    copy = pickle.loads(pickle.dumps(convo))
+    version = copy.version
+    copy.posts[0].text = 'edited'
+    assert copy.version > version
+
+
+def test_convo_merge():
+    a = Conversation()
+    a.add_post(Tweet(uid=0, text='root'))
+    a.add_post(Tweet(uid=1, text='a', reply_to={0}))
+
+    b = Conversation()
+    b.add_post(Tweet(uid=1, text='longer', tags={'x'}))
+    b.add_post(Tweet(uid=2, text='b', reply_to={1}))
+
+    out = a
+    a |= b
+    assert a is out
+    assert list(a.posts) == [0, 1, 2]
+    assert a.posts[1].text == 'longer'
+    assert a.posts[1].reply_to == {0}
+    assert a.posts[1].tags == {'x'}
+    assert a.get_children(1).posts.keys() == {2}
@@ -0,0 +1,71 @@
+import random
+import re
+
+from pyconversations.convo import Conversation
+from pyconversations.message import Tweet
+from pyconversations.redact import Redactor
+from pyconversations.redact import trie_pattern
+
+
+def test_trie_pattern():
+    words = ['a', 'ab', 'abc', 'b', 'bd', 'x.y', '[', '-']
+    pattern = re.compile(trie_pattern(words))
+    longest_first = re.compile('|'.join(map(re.escape, sorted(words, key=len, reverse=True))))
+
+    for text in ['abcd', 'abd', 'abab', 'bdb', 'xxy x.y', '[a-b]', '']:
+        assert pattern.findall(text) == longest_first.findall(text)
+
+    # enough strings for the trie branches to be grouped
+    rng = random.Random(0)
+    alphabet = 'abcdefghijklmnopqrstuvwxyz-.^]\\😀😁😂🤣'
+    words = {''.join(rng.choices(alphabet, k=rng.randint(1, 4))) for _ in range(500)}
+    pattern = re.compile(trie_pattern(words))
+    longest_first = re.compile('|'.join(map(re.escape, sorted(words, key=len, reverse=True))))
+
+    for _ in range(200):
+        text = ''.join(rng.choices(alphabet + ' ', k=40))
+        assert pattern.findall(text) == longest_first.findall(text)
+
+
+def test_redactor():
+    redactor = Redactor({'bob': 'USER0', 'bobby': 'USER1', 'a.b': 'USER2', 'USER1': 'USER3', '': 'X'})
+
+    # longest terms first, matched literally, replacements are not redacted again
+    assert redactor.redact_text('bobby, bob and a.b (not axb)') == 'USER1, USER0 and USER2 (not axb)'
+    assert redactor.redact_text('') == ''
+    assert 'bob' in redactor and redactor['a.b'] == 'USER2' and len(redactor) == 5
+
+    assert Redactor({}).redact_text('bob') == 'bob'
+
+
+def test_post_redaction_with_redactor():
+    redactor = Redactor({'tweeter1': 'USER0', 'Twitter': 'USER1'})
+    post = Tweet(uid=0, text='Hi @Twitter!', author='tweeter1')
+    version = post.version
+
+    post.redact(redactor)
+    assert (post.text, post.author) == ('Hi @USER1!', 'USER0')
+    assert post.version > version
+
+    # untouched texts are not reassigned
+    post = Tweet(uid=1, text='nothing here')
+    version = post.version
+    post.redact(redactor)
+    assert post.version == version
+
+
+def test_convo_redaction_many_users():
+    convo = Conversation()
+    names = [f'user{ix}' for ix in range(300)] + ['user(1)', 'user+']
+    for ix, name in enumerate(names):
+        convo.add_post(Tweet(uid=ix, text=f'@{name} @{names[ix - 1]}', author=name))
+
+    convo.redact()
+
+    # mentions are numbered in the (set) order they are found in ('@user(1)' also mentions 'user')
+    ids = {name: convo.posts[ix].author for ix, name in enumerate(names)}
+    assert len(set(ids.values())) == len(names)
+    assert convo.authors == set(ids.values())
+
+    for ix, name in enumerate(names):
+        assert convo.posts[ix].text == f'@{ids[name]} @{ids[names[ix - 1]]}'
@@ -81,3 +81,59 @@ def test_lambda(lambda_tok):
         ('test example', ['test example'])
     ]
     abstract_test_tokenizer(lambda_tok, tests)
+
+
+def reference_partition(s, charset, space=True):
+    # the original (uncompiled) Partitioner implementation
+    import re
+
+    tokens = []
+    for token in re.split("([0-9" + charset + "'-]+)", s):
+        if not space:
+            token = re.sub("[ ]+", "", token)
+
+        if not token:
+            continue
+
+        if re.search("[0-9" + charset + "'-]", token):
+            tokens.append(token)
+        else:
+            tokens.extend(token)
+
+    return tokens
+
+
+def test_partitioner_regression(partitioner_tok, no_space_partitioner_tok, null_charset_partitioner_tok):
+    import random
+
+    from pyconversations.tokenizers.partitioner import default_charset
+
+    rng = random.Random(0)
+    alphabet = 'abcXYZ019 \t\n.,!?\'-#@/:😏éж  '
+    texts = [
+        '',
+        ' ',
+        "Don't stop-believing, 2021's best!!",
+        '@Twitter check out this 😏 https://www.twitter.com/ #crazy #link',
+    ] + [''.join(rng.choice(alphabet) for _ in range(rng.randint(0, 60))) for _ in range(500)]
+
+    for tok, charset, space in [
+        (partitioner_tok, default_charset(), True),
+        (no_space_partitioner_tok, default_charset(), False),
+        (null_charset_partitioner_tok, '', True),
+    ]:
+        expected = [reference_partition(t, charset, space=space) for t in texts]
+        assert [tok(t) for t in texts] == expected
+        assert tok.tokenize_many(texts) == expected
+
+
+def test_tokenize_many(default_tok, lambda_tok):
+    assert default_tok.tokenize_many(['a b', 'c']) == [['a', 'b'], ['c']]
+    assert lambda_tok.tokenize_many(['a b']) == [['a b']]
+
+
+def test_partitioner_pickle(partitioner_tok):
+    import pickle
+
+    tok = pickle.loads(pickle.dumps(partitioner_tok))
+    assert tok('test example') == ['test', ' ', 'example']